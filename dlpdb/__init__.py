@@ -2,16 +2,43 @@
 # python.  Instead I expected users to invoke the scripts from the shell.
 # Hence, only a few of the modules contain useful functions that can be
 # accessed from within python.  They are below:
-from .resid import ResID
+from .resid import ResID, PackResID, UnpackResID
 from .closest_line_points import ClosestLinePoints
 from .coords2angles import Coords2AnglesLengths, Coords2Angles
 from .coords2dihedrals import Coords2DihedralsAnglesLengths, Coords2Dihedrals
 from .coords2projected_dihedrals import Coords2ProjectedDihedralsLengths, Coords2ProjectedDihedrals
 from .helixAngleOmega import CalcOmegaFromThetaPhi, CalcOmega
+from .pdb2ss import SSInterval, SSIndex, ParseSSRecord, ReadSSIntervals
+from .classify_pdbs import ClassifyPDB
+from .resnames import ResName2Code, Codes2Sequence, ResNames2Sequence, AminoAcid1to3
+from .pdbs2fasta import ReadChainCodes, ReadChainSequences
+from .kmers import KmerCodes, SampleKmers, ParseAlphabet, AlphabetTable, EncodeSequence, NewKmerCounts, CountKmers, KmerItems, KmerString
+from .cull_chains import ChainEntry, RedundancyCuller, ClusterChains, CullChains
+from .chain_weights import NormalizeChainID, ChainIDFromFileName, ReadWeightTable, ReadClusters, ClusterWeights, FileWeight, ChainWeight, ReadWeights, WeightsDigest
+from .histogram import Histogram
+from .output_format import OutputFormat, WriteRows, ParseOutputArgs
+from .select_atoms import AtomSelection, AtomColumns, SelectAtoms
+from .pdb2gyration import SegmentOffsets, ReduceSegments, SegmentMoments, RadiusOfGyration, PrincipalAxes, ReadResidueAtoms, ResidueMoments
+from .pdbs2rama import ReadBackbone, Dihedral, BackboneDihedrals, ResidueAngles, RamaCounts
+from .pdbs2table import ReadResidues, WindowColumn, ResidueTable
+from .pdbs2db import ReadEntry, CreateTables, InsertEntry, UniqueFileNames, BuildDatabase
+from .query_db import OpenDatabase, QueryRows, QueryColumns
+from .memo import PackageFiles, PackageDigest, FindProgram, CommandKey, RunStage
+from .batch_run import SplitShards, ShardDigest, Checkpoint, FileKey, RunCommand, RunShard
+from .reduce_partials import Partials, ReadPartials, ReducePartials
+from .spectra import FourierTable, PowerSpectrumAccumulator, HydrophobicMoment
+from .window_energy import EnergyModel, WindowSums
+from .bootstrap import ResampleCounts, Bootstrap, StandardDeviations, MomentSums, AveDev
+from .ss_propensity import ReadDSSPLabels, CountChainResidues, CountResidues, Propensities, ReadPriors
 
 # I no longer remember why I import "main" from the executable scripts.
 # Perhaps these next few lines are unnecessary, but they seem to do no harm:
+from .batch_run import main
+from .bootstrap import main
+from .chain_weights import main
+from .classify_pdbs import main
 from .coords2angles import main
+from .cull_chains import main
 from .coords2projected_dihedrals import main
 from .coords2dihedrals import main
 from .coords2distances import main
@@ -21,6 +48,7 @@ from .dlpisces import main
 from .dna_interleave_residues import main
 from .download_pdbs import main
 from .dssp2pdb import main
+from .histogram import main
 from .has_dna_heavy_atoms import main
 from .has_helices import main
 from .has_protein_heavy_atoms import main
@@ -28,26 +56,42 @@ from .has_rna_heavy_atoms import main
 from .has_secondary_str import main
 from .has_sheets import main
 from .has_turns import main
+from .memo import main
 from .merge_lines_periodic import main
 from .pdb2coords_ave import main
 from .pdb2coords import main
+from .pdb2gyration import main
 from .pdb2helix import main
 from .pdb2sequence import main
 from .pdb2sheet import main
+from .pdb2ss import main
 from .pdb2turn import main
+from .pdbs2fasta import main
+from .pdbs2rama import main
+from .pdbs2table import main
+from .pdbs2db import main
+from .query_db import main
+from .reduce_partials import main
+from .select_atoms import main
 from .select_chains_with_dna import main
 from .select_interval import main
+from .ss_propensity import main
 from .strip_secondary_str import main
 from .truncate_chars import main
 from .truncate_tokens import main
 
 
-__all__ = ['closest_points',
+__all__ = ['batch_run',
+           'bootstrap',
+           'chain_weights',
+           'classify_pdbs',
+           'closest_points',
            'coords2angles',
            'coords2projected_dihedrals',
            'coords2dihedrals',
            'coords2distances',
            'coords2helixAngleOmega',
+           'cull_chains',
            'dlpisces',
            'dna_interleave_residues',
            'download_pdbs',
@@ -60,15 +104,31 @@ __all__ = ['closest_points',
            'has_sheets',
            'has_turns',
            'helixAngleOmega',
+           'histogram',
+           'kmers',
+           'memo',
            'merge_lines_periodic',
            'pdb2coords_ave',
            'pdb2coords',
+           'pdb2gyration',
            'pdb2helix',
            'pdb2sequence',
            'pdb2sheet',
+           'pdb2ss',
            'pdb2turn',
+           'pdbs2fasta',
+           'pdbs2rama',
+           'pdbs2table',
+           'pdbs2db',
+           'query_db',
+           'reduce_partials',
+           'resnames',
+           'select_atoms',
            'select_chains_with_dna',
            'select_interval',
+           'spectra',
+           'ss_propensity',
            'strip_secondary_str',
            'truncate_chars.',
-           'truncate_tokens']
+           'truncate_tokens',
+           'window_energy']
@@ -0,0 +1,524 @@
+"""
+Functions used by the programs in dlpdb which process a long list of
+PDB files (instead of reading a single PDB file from the standard input).
+
+Those programs read the list of file names from the standard input
+(one file name per line, as in "ls -f1 *.pdb | program.py"), or from
+their arguments.  The files are then processed in parallel, using
+multiple processes (one per CPU, by default).
+
+Some of these programs accept a "-cache DIR" argument.  The result of
+processing each file is then saved in the directory DIR, keyed by a hash
+of the name and contents of the file, the name and version of the program,
+the source code of dlpdb, and the arguments which affect that result.
+When the program is run again (for example after a few new PDB files were
+downloaded), only the files which are new (or have changed) are processed.  The results from the other files
+are read from DIR.  (The same DIR can be shared by different programs,
+and by programs running at the same time.  It can be deleted at any time.)
+If the DLPDB_CACHE environment variable is set, it is used as the default DIR.
+The results are stored using python's "pickle" format, so anyone who can
+write to DIR could run code in the programs which read it.  For this reason
+DIR must belong to the user running the program, and must not be writable
+by anyone else.  (Otherwise the program stops with an error.)
+
+The results are compressed.  The total size of the cache can be limited
+(for example using "memo.py -max-size 2000 ..." which stores the limit, in
+megabytes, in DIR/max_size.txt).  When the cache grows larger than this,
+the results which were used least recently are deleted.
+
+Some of these programs also accept a "-shard k/N" argument, which processes
+only the k'th of N (roughly equal) parts of the list of files.  The part
+which a file belongs to depends only on its name (without the directory),
+so different computers (sharing a file system, for example) can each
+process a different part of the same list, without communicating.  The
+partial results can then be combined (see reduce_partials.py).
+"""
+
+import os
+import time
+import hashlib
+import pickle
+import zlib
+
+
+def ReadFileNames(in_file):
+    """
+    Read a list of file names (one per line) from in_file.
+    Blank lines are ignored.
+
+    """
+    file_names = []
+    for line in in_file:
+        file_name = line.strip()
+        if len(file_name) > 0:
+            file_names.append(file_name)
+    return file_names
+
+
+
+def ParseShard(text):
+    """
+    Parse a string of the form "k/N" (where 1 <= k <= N) and return the
+    tuple (k, N).  Invalid strings raise a ValueError.
+
+    """
+    tokens = text.split('/')
+    try:
+        if len(tokens) != 2:
+            raise ValueError
+        k = int(tokens[0])
+        N = int(tokens[1])
+    except ValueError:
+        raise ValueError('Invalid shard: \"'+text+'\" (expected \"k/N\", eg. \"2/8\")')
+    if not ((1 <= k) and (k <= N)):
+        raise ValueError('Invalid shard: \"'+text+'\" (k must be between 1 and N)')
+    return k, N
+
+
+
+def ShardOf(file_name, num_shards):
+    """
+    Return the shard (from 1 to num_shards) which a file belongs to.
+    This depends only on the name of the file (without its directory).
+
+    """
+    digest = hashlib.sha256(os.path.basename(file_name).encode('utf-8'))
+    return 1 + int(digest.hexdigest()[0:16], 16) % num_shards
+
+
+
+def ShardIndices(file_names, shard=None):
+    """
+    Return the indices of the files in file_names which belong to the shard
+    (a tuple (k, N), see ParseShard()).  If shard is None, return them all.
+
+    """
+    if shard == None:
+        return list(range(0, len(file_names)))
+    k, N = shard
+    return [i for i in range(0, len(file_names))
+            if ShardOf(file_names[i], N) == k]
+
+
+
+def DefaultNumProcs():
+    num_procs = os.cpu_count()
+    if num_procs == None:
+        num_procs = 1
+    return num_procs
+
+
+
+def MapFiles(func, file_names, num_procs=None, chunksize=1, cache=None):
+    """
+    MapFiles() invokes func(file_name) for every file in file_names and
+    yields the results (in the same order as file_names).
+    When num_procs > 1, the files are distributed over a pool of processes.
+    (In that case "func" must be defined at the top level of a module.)
+    If a ResultCache is supplied, files whose results are already stored
+    in the cache are not processed again, and new results are stored there.
+
+    """
+    if cache != None:
+        for result in cache.MapFiles(func, file_names, num_procs, chunksize):
+            yield result
+        return
+    if num_procs == None:
+        num_procs = DefaultNumProcs()
+    if (num_procs <= 1) or (len(file_names) <= 1):
+        for file_name in file_names:
+            yield func(file_name)
+    else:
+        # (multiprocessing is imported here, since it takes a while, and
+        #  programs using a single process (such as memo.py) do not need it)
+        from multiprocessing import Pool
+        pool = Pool(min(num_procs, len(file_names)))
+        try:
+            for result in pool.imap(func, file_names, chunksize):
+                yield result
+            pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+
+
+
+def FileDigest(file_name, block_size=1048576):
+    """ Return the SHA-256 hash of the contents of a file (as a hex string) """
+    digest = hashlib.sha256()
+    f = open(file_name, 'rb')
+    try:
+        block = f.read(block_size)
+        while len(block) > 0:
+            digest.update(block)
+            block = f.read(block_size)
+    finally:
+        f.close()
+    return digest.hexdigest()
+
+
+
+# The (cached) result of PackageDigest():
+_g_package_digest = None
+# The name of the file (in the cache directory) which stores it:
+package_digest_file_name = 'package_digest.txt'
+
+def PackageFiles():
+    """ Return the names of dlpdb's modules and scripts (in this directory) """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    file_names = []
+    for dir_name in (package_dir, os.path.join(package_dir, 'scripts')):
+        if not os.path.isdir(dir_name):
+            continue
+        for file_name in sorted(os.listdir(dir_name)):
+            if file_name.endswith('.py') or file_name.endswith('.sh'):
+                file_names.append(os.path.join(dir_name, file_name))
+    return file_names
+
+
+
+def PackageDigest(cache_dir=None):
+    """
+    Return a hash of the version of dlpdb (if it is installed) and of
+    the source code of its modules and scripts (in this directory).
+    (It is included in the key of every result stored in a ResultCache.)
+    If cache_dir is not None, the hash is saved there, along with the
+    sizes and modification times of these files, and it is only computed
+    again when one of them has changed.  (Otherwise, memo.py would read
+    every file in dlpdb each time it runs, which takes longer than many
+    of the commands it runs.)
+
+    """
+    global _g_package_digest
+    if _g_package_digest != None:
+        return _g_package_digest
+    file_names = PackageFiles()
+    stats = hashlib.sha256()
+    for file_name in file_names:
+        stat = os.stat(file_name)
+        stats.update((file_name+' '+str(stat.st_size)+' '+
+                      str(stat.st_mtime_ns)+'\n').encode('utf-8'))
+    stats = stats.hexdigest()
+    saved_file_name = None
+    if cache_dir != None:
+        saved_file_name = os.path.join(cache_dir, package_digest_file_name)
+        try:
+            f = open(saved_file_name, 'r')
+            tokens = f.read().split()
+            f.close()
+            if (len(tokens) == 2) and (tokens[0] == stats):
+                _g_package_digest = tokens[1]
+                return _g_package_digest
+        except IOError:
+            pass
+    h = hashlib.sha256()
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+        try:
+            h.update(('dlpdb '+version('dlpdb')+'\n').encode('utf-8'))
+        except PackageNotFoundError:
+            pass
+    except ImportError:
+        pass
+    for file_name in file_names:
+        h.update((os.path.basename(file_name)+' '+FileDigest(file_name)+
+                  '\n').encode('utf-8'))
+    _g_package_digest = h.hexdigest()
+    if saved_file_name != None:
+        # (Write it to a temporary file, and rename it, since other programs
+        #  may be reading it at the same time.)
+        tmp_name = saved_file_name+'.tmp'+str(os.getpid())
+        try:
+            f = open(tmp_name, 'w')
+            f.write(stats+' '+_g_package_digest+'\n')
+            f.close()
+            os.replace(tmp_name, saved_file_name)
+        except (IOError, OSError):
+            pass   # (The hash is simply computed again next time)
+    return _g_package_digest
+
+
+
+def FunctionKey(func):
+    """
+    Return a string describing a function and the arguments bound to it
+    (if it was created using functools.partial()).  The repr() of each
+    argument must not vary from one run to the next.
+
+    """
+    if hasattr(func, 'func'):
+        return (FunctionKey(func.func) + repr(func.args) +
+                repr(sorted(func.keywords.items())))
+    return func.__module__.split('.')[-1] + '.' + func.__name__
+
+
+
+def CheckPrivate(directory):
+    """
+    Raise a ValueError unless the directory belongs to the current user
+    and cannot be written to by anyone else.  (Results are loaded from the
+    cache using pickle, which can run arbitrary code.)
+
+    """
+    stat = os.stat(directory)
+    if hasattr(os, 'getuid') and (stat.st_uid != os.getuid()):
+        raise ValueError('The cache directory \"'+directory+'\" belongs to another user.')
+    if stat.st_mode & 0o022:
+        raise ValueError('The cache directory \"'+directory+'\" can be written to by other users.\n'
+                         '  (Use \"chmod go-w '+directory+'\", or a different directory.)')
+
+
+
+class ResultCache(object):
+    """
+    ResultCache stores the results of processing individual files in a
+    directory (one file per result, pickled and compressed).
+    Each result is keyed by:
+      the name (see os.path.abspath()) and contents of the file (and of
+        its "related" files),
+      a tag (typically the name and version of the program), followed by
+        a hash of the source code of dlpdb (see PackageDigest()), and
+      the function used to process the file (including its arguments).
+    "related_files" (if not None) is a function which returns a list of the
+    other files that the result depends on (eg. the corresponding DSSP file).
+    Related files which do not exist are allowed.
+    (Results which do not come from files can be keyed using DataKey().)
+
+    The directory must belong to the current user, and must not be writable
+    by other users, since the results are unpickled.  (Otherwise a
+    ValueError is raised.)
+
+    Results are written to a temporary file and then renamed, so that
+    programs reading (or writing) the same cache at the same time never
+    see an incomplete result.
+
+    If max_size (in bytes) is not None, it is saved in the directory, and
+    used by every program which uses the cache afterwards.  Whenever the
+    results in the cache exceed this size, the results which were used
+    least recently are deleted (see Trim()).  (Loading a result updates
+    the modification time of its file, which is used to decide this.)
+    Temporary files left behind by programs which were killed while
+    writing a result are deleted by Trim() in either case.
+
+    """
+
+    # The name of the file in the cache directory which stores max_size
+    max_size_file_name = 'max_size.txt'
+    # The name of the file whose modification time records when Trim() was
+    # last invoked (by any program using the cache)
+    last_trim_file_name = 'last_trim'
+    # Trim() is invoked by Store() if it has not been invoked for this long
+    # (in seconds), or if the results written since then exceed 1/10 of
+    # max_size.
+    trim_interval = 60.0
+    # Temporary files (left behind by Store() when a program was killed)
+    # which are older than this (in seconds) are deleted by Trim().
+    # (Younger ones may still be being written by another process.)
+    stale_tmp_age = 3600.0
+
+    def __init__(self, directory, tag, related_files=None, max_size=None):
+        self.directory = directory
+        self.related_files = related_files
+        self.num_hits = 0
+        self.num_misses = 0
+        self.bytes_written = 0
+        if not os.path.isdir(directory):
+            os.makedirs(directory, 0o700)
+        CheckPrivate(directory)
+        self.tag = tag + ' ' + PackageDigest(directory)
+        try:
+            self.last_trim = os.stat(os.path.join(directory,
+                                     self.last_trim_file_name)).st_mtime
+        except OSError:
+            self.last_trim = 0.0   # (Trim() has never been invoked)
+        max_size_file_name = os.path.join(directory, self.max_size_file_name)
+        if max_size != None:
+            f = open(max_size_file_name, 'w')
+            f.write(str(int(max_size))+'\n')
+            f.close()
+        elif os.path.exists(max_size_file_name):
+            f = open(max_size_file_name, 'r')
+            max_size = int(f.read().strip())
+            f.close()
+        self.max_size = max_size
+
+    def DataKey(self, description, data):
+        """
+        Return the key for a result which depends on "data" (a bytes object),
+        and which was created in the way described by "description" (a string).
+
+        """
+        digest = hashlib.sha256()
+        digest.update((self.tag+'\n'+description+'\n').encode('utf-8'))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def Key(self, func, file_name):
+        """ Return the key for the result of func(file_name) """
+        # (The name of the file is included, since results often contain it.
+        #  "x.pdb", "./x.pdb" and "/abs/x.pdb" are the same file.)
+        digests = [os.path.abspath(file_name), FileDigest(file_name)]
+        if self.related_files != None:
+            for related_file_name in self.related_files(file_name):
+                if os.path.exists(related_file_name):
+                    digests.append(FileDigest(related_file_name))
+                else:
+                    digests.append('-')
+        return self.DataKey(FunctionKey(func), '\n'.join(digests).encode('utf-8'))
+
+    def FileName(self, key):
+        # (2 levels, to avoid directories containing too many files)
+        return os.path.join(self.directory, key[0:2], key[2:] + '.z')
+
+    def Contains(self, key):
+        return os.path.exists(self.FileName(key))
+
+    def Load(self, key):
+        """
+        Return a tuple (True, result) if the result was found in the cache,
+        or (False, None) otherwise.
+
+        """
+        file_name = self.FileName(key)
+        try:
+            f = open(file_name, 'rb')
+        except IOError:
+            return False, None
+        try:
+            result = pickle.loads(zlib.decompress(f.read()))
+        except Exception:
+            # (The file was damaged, or it was written by a different version
+            #  of python or of dlpdb, whose classes no longer exist.
+            #  Compute it again.)
+            return False, None
+        finally:
+            f.close()
+        try:
+            os.utime(file_name, None)   # (It was used recently.  See Trim())
+        except OSError:
+            pass   # (Another process may have deleted it)
+        return True, result
+
+    def Store(self, key, result):
+        file_name = self.FileName(key)
+        directory = os.path.dirname(file_name)
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError:
+                pass   # (Another process may have created it already)
+        data = zlib.compress(pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+        import tempfile   # (Only needed when results are stored.  See memo.py)
+        fd, tmp_name = tempfile.mkstemp(suffix='.tmp', dir=directory)
+        try:
+            f = os.fdopen(fd, 'wb')
+            f.write(data)
+            f.close()
+            os.replace(tmp_name, file_name)
+        except BaseException:
+            os.remove(tmp_name)
+            raise
+        self.bytes_written += len(data)
+        if ((time.time() - self.last_trim > self.trim_interval) or
+            ((self.max_size != None) and
+             (10*self.bytes_written > self.max_size))):
+            self.Trim()
+
+    def Trim(self):
+        """
+        Delete old temporary files (see stale_tmp_age), and (if max_size
+        is not None) delete the least recently used results, until the total
+        size of the results in the cache does not exceed max_size.
+
+        """
+        self.bytes_written = 0
+        self.last_trim = time.time()
+        try:
+            f = open(os.path.join(self.directory, self.last_trim_file_name), 'w')
+            f.close()
+        except IOError:
+            pass
+        entries = []
+        total_size = 0
+        for sub_dir in os.listdir(self.directory):
+            sub_dir = os.path.join(self.directory, sub_dir)
+            if not os.path.isdir(sub_dir):
+                continue
+            for name in os.listdir(sub_dir):
+                if name.endswith('.tmp'):
+                    tmp_name = os.path.join(sub_dir, name)
+                    try:
+                        if (self.last_trim - os.stat(tmp_name).st_mtime >
+                            self.stale_tmp_age):
+                            os.remove(tmp_name)
+                    except OSError:
+                        pass   # (Another process may have renamed it)
+                elif name.endswith('.z') and (self.max_size != None):
+                    try:
+                        stat = os.stat(os.path.join(sub_dir, name))
+                    except OSError:
+                        continue   # (Another process may have deleted it)
+                    entries.append((stat.st_mtime, stat.st_size,
+                                    os.path.join(sub_dir, name)))
+                    total_size += stat.st_size
+        if self.max_size == None:
+            return
+        entries.sort()
+        for mtime, size, file_name in entries:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(file_name)
+            except OSError:
+                pass
+            total_size -= size
+
+    def MapFiles(self, func, file_names, num_procs=None, chunksize=1):
+        """
+        This is equivalent to MapFiles(func, file_names, num_procs, chunksize)
+        except that only the files whose results were not found in the cache
+        are processed (in parallel).  Their results are stored in the cache.
+
+        """
+        keys = [self.Key(func, file_name) for file_name in file_names]
+        found = [self.Contains(key) for key in keys]
+        results = MapFiles(func,
+                           [file_names[i] for i in range(0, len(file_names))
+                            if not found[i]],
+                           num_procs, chunksize)
+        for i in range(0, len(file_names)):
+            loaded = False
+            if found[i]:
+                loaded, result = self.Load(keys[i])
+                if not loaded:
+                    # (The result was removed from the cache in the meantime)
+                    result = func(file_names[i])
+            else:
+                result = next(results)
+            if loaded:
+                self.num_hits += 1
+            else:
+                self.num_misses += 1
+                self.Store(keys[i], result)
+            yield result
+        for result in results:
+            pass   # (This allows the pool of processes to exit normally)
+
+
+
+def OpenCache(directory, tag, related_files=None, max_size=None):
+    """
+    Return a ResultCache using "directory" (or the directory in the
+    DLPDB_CACHE environment variable, if "directory" is None).
+    If neither is available, return None (no cache).
+    (A ValueError is raised if the directory is not private.  See
+     CheckPrivate().)
+
+    """
+    if directory == None:
+        directory = os.environ.get('DLPDB_CACHE')
+        if (directory == None) or (directory == ''):
+            return None
+    return ResultCache(directory, tag, related_files, max_size)
@@ -0,0 +1,367 @@
+#!/usr/bin/env python
+
+"""
+ Typical usage:
+
+    ls -f1 *.pdb | batch_run.py -out dihedrals_run \\
+                     extract_dihedrals.sh " CA " i+1 " CA " i+2 " CA " i+3 " CA " \\
+                   > dihedrals.txt
+
+ This program runs a command which reads a list of PDB file names from its
+ standard input (such as the extract_*.sh scripts, or pdbs2table.py), on a
+ (long) list of PDB files, a few files at a time, and keeps track of its
+ progress, so that it can be resumed if it is interrupted.
+
+ The list of files (read from the standard input) is divided into "shards"
+ (of 10 files, by default).  The command is run once for each shard, and its
+ output is saved in a separate file in the directory given by "-out".
+ Each output file is written under a temporary name, and renamed when the
+ command has finished successfully.  The shards which have been completed
+ are recorded in the file "checkpoint.txt" (in the same directory).
+
+ If the program is interrupted (or killed), run the same command again
+ (with the same list of files and the same "-out" directory).  Only the
+ shards which were not completed will be run again.  When every shard has
+ been completed, their output is printed to the standard output (in order).
+
+ Optional arguments (which must appear before the command):
+
+   -out DIR         The directory containing the output of each shard, and
+                    the checkpoint file.  (Required.  Use a different
+                    directory for each run.)
+   -shard-size N    The number of PDB files in each shard.  (Default: 10)
+                    If the program is killed, the work done on the shards
+                    which were not completed is lost, unless "-cache" is
+                    used (which saves the output from each file as soon as
+                    it is finished).  (Without "-cache", larger shards
+                    start fewer processes.)
+   -np N            Run up to N shards at the same time.  (Default: 1)
+   -no-cat          Do not print the output of the shards at the end.
+                    (It can be found in DIR/shard_*.out)
+   -cache CACHE_DIR Save the output from each PDB file in CACHE_DIR (see
+                    memo.py), and reuse it whenever the same file (with the
+                    same contents) is processed using the same command, even
+                    in a different batch (or in a different shard, for
+                    example after new files were added to the list).
+                    The command is then run once for each PDB file which is
+                    not in the cache, and the output of each shard is the
+                    output from its files, in order.  (So this requires a
+                    command which processes each file independently, as the
+                    extract_*.sh scripts do.)  (If the DLPDB_CACHE
+                    environment variable is set, it is used by default.)
+   -shard k/N       Only run the k'th of N parts of the list of files (see
+                    batch.py).  This divides a batch among N computers which
+                    share a file system (using a different "-out" directory
+                    for each part).  (The "-shard-size" shards are then
+                    created from the files in this part.)
+
+ Nothing is written to the current directory, so it is safe to run several
+ batches in the same directory at the same time (with different "-out"
+ directories).  Only one batch can use an "-out" directory at a time.
+"""
+
+import sys
+import os
+import hashlib
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    from .batch import ReadFileNames, FileDigest, OpenCache, ParseShard, ShardIndices
+    from .memo import CommandKey, EnvironmentPairs
+except ImportError:
+    from batch import ReadFileNames, FileDigest, OpenCache, ParseShard, ShardIndices
+    from memo import CommandKey, EnvironmentPairs
+
+
+g_program_name = __file__.split('/')[-1]
+g_date_str     = '2026-10-19'
+g_version_str  = '0.3.0'
+
+
+
+def SplitShards(file_names, shard_size):
+    """ Divide a list of file names into consecutive lists of shard_size """
+    return [file_names[i:i+shard_size]
+            for i in range(0, len(file_names), shard_size)]
+
+
+
+def ShardDigest(file_names):
+    """ A hash of the list of file names belonging to a shard """
+    return hashlib.sha256('\n'.join(file_names).encode('utf-8')).hexdigest()
+
+
+
+def ShardFileName(out_dir, index):
+    return os.path.join(out_dir, 'shard_%06d.out' % index)
+
+
+
+class Checkpoint(object):
+    """
+    Checkpoint records which shards have been completed (in the file
+    "checkpoint.txt" in directory out_dir), and the command which they were
+    created with (in "command.txt", followed by the environment variables
+    which the command reads, see memo.py).  It also prevents other processes
+    from using the same directory at the same time.  (Problems raise a
+    ValueError.)
+
+    """
+
+    def __init__(self, out_dir, command):
+        self.out_dir = out_dir
+        if not os.path.isdir(out_dir):
+            os.makedirs(out_dir)
+
+        # (fcntl is only available on unix-like systems.  It is imported
+        #  here, so that the rest of dlpdb can be imported elsewhere.)
+        import fcntl
+        self.lock_file = open(os.path.join(out_dir, 'lock'), 'w')
+        try:
+            fcntl.flock(self.lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except IOError:
+            self.lock_file.close()
+            raise ValueError('The directory \"'+out_dir+'\" is in use by another process.')
+
+        # (Resuming with a different SELECT, for example, would otherwise
+        #  combine shards created with different selections.)
+        command_text = '\0'.join(command + EnvironmentPairs()) + '\n'
+        command_file_name = os.path.join(out_dir, 'command.txt')
+        if os.path.exists(command_file_name):
+            f = open(command_file_name, 'r')
+            previous_command_text = f.read()
+            f.close()
+            if previous_command_text != command_text:
+                self.Close()
+                raise ValueError('The directory \"'+out_dir+'\" was created by a different command.\n'
+                                 '  (Use a new directory, or delete this one.)')
+        else:
+            f = open(command_file_name, 'w')
+            f.write(command_text)
+            f.close()
+
+        # Read the list of shards which were completed previously
+        self.completed = {}
+        self.journal_file_name = os.path.join(out_dir, 'checkpoint.txt')
+        if os.path.exists(self.journal_file_name):
+            f = open(self.journal_file_name, 'r')
+            for line in f:
+                tokens = line.split()
+                if len(tokens) == 2:  # (ignore an incomplete last line)
+                    self.completed[int(tokens[0])] = tokens[1]
+            f.close()
+        self.journal = open(self.journal_file_name, 'a')
+
+    def Completed(self, index, digest):
+        """ Was the shard (containing these files) completed already? """
+        return ((self.completed.get(index) == digest) and
+                os.path.exists(ShardFileName(self.out_dir, index)))
+
+    def Record(self, index, digest):
+        self.completed[index] = digest
+        self.journal.write(str(index)+' '+digest+'\n')
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+
+    def Close(self):
+        if hasattr(self, 'journal'):
+            self.journal.close()
+        import fcntl
+        fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+        self.lock_file.close()
+
+
+
+def FileKey(cache, command, file_name):
+    """
+    The key used to store the output of the command for one PDB file in a
+    ResultCache.  It depends on the command (and the environment variables
+    which it reads, see memo.py), and the name and contents of the file.
+
+    """
+    if os.path.exists(file_name):
+        digest = file_name+' '+FileDigest(file_name)
+    else:
+        digest = file_name+' -'
+    return cache.DataKey(CommandKey(command),
+                          digest.encode('utf-8'))
+
+
+
+def RunCommand(command, file_names, out_file):
+    """
+    Run the command, sending it the list of file names (one per line),
+    and write its standard output to out_file.  Returns its exit status.
+
+    """
+    process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                               stdout=out_file)
+    process.communicate(''.join([file_name+'\n'
+                                 for file_name in file_names]).encode('utf-8'))
+    return process.returncode
+
+
+
+def RunShard(command, file_names, out_file_name, cache=None):
+    """
+    Run the command, sending it the list of file names (one per line), and
+    save its standard output in out_file_name (via a temporary file which
+    is renamed when the command finishes).  Returns the command's exit status.
+    (If it fails, out_file_name is not created.)  If a ResultCache is
+    supplied, the output from each file is looked up in the cache instead,
+    and the command is run separately for each file which is not found
+    (and its output is stored in the cache).
+
+    """
+    fd, tmp_name = tempfile.mkstemp(suffix='.tmp',
+                                    dir=os.path.dirname(out_file_name))
+    try:
+        out_file = os.fdopen(fd, 'w+b')
+        try:
+            if cache == None:
+                status = RunCommand(command, file_names, out_file)
+            else:
+                status = 0
+                for file_name in file_names:
+                    key = FileKey(cache, command, file_name)
+                    found, output = cache.Load(key)
+                    if not found:
+                        out_file.flush()
+                        start = out_file.tell()
+                        status = RunCommand(command, [file_name], out_file)
+                        if status != 0:
+                            break
+                        end = out_file.seek(0, os.SEEK_END)
+                        out_file.seek(start)
+                        output = out_file.read(end - start)
+                        cache.Store(key, output)
+                    else:
+                        out_file.write(output)
+            out_file.flush()
+            os.fsync(out_file.fileno())
+        finally:
+            out_file.close()
+        if status == 0:
+            os.replace(tmp_name, out_file_name)
+    finally:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+    return status
+
+
+
+def main():
+    out_dir = None
+    shard_size = 10
+    num_procs = 1
+    print_output = True
+    cache_dir = None
+    part = None
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] in ('-out', '-shard-size', '-np', '-cache', '-shard'):
+            if i+1 >= len(sys.argv):
+                sys.stderr.write('Error: The '+sys.argv[i]+' argument should be followed by another argument.\n')
+                exit(-1)
+            if sys.argv[i] == '-out':
+                out_dir = sys.argv[i+1]
+            elif sys.argv[i] == '-shard-size':
+                shard_size = int(sys.argv[i+1])
+            elif sys.argv[i] == '-np':
+                num_procs = int(sys.argv[i+1])
+            elif sys.argv[i] == '-cache':
+                cache_dir = sys.argv[i+1]
+            elif sys.argv[i] == '-shard':
+                try:
+                    part = ParseShard(sys.argv[i+1])
+                except ValueError as err:
+                    sys.stderr.write('Error: '+str(err)+'\n')
+                    exit(-1)
+            i += 2
+        elif sys.argv[i] == '-no-cat':
+            print_output = False
+            i += 1
+        else:
+            break  # The remaining arguments are the command
+    command = sys.argv[i:]
+
+    if out_dir == None:
+        sys.stderr.write('Error: The -out argument is required.\n')
+        exit(-1)
+    if len(command) == 0:
+        sys.stderr.write('Error: Expected a command after the optional arguments.\n')
+        exit(-1)
+    if (shard_size < 1) or (num_procs < 1):
+        sys.stderr.write('Error: The -shard-size and -np arguments must be positive.\n')
+        exit(-1)
+
+    sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
+
+    file_names = ReadFileNames(sys.stdin)
+    if part != None:
+        file_names = [file_names[n] for n in ShardIndices(file_names, part)]
+    shards = SplitShards(file_names, shard_size)
+    digests = [ShardDigest(shard) for shard in shards]
+
+    try:
+        cache = OpenCache(cache_dir, g_program_name+' v'+g_version_str)
+    except (ValueError, OSError) as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        exit(-1)
+
+    try:
+        checkpoint = Checkpoint(out_dir, command)
+    except ValueError as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        exit(-1)
+
+    failed = []
+    try:
+        pending = [n for n in range(0, len(shards))
+                   if not checkpoint.Completed(n, digests[n])]
+        if len(pending) < len(shards):
+            sys.stderr.write('  Resuming: '+str(len(shards)-len(pending))+' of '+
+                             str(len(shards))+' shards were already completed.\n')
+        executor = ThreadPoolExecutor(max_workers=num_procs)
+        try:
+            futures = dict([(executor.submit(RunShard, command, shards[n],
+                                             ShardFileName(out_dir, n), cache), n)
+                            for n in pending])
+            for future in as_completed(futures):
+                n = futures[future]
+                try:
+                    status = future.result()
+                except OSError as err:
+                    sys.stderr.write('Error: '+str(err)+'\n')
+                    status = None
+                if status == 0:
+                    checkpoint.Record(n, digests[n])
+                else:
+                    failed.append(n)
+                    sys.stderr.write('Error: The command failed for shard '+str(n)+
+                                     ' (files '+str(n*shard_size+1)+'-'+
+                                     str(n*shard_size+len(shards[n]))+').\n')
+        finally:
+            executor.shutdown(wait=True)
+    finally:
+        checkpoint.Close()
+
+    if len(failed) > 0:
+        sys.stderr.write('Error: '+str(len(failed))+' shard(s) failed.  '
+                         'Run the same command again to retry them.\n')
+        exit(-1)
+
+    if print_output:
+        for n in range(0, len(shards)):
+            f = open(ShardFileName(out_dir, n), 'r')
+            block = f.read(1048576)
+            while len(block) > 0:
+                sys.stdout.write(block)
+                block = f.read(1048576)
+            f.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+#!/usr/bin/env python
+
+"""
+ Typical usage:
+
+    bootstrap.py -min 0 < distances_raw.dat > distances_ave_dev_n.dat
+
+ This program reads a file containing one line for each PDB file
+ (or chain), such as the "_raw.dat" files created by extract_distances.sh,
+ and prints the average and standard deviation of all of the numbers in the
+ file, followed by the number of numbers (as in the "_ave_dev_n.dat" files).
+ It also prints the uncertainty of the average and of the standard deviation
+ (on the same line):
+
+    ave  dev  n  delta_ave  delta_dev
+
+ These uncertainties are estimated by resampling the lines of the file
+ ("bootstrapping").  Numbers measured from the same chain are usually
+ correlated with each other, so the usual estimate (dev/sqrt(n)) which
+ assumes that every number is independent is often much too small.
+ Resampling entire lines (chains) instead of individual numbers avoids this.
+
+ Optional arguments:
+
+   -min X         Ignore numbers less than X.  (For example, "-min 0" ignores
+                  the impossible values (-1 or -360) which extract_distances.sh
+                  uses to indicate missing atoms.)
+   -max X         Ignore numbers greater than X.
+   -weights FILE  FILE contains one weight for each line of the input
+                  (for example, created using chain_weights.py).  Every number
+                  on that line is counted using that weight.
+   -r R           The number of bootstrap replicates.  (Default: 1000)
+   -seed S        The random seed.  (Default: 1)
+   -np N          Use at most N processes.  (By default, one process per CPU.)
+   -partial       Instead of the results, print the sums (see MomentSums())
+                  computed from each line, in a format which can be combined
+                  exactly with the sums from other parts of the data.
+   -shard k/N     Label the sums printed by "-partial" as the k'th of N parts.
+                  (The input should contain only that part.)
+   -reduce        Combine the sums in the files which follow (each created
+                  using "-shard k/N -partial"), and print the results.
+                  (These are the same as if the parts had been concatenated,
+                   in order, see reduce_partials.py.)
+
+ -----------------------------------------------------------------------
+
+ The functions in this module can be used to estimate the uncertainty of
+ (almost) any statistic computed from a corpus of PDB files (see for example
+ "ss_propensity.py -bootstrap").  This requires that the statistic can
+ be computed from a list of totals (such as counts, or sums of numbers),
+ where each total is the sum of the contributions from each entry (file or
+ chain) in the corpus.  These contributions (the "partial aggregates") are
+ computed once.  A bootstrap replicate draws N entries (with replacement)
+ from the N entries in the corpus.  Its totals are a weighted sum of the
+ partial aggregates (where the weights are the number of times each entry
+ was drawn), so no files need to be read again.
+
+ Each replicate uses its own random number generator, whose seed is
+ determined by the "seed" argument and the replicate number.  So the results
+ do not depend on the number of processes used (or the order of execution).
+"""
+
+import sys
+import math
+import random
+import operator
+from multiprocessing import Pool
+# Sometimes this program pipes its output to other programs which halt early.
+# Below we silently suppress the ugly "Broken pipe" message this generates:
+import signal
+signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+try:
+    from .batch import DefaultNumProcs, ParseShard
+    from .chain_weights import ReadWeights, WeightsDigest
+    from .reduce_partials import Partials, ReducePartials
+except ImportError:
+    from batch import DefaultNumProcs, ParseShard
+    from chain_weights import ReadWeights, WeightsDigest
+    from reduce_partials import Partials, ReducePartials
+
+
+g_program_name = __file__.split('/')[-1]
+g_date_str     = '2026-10-19'
+g_version_str  = '0.3.0'
+
+
+
+def ResampleCounts(num_entries, seed, replicate):
+    """
+    ResampleCounts() draws num_entries entries (with replacement) from a list
+    of num_entries entries, and returns the number of times each entry was
+    drawn.  The result depends only on the arguments.
+
+    """
+    rng = random.Random(str(seed) + ':' + str(replicate))
+    counts = [0] * num_entries
+    for n in range(0, num_entries):
+        counts[rng.randrange(num_entries)] += 1
+    return counts
+
+
+
+def Columns(partials):
+    """
+    Convert a list of partial aggregates (one list of numbers per entry,
+    all of the same length) into a list of columns (one per total).
+
+    """
+    if len(partials) == 0:
+        return []
+    return [list(column) for column in zip(*partials)]
+
+
+
+def WeightedTotals(columns, weights):
+    """ Return the weighted sum of each column (see Columns()) """
+    return [sum(map(operator.mul, weights, column)) for column in columns]
+
+
+
+class Bootstrap(object):
+    """
+    Bootstrap stores the partial aggregates (one list of numbers per entry),
+    and evaluates a statistic on the totals of the original corpus,
+    or on the totals of bootstrap replicates of the corpus.
+    "statistic" is a function which accepts a list of totals and returns
+    a list of values (any of which can be None, if it cannot be computed).
+    (When using multiple processes, "statistic" must be defined at the top
+     level of a module.)
+
+    """
+
+    def __init__(self, partials, statistic):
+        self.num_entries = len(partials)
+        self.columns = Columns(partials)
+        self.statistic = statistic
+
+    def Totals(self, weights=None):
+        if weights == None:
+            return [sum(column) for column in self.columns]
+        return WeightedTotals(self.columns, weights)
+
+    def Estimate(self):
+        return self.statistic(self.Totals())
+
+    def Replicate(self, seed, replicate):
+        weights = ResampleCounts(self.num_entries, seed, replicate)
+        return self.statistic(self.Totals(weights))
+
+    def Replicates(self, num_replicates, seed=1, num_procs=None):
+        """
+        Returns a list of the statistic's values for each replicate
+        (in order).  When num_procs > 1, the replicates are distributed over
+        a pool of processes.  (Each process receives a copy of the partial
+        aggregates once, when it is created.)
+
+        """
+        if num_procs == None:
+            num_procs = DefaultNumProcs()
+        if (num_procs <= 1) or (num_replicates <= 1):
+            return [self.Replicate(seed, r) for r in range(0, num_replicates)]
+        pool = Pool(min(num_procs, num_replicates),
+                    initializer=_InitWorker, initargs=(self,))
+        try:
+            results = pool.map(_ReplicateWorker,
+                               [(seed, r) for r in range(0, num_replicates)],
+                               max(1, num_replicates // (4*num_procs)))
+            pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+        return results
+
+    def Errors(self, num_replicates, seed=1, num_procs=None):
+        """
+        Return the estimate of the statistic (using all of the entries),
+        and the standard deviation of each value over the replicates.
+
+        """
+        return (self.Estimate(),
+                StandardDeviations(self.Replicates(num_replicates,
+                                                   seed,
+                                                   num_procs)))
+
+
+
+# The Bootstrap object used by each worker process:
+_g_bootstrap = None
+
+def _InitWorker(bootstrap):
+    global _g_bootstrap
+    _g_bootstrap = bootstrap
+
+def _ReplicateWorker(seed_replicate):
+    return _g_bootstrap.Replicate(seed_replicate[0], seed_replicate[1])
+
+
+
+def StandardDeviations(replicates):
+    """
+    Return the (unbiased) standard deviation of each value over a list of
+    replicates.  (Replicates in which a value is None are ignored.
+    None is returned for values with fewer than 2 replicates.)
+
+    """
+    if len(replicates) == 0:
+        return []
+    deviations = []
+    for j in range(0, len(replicates[0])):
+        x = [rep[j] for rep in replicates if rep[j] != None]
+        n = len(x)
+        if n < 2:
+            deviations.append(None)
+            continue
+        x_ave = math.fsum(x) / n
+        x_var = math.fsum([(x_i - x_ave)**2 for x_i in x]) / (n - 1)
+        deviations.append(math.sqrt(x_var))
+    return deviations
+
+
+
+def MomentSums(numbers, weight=1.0):
+    """
+    Return the partial aggregate for a list of numbers (each with the same
+    weight, w):  [n, n*w, w*sum(x), w*sum(x^2), n*w^2]
+
+    """
+    n = len(numbers)
+    return [n, n*weight,
+            weight*math.fsum(numbers),
+            weight*math.fsum([x*x for x in numbers]),
+            n*weight*weight]
+
+
+
+def AveDev(totals):
+    """
+    Return [average, (unbiased) standard deviation] from the totals
+    computed by MomentSums() (or None, if there are too few numbers).
+    (If the numbers are weighted, the standard deviation is unbiased
+     assuming the weights are "reliability" weights.)
+
+    """
+    n, w_sum, wx_sum, wx_sqr_sum, w_sqr_sum = totals
+    if (n < 1) or (w_sum <= 0.0):
+        return [None, None]
+    x_ave = wx_sum / w_sum
+    if (n < 2) or (w_sum*w_sum <= w_sqr_sum):
+        return [x_ave, None]
+    x_var = ((wx_sqr_sum/w_sum - x_ave*x_ave) *
+             (w_sum*w_sum / (w_sum*w_sum - w_sqr_sum)))
+    if x_var < 0.0:   # <-- This could happen due to numerical roundoff
+        x_var = 0.0
+    return [x_ave, math.sqrt(x_var)]
+
+
+
+def WriteAveDevErrors(partials, num_replicates, seed=1, num_procs=None):
+    """
+    Print the average, standard deviation, number of numbers, and their
+    uncertainties, computed from a list of MomentSums() (one per line).
+
+    """
+    bootstrap = Bootstrap(partials, AveDev)
+    n = int(bootstrap.Totals()[0])
+    if n < 2:
+        sys.stderr.write('Error: Fewer than 2 numbers were read.\n')
+        exit(-1)
+    estimate, errors = bootstrap.Errors(num_replicates, seed, num_procs)
+    sys.stdout.write(str(estimate[0])+' '+str(estimate[1])+' '+str(n)+' '+
+                     ' '.join([str(x) if x != None else 'NA'
+                               for x in errors])+'\n')
+
+
+
+def main():
+    num_procs = None
+    num_replicates = 1000
+    seed = 1
+    x_min = None
+    x_max = None
+    weights_file_name = None
+    shard = None
+    write_partial = False
+    reduce_partials = False
+    file_names = []
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] in ('-np', '-r', '-seed', '-min', '-max', '-weights',
+                           '-shard'):
+            if i+1 >= len(sys.argv):
+                sys.stderr.write('Error: The '+sys.argv[i]+' argument should be followed by another argument.\n')
+                exit(-1)
+            if sys.argv[i] == '-np':
+                num_procs = int(sys.argv[i+1])
+            elif sys.argv[i] == '-r':
+                num_replicates = int(sys.argv[i+1])
+            elif sys.argv[i] == '-seed':
+                seed = int(sys.argv[i+1])
+            elif sys.argv[i] == '-min':
+                x_min = float(sys.argv[i+1])
+            elif sys.argv[i] == '-max':
+                x_max = float(sys.argv[i+1])
+            elif sys.argv[i] == '-weights':
+                weights_file_name = sys.argv[i+1]
+            elif sys.argv[i] == '-shard':
+                try:
+                    shard = ParseShard(sys.argv[i+1])
+                except ValueError as err:
+                    sys.stderr.write('Error: '+str(err)+'\n')
+                    exit(-1)
+            i += 2
+        elif sys.argv[i] == '-partial':
+            write_partial = True
+            i += 1
+        elif sys.argv[i] == '-reduce':
+            reduce_partials = True
+            i += 1
+        elif reduce_partials:
+            file_names.append(sys.argv[i])
+            i += 1
+        else:
+            sys.stderr.write('Error: Unrecognized argument: \"'+sys.argv[i]+'\"\n')
+            exit(-1)
+
+    sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
+
+    if reduce_partials:
+        try:
+            reduced = ReducePartials(file_names,
+                                     g_program_name+' v'+g_version_str)
+            reduced.CheckComplete()
+        except (ValueError, IOError) as err:
+            sys.stderr.write('Error: '+str(err)+'\n')
+            exit(-1)
+        # (The keys are the shard and line number of each line.)
+        partials = [reduced.Values(key) for key in reduced.Keys()]
+        WriteAveDevErrors(partials, num_replicates, seed, num_procs)
+        return
+
+    weights = None
+    if weights_file_name != None:
+        try:
+            weights_file = open(weights_file_name, 'r')
+            weights = ReadWeights(weights_file)
+            weights_file.close()
+        except (ValueError, IOError) as err:
+            sys.stderr.write('Error: '+str(err)+'\n')
+            exit(-1)
+
+    partials = []
+    for line in sys.stdin:
+        numbers = [float(token) for token in line.split()]
+        if x_min != None:
+            numbers = [x for x in numbers if x >= x_min]
+        if x_max != None:
+            numbers = [x for x in numbers if x <= x_max]
+        weight = 1.0
+        if weights != None:
+            if len(partials) >= len(weights):
+                sys.stderr.write('Error: The weights file contains fewer lines than the input.\n')
+                exit(-1)
+            weight = weights[len(partials)]
+        partials.append(MomentSums(numbers, weight))
+
+    if write_partial:
+        if shard == None:
+            shard = (1, 1)
+        reduced = Partials(g_program_name+' v'+g_version_str,
+                           [('min', x_min), ('max', x_max),
+                            ('weights', WeightsDigest(weights_file_name))],
+                           2, shard)
+        reduced.num_files = len(partials)
+        for n in range(0, len(partials)):
+            reduced.Add((shard[0], n), partials[n])
+        reduced.Write(sys.stdout)
+        return
+
+    WriteAveDevErrors(partials, num_replicates, seed, num_procs)
+
+
+if __name__ == "__main__":
+    main()
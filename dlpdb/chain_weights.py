@@ -0,0 +1,288 @@
+#!/usr/bin/env python
+
+"""
+ Typical usage:
+
+    ls -f1 *.pdb | chain_weights.py -clusters clusters.txt > weights.dat
+
+    ls -f1 *.pdb | chain_weights.py -table my_weights.txt > weights.dat
+
+ Families of homologous proteins are over-represented in the PDB.  If every
+ chain is given the same weight, these families dominate the distributions
+ of distances and angles measured from the PDB.  One solution is to discard
+ the redundant chains (see dlpisces.py and cull_chains.py).  Another is to
+ keep all of the chains, but to give each chain a weight of 1/M, where M is
+ the number of chains in its cluster of similar sequences.
+
+ This program reads a list of PDB files (one per line, in the same order
+ that they were given to one of the "extract_*.sh" scripts), and prints the
+ weight of each file (one per line).  These weights can then be used
+ by other programs (see "histogram.py -weights" and "bootstrap.py -weights").
+ Each file is assumed to contain a single chain, and its name should contain
+ the chain's ID (for example "7odc_chainA.pdb", as created by dlpisces.py).
+ (PDB files containing several chains can be weighted by ss_propensity.py
+  and pdbs2rama.py using "-chain-weights FILE", where FILE is in the format
+  used by "-table", below.  Each chain is then counted using its own weight.)
+
+ Arguments (one of these is required):
+
+   -clusters FILE  FILE contains one line for each chain.  Each line contains
+                   the ID of a cluster (for example, the ID of its
+                   representative chain) followed by the ID of the chain.
+                   (This is the format of the file created using
+                    "cull_chains.py -clusters FILE".)
+                   The weight of each chain is 1/(the size of its cluster).
+   -table FILE     FILE contains one line for each chain, containing its
+                   ID followed by its weight.
+
+ Blank lines (and text following a "#") are ignored in both files.  Other
+ lines which are not in this format are an error.
+ Chain IDs look like "7ODCA" (the PDB code, followed by the chain letter).
+ The case of the (4-character) PDB code does not matter, but the case of the
+ chain letter does.  (Large entries can contain chains "a" and "A".)
+ A PDB code (without a chain) can also be used, in which case the weight
+ applies to every file with that PDB code.
+
+ Optional arguments:
+
+   -default W      The weight of files whose chains do not appear in FILE.
+                   (Default: 1)
+"""
+
+import sys
+# Sometimes this program pipes its output to other programs which halt early.
+# Below we silently suppress the ugly "Broken pipe" message this generates:
+import signal
+signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+try:
+    from .pdbs2fasta import PDBCode
+    from .batch import ReadFileNames, FileDigest
+except ImportError:
+    from pdbs2fasta import PDBCode
+    from batch import ReadFileNames, FileDigest
+
+
+g_program_name = __file__.split('/')[-1]
+g_date_str     = '2026-10-19'
+g_version_str  = '0.1.0'
+
+
+
+def NormalizeChainID(chain_id):
+    """
+    Return a chain's ID (such as "7odcA") with its PDB code (the first 4
+    characters) in upper case ("7ODCA").  The case of the chain letter is
+    not changed, since chains "a" and "A" are different chains.
+
+    """
+    return chain_id[0:4].upper() + chain_id[4:]
+
+
+
+def ChainIDFromFileName(file_name):
+    """
+    Guess the chain's ID from the file name
+    (eg. "pdbs/7odc_chainA.pdb" -> "7ODCA",  "1abc.pdb" -> "1ABC")
+
+    """
+    name = PDBCode(file_name)
+    i = name.find('_chain')
+    if i == -1:
+        return NormalizeChainID(name)
+    return NormalizeChainID(name[:i] + name[i+6:])
+
+
+
+def BadLine(in_file, line_number, line, expected):
+    """
+    Return the ValueError raised by the functions below when a line of a
+    weights (or clusters) file cannot be read.
+
+    """
+    file_name = getattr(in_file, 'name', None)
+    if file_name == None:
+        file_name = '(unknown file)'
+    return ValueError('Line '+str(line_number)+' of \"'+str(file_name)+'\" should contain '+
+                      expected+':\n'+line.rstrip('\n'))
+
+
+
+def ReadWeightTable(in_file):
+    """
+    ReadWeightTable() reads a file containing a chain ID and a weight on
+    each line, and returns a dictionary mapping chain IDs to weights.
+    (Blank lines and comments are ignored.  Other lines which do not contain
+     an ID and a weight raise a ValueError.  See BadLine().)
+
+    """
+    id2weight = {}
+    line_number = 0
+    for line in in_file:
+        line_number += 1
+        tokens = line.split('#')[0].split()
+        if len(tokens) == 0:
+            continue
+        try:
+            id2weight[NormalizeChainID(tokens[0])] = float(tokens[1])
+        except (ValueError, IndexError):
+            raise BadLine(in_file, line_number, line, 'a chain ID and a weight')
+    return id2weight
+
+
+
+def ClusterWeights(pairs):
+    """
+    ClusterWeights() accepts a list of (cluster, chain) pairs, and returns
+    a dictionary which assigns each chain the weight 1/M, where M is the
+    number of chains in its cluster.
+
+    """
+    cluster_sizes = {}
+    for cluster, chain in pairs:
+        cluster_sizes[cluster] = cluster_sizes.get(cluster, 0) + 1
+    return dict([(chain, 1.0/cluster_sizes[cluster])
+                 for cluster, chain in pairs])
+
+
+
+def ReadClusters(in_file):
+    """
+    ReadClusters() reads a file containing the ID of a cluster
+    followed by the ID of a chain on each line, and returns a list of
+    (cluster, chain) pairs.  (Blank lines and comments are ignored.)
+
+    """
+    pairs = []
+    line_number = 0
+    for line in in_file:
+        line_number += 1
+        tokens = line.split('#')[0].split()
+        if len(tokens) == 0:
+            continue
+        if len(tokens) < 2:
+            raise BadLine(in_file, line_number, line, 'a cluster ID and a chain ID')
+        pairs.append((NormalizeChainID(tokens[0]), NormalizeChainID(tokens[1])))
+    return pairs
+
+
+
+def FileWeight(file_name, id2weight, default_weight=1.0):
+    """
+    Return the weight of the chain in a PDB file (using the chain's ID,
+    or the file's PDB code, if the chain's ID is not in id2weight).
+
+    """
+    chain_id = ChainIDFromFileName(file_name)
+    if chain_id in id2weight:
+        return id2weight[chain_id]
+    return id2weight.get(chain_id[0:4], default_weight)
+
+
+
+def ChainWeight(file_name, chainID, id2weight, default_weight=1.0):
+    """
+    Return the weight of one chain (chainID) in a PDB file which may contain
+    several chains.  The chain's ID is the file's PDB code followed by chainID
+    (eg. "1ABCA"), unless the name of the file contains the chain's ID
+    (eg. "7odc_chainA.pdb", see ChainIDFromFileName()).  If the chain's ID
+    is not in id2weight, the weight of its PDB code is used.  (The case of
+    chainID matters.  See NormalizeChainID().)
+
+    """
+    chain_id = ChainIDFromFileName(file_name)
+    if PDBCode(file_name).find('_chain') == -1:
+        chain_id = chain_id[0:4] + chainID.strip()
+    if chain_id in id2weight:
+        return id2weight[chain_id]
+    return id2weight.get(chain_id[0:4], default_weight)
+
+
+
+def ReadWeights(in_file):
+    """
+    Read a list of weights (one per line) created by this program.
+    (Blank lines are assigned a weight of 1.  Lines which do not begin with
+     a number raise a ValueError.  See BadLine().)
+
+    """
+    weights = []
+    line_number = 0
+    for line in in_file:
+        line_number += 1
+        tokens = line.split()
+        if len(tokens) == 0:
+            weights.append(1.0)
+        else:
+            try:
+                weights.append(float(tokens[0]))
+            except ValueError:
+                raise BadLine(in_file, line_number, line, 'a weight')
+    return weights
+
+
+
+def WeightsDigest(file_name):
+    """
+    Return the value which records the weights file used to create partial
+    results (see reduce_partials.py):  a hash of the contents of the file,
+    or False if file_name is None (no weights were used).  (Partial results
+    created using different weights cannot be added together.)
+
+    """
+    if file_name == None:
+        return False
+    return FileDigest(file_name)
+
+
+
+def main():
+    clusters_file_name = None
+    table_file_name = None
+    default_weight = 1.0
+    file_names = []
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] in ('-clusters', '-table', '-default'):
+            if i+1 >= len(sys.argv):
+                sys.stderr.write('Error: The '+sys.argv[i]+' argument should be followed by another argument.\n')
+                exit(-1)
+            if sys.argv[i] == '-clusters':
+                clusters_file_name = sys.argv[i+1]
+            elif sys.argv[i] == '-table':
+                table_file_name = sys.argv[i+1]
+            elif sys.argv[i] == '-default':
+                default_weight = float(sys.argv[i+1])
+            i += 2
+        else:
+            file_names.append(sys.argv[i])
+            i += 1
+
+    sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
+
+    if (clusters_file_name == None) == (table_file_name == None):
+        sys.stderr.write('Error: Please use either the -clusters or the -table argument.\n')
+        exit(-1)
+
+    try:
+        if clusters_file_name != None:
+            clusters_file = open(clusters_file_name, 'r')
+            id2weight = ClusterWeights(ReadClusters(clusters_file))
+            clusters_file.close()
+        else:
+            table_file = open(table_file_name, 'r')
+            id2weight = ReadWeightTable(table_file)
+            table_file.close()
+    except (ValueError, IOError) as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        exit(-1)
+
+    if len(file_names) == 0:
+        file_names = ReadFileNames(sys.stdin)
+
+    for file_name in file_names:
+        sys.stdout.write(str(FileWeight(file_name, id2weight, default_weight))+'\n')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+
+"""
+ Typical usage:
+
+    ls -f1 *.pdb | classify_pdbs.py > tags.csv
+
+    ls -f1 *.pdb | classify_pdbs.py -sqlite tags.db
+
+ This program reads each PDB file in the list once, and decides all of the
+ questions which are otherwise answered by the "move_*.sh" scripts
+ (each of which reads every file again):
+
+   nmr               contains the text " NMR"     (move_nmr_structures.sh)
+   membrane          contains "MEMBRANE" or "MICELLE"
+                                                  (move_membrane_proteins.sh)
+   protein_heavy_atoms  see has_protein_heavy_atoms.py
+                                         (move_missing_protein_heavy_atoms.sh)
+   dna_heavy_atoms   see has_dna_heavy_atoms.py  (move_missing_dna_heavy_atoms.sh)
+   rna_heavy_atoms   see has_rna_heavy_atoms.py  (move_non-dna.sh)
+   header_dna        the HEADER record only contains the word "DNA"
+                                                  (move_non-dna.sh)
+   helices           contains HELIX records       (has_helices.py)
+   sheets            contains SHEET records       (has_sheets.py)
+   turns             contains TURN records        (has_turns.py)
+   secondary_str     contains HELIX, SHEET, or TURN records
+                                                  (move_missing_secondary_str.sh)
+
+ The answers are printed as a table with one row per file and one column
+ per question (1=yes, 0=no).  Instead of moving files into other
+ directories, later steps can select files from this table, for example:
+
+    awk -F, '(NR>1) && ($2==0) && ($3==0) && ($11==1) {print $1}' tags.csv \\
+      | extract_helix_angles.sh '" CA " i+1 " CA " i+2 " CA "'
+
+ By default the table is written to the standard output in CSV format.
+ If the "-sqlite FILE" argument is used, the table is stored (as a table
+ named "tags") in an SQLite database file instead, for example:
+
+    sqlite3 tags.db "SELECT file FROM tags WHERE nmr=0 AND secondary_str=1"
+
+ The files are processed in parallel.  The "-np N" argument limits the
+ number of processes to N.  (By default, one process per CPU is used.)
+ PDB files can also be passed as arguments instead of via the standard input.
+ Files which cannot be read are reported (on the standard error), and are
+ omitted from the table.
+"""
+
+import sys
+import csv
+# Sometimes this program pipes its output to other programs which halt early.
+# Below we silently suppress the ugly "Broken pipe" message this generates:
+import signal
+signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+try:
+    from .batch import ReadFileNames, MapFiles
+    from . import has_protein_heavy_atoms, has_dna_heavy_atoms, has_rna_heavy_atoms
+except ImportError:
+    from batch import ReadFileNames, MapFiles
+    import has_protein_heavy_atoms, has_dna_heavy_atoms, has_rna_heavy_atoms
+
+
+g_program_name = __file__.split('/')[-1]
+g_date_str     = '2026-10-19'
+g_version_str  = '0.1.1'
+
+
+tag_names = ['nmr',
+             'membrane',
+             'protein_heavy_atoms',
+             'dna_heavy_atoms',
+             'rna_heavy_atoms',
+             'header_dna',
+             'helices',
+             'sheets',
+             'turns',
+             'secondary_str']
+
+
+# The residue types and atoms which the has_*_heavy_atoms.py scripts look for:
+heavy_atom_criteria = [('protein_heavy_atoms',
+                        set(has_protein_heavy_atoms.res_types),
+                        set(has_protein_heavy_atoms.atoms_found)),
+                       ('dna_heavy_atoms',
+                        set(has_dna_heavy_atoms.res_types),
+                        set(has_dna_heavy_atoms.atoms_found)),
+                       ('rna_heavy_atoms',
+                        set(has_rna_heavy_atoms.res_types),
+                        set(has_rna_heavy_atoms.atoms_found))]
+
+
+
+def ClassifyPDB(file_name):
+    """
+    ClassifyPDB() reads a PDB file once and returns a dictionary
+    which answers each of the questions in "tag_names" (using True or False).
+
+    """
+    tags = dict([(tag, False) for tag in tag_names])
+    atoms_missing = dict([(name, set(atoms))
+                          for name, res_types, atoms in heavy_atom_criteria])
+    is_first_line = True
+    pdb_file = open(file_name, 'r')
+    for line in pdb_file:
+        if is_first_line:
+            tokens = line.split()
+            if ((len(tokens) == 4) and
+                (tokens[0] == 'HEADER') and (tokens[1] == 'DNA')):
+                tags['header_dna'] = True
+            is_first_line = False
+
+        line_type = line[0:6]
+        if line_type[0:5] == 'ATOM ':
+            atom_type = line[12:16]
+            res_type = line[17:20]
+            for name, res_types, atoms in heavy_atom_criteria:
+                if res_type in res_types:
+                    atoms_missing[name].discard(atom_type)
+            continue   # (ATOM records need not be searched for text)
+
+        if line_type == 'HELIX ':
+            tags['helices'] = True
+        elif line_type == 'SHEET ':
+            tags['sheets'] = True
+        elif line_type[0:5] == 'TURN ':
+            tags['turns'] = True
+
+        line_lower = line.lower()
+        if line_lower.find(' nmr') != -1:
+            tags['nmr'] = True
+        if ((line_lower.find('membrane') != -1) or
+            (line_lower.find('micelle') != -1)):
+            tags['membrane'] = True
+
+    pdb_file.close()
+
+    for name, res_types, atoms in heavy_atom_criteria:
+        tags[name] = (len(atoms_missing[name]) == 0)
+    tags['secondary_str'] = (tags['helices'] or
+                             tags['sheets'] or
+                             tags['turns'])
+    return tags
+
+
+
+def TryClassifyPDB(file_name):
+    """
+    Same as ClassifyPDB(), but if the file cannot be read, a warning is
+    printed and None is returned (instead of halting the other processes).
+
+    """
+    try:
+        return ClassifyPDB(file_name)
+    except (IOError, UnicodeDecodeError) as err:
+        sys.stderr.write('Warning: Unable to read \"'+file_name+'\": '+
+                         str(err)+'\n'
+                         '         (This file will be omitted.)\n')
+        return None
+
+
+
+def WriteCSV(rows, out_file):
+    writer = csv.writer(out_file)
+    writer.writerow(['file'] + tag_names)
+    for file_name, tags in rows:
+        writer.writerow([file_name] + [int(tags[tag]) for tag in tag_names])
+
+
+
+def WriteSQLite(rows, db_file_name):
+    import sqlite3
+    db = sqlite3.connect(db_file_name)
+    db.execute('CREATE TABLE IF NOT EXISTS tags (file TEXT PRIMARY KEY, ' +
+               ', '.join([tag+' INTEGER' for tag in tag_names]) + ')')
+    db.executemany('INSERT OR REPLACE INTO tags VALUES (' +
+                   ', '.join(['?' for i in range(0, len(tag_names)+1)]) + ')',
+                   ([file_name] + [int(tags[tag]) for tag in tag_names]
+                    for file_name, tags in rows))
+    db.commit()
+    db.close()
+
+
+
+def main():
+    num_procs = None
+    db_file_name = None
+    file_names = []
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] in ('-np', '-sqlite'):
+            if i+1 >= len(sys.argv):
+                sys.stderr.write('Error: The '+sys.argv[i]+' argument should be followed by another argument.\n')
+                exit(-1)
+            if sys.argv[i] == '-np':
+                num_procs = int(sys.argv[i+1])
+            else:
+                db_file_name = sys.argv[i+1]
+            i += 2
+        else:
+            file_names.append(sys.argv[i])
+            i += 1
+
+    sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
+
+    if len(file_names) == 0:
+        file_names = ReadFileNames(sys.stdin)
+
+    rows = ((file_name, tags)
+            for file_name, tags in zip(file_names,
+                                       MapFiles(TryClassifyPDB,
+                                                file_names, num_procs))
+            if tags != None)
+
+    if db_file_name != None:
+        WriteSQLite(rows, db_file_name)
+    else:
+        WriteCSV(rows, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
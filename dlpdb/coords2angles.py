@@ -20,6 +20,8 @@ to the standard out.  (3 numbers total, followed by a newline.)
 (When a line contains the wrong number of numbers, 
  the script prints out a list of 3 impossibe negative values: "-360 -1 -1"
  to let the caller know that this particular angle could not be computed
+(The "-precision N" and "-delim STR" arguments control the format of the
+ numbers printed.  See output_format.py.)
 
 """
 
@@ -29,6 +31,11 @@ from math import sqrt, cos, sin, tan, acos, asin, atan, pi
 # Below we silently suppress the ugly "Broken pipe" message this generates:
 import signal
 signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+try:
+    from .output_format import ParseOutputArgs, WriteRows
+except (ImportError, SystemError, ValueError):
+    # not installed as a package
+    from output_format import ParseOutputArgs, WriteRows
 
 
 def length_v(r):
@@ -74,7 +81,13 @@ def Coords2Angles(r0, r1, r2):
 
 
 def main():
-    if (len(sys.argv) > 3):
+    try:
+        output_format, argv = ParseOutputArgs(sys.argv)
+    except ValueError as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        sys.exit(-1)
+
+    if (len(argv) > 3):
         sys.stderr.write('Error (coords2angles): number of arguments should not exceed 2.\n'\
                           '    (The two arguments correspond to the number of lines of\n'\
                           '     text to omit from the beginning and end of the file, respectively.)\n'\
@@ -84,11 +97,11 @@ def main():
 
     # NOTE: The "truncate" arguments are not really supported any more.  Instead
     #       use other scripts to post-process the results printed by this program.
-    elif (len(sys.argv) == 3):
-        truncate_a = int(sys.argv[1])
-        truncate_b = int(sys.argv[2])
-    elif (len(sys.argv) == 2):
-        truncate_a = int(sys.argv[1])
+    elif (len(argv) == 3):
+        truncate_a = int(argv[1])
+        truncate_b = int(argv[2])
+    elif (len(argv) == 2):
+        truncate_a = int(argv[1])
         truncate_b = truncate_a
     else:
         truncate_a = 0
@@ -116,6 +129,7 @@ def main():
     coords_list = coords_list[truncate_a:len(coords_list)-truncate_b]
 
     N = len(coords_list)
+    rows = []
     for i in range(0,N):
         if len(coords_list[i]) == 3*3:
             r0 = [coords_list[i][3*0+0],
@@ -130,12 +144,14 @@ def main():
 
             theta, l10, l21 = Coords2AnglesLengths(r0, r1, r2)
 
-            sys.stdout.write(str(theta*180.0/pi)+" "+str(l10)+" "+str(l21)+'\n')
+            rows.append([theta*180.0/pi, l10, l21])
 
         else:
             # Otherwise, we write out impossible values to let the caller 
             # know that this particular angle could not be computed
-            sys.stdout.write('-360 -1 -1\n')
+            rows.append(['-360', '-1', '-1'])
+
+    WriteRows(rows, output_format)
 
 
 if __name__ == "__main__":
@@ -7,6 +7,8 @@ For each line this program computes the distance between these atom pairs,
 and prints it to the standard out.
 (When a line contains the wrong number of numbers, this program does not crash.
  Instead an impossible value, -1.0 is printed.)
+(The "-precision N" and "-delim STR" arguments control the format of the
+ numbers printed.  See output_format.py.)
 
 """
 
@@ -17,6 +19,11 @@ from math import sqrt
 # Below we silently suppress the ugly "Broken pipe" message this generates:
 import signal
 signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+try:
+    from .output_format import ParseOutputArgs, WriteRows
+except (ImportError, SystemError, ValueError):
+    # not installed as a package
+    from output_format import ParseOutputArgs, WriteRows
 
 
 def length_v(r):
@@ -27,7 +34,13 @@ def length_v(r):
 
 
 def main():
-    if (len(sys.argv) > 3):
+    try:
+        output_format, argv = ParseOutputArgs(sys.argv)
+    except ValueError as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        sys.exit(-1)
+
+    if (len(argv) > 3):
         sys.stderr.write('Error (coords2distances): number of arguments should not exceed 2.\n'\
                           '    (The two arguments correspond to the number of lines of\n'\
                           '     text to omit from the beginning and end of the file, respectively.)\n'\
@@ -37,11 +50,11 @@ def main():
 
     # NOTE: The "truncate" arguments are not really supported any more.  Instead
     #       use other scripts to post-process the results printed by this program.
-    elif (len(sys.argv) == 3):
-        truncate_a = int(sys.argv[1])
-        truncate_b = int(sys.argv[2])
-    elif (len(sys.argv) == 2):
-        truncate_a = int(sys.argv[1])
+    elif (len(argv) == 3):
+        truncate_a = int(argv[1])
+        truncate_b = int(argv[2])
+    elif (len(argv) == 2):
+        truncate_a = int(argv[1])
         truncate_b = truncate_a
     else:
         truncate_a = 0
@@ -74,6 +87,7 @@ def main():
     coords_list = coords_list[truncate_a:len(coords_list)-truncate_b]
 
     N = len(coords_list)
+    rows = []
     for i in range(0,N):
         if len(coords_list[i]) == 2*3:
             r10 = [0.0, 0.0, 0.0]
@@ -81,12 +95,14 @@ def main():
                 r10[d] = coords_list[i][3*1+d] - coords_list[i][3*0+d]
             l10 = length_v(r10)
 
-            sys.stdout.write(str(l10)+'\n')
+            rows.append([l10])
 
         else:
             # Otherwise, we write out an impossible value (-1.0) to let the caller 
             # know that this particular distance could not be computed
-            sys.stdout.write('-1.0\n')
+            rows.append(['-1.0'])
+
+    WriteRows(rows, output_format)
 
 
 if __name__ == "__main__":
@@ -5,6 +5,8 @@ This program reads in x,y,z coordinates from a file
 and computes the "helixAngleOmega"
 (defined in "helix_Omega_angle_derivation.png" in the "doc" subdirectory)
 This has been used to infer the periodicity of alpha-helices within proteins.
+(The "-precision N" and "-delim STR" arguments control the format of the
+ numbers printed.  See output_format.py.)
 """
 
 
@@ -12,16 +14,24 @@ import sys
 from math import sqrt, cos, sin, tan, acos, asin, atan, pi
 try:
     from .helixAngleOmega import CalcOmegaFromThetaPhi, CalcOmega
+    from .output_format import ParseOutputArgs
 except (ImportError, SystemError, ValueError):
     # not installed as a package
     from helixAngleOmega import CalcOmegaFromThetaPhi, CalcOmega
+    from output_format import ParseOutputArgs
 
 
 
 
 
 def main():
-    if (len(sys.argv) > 3):
+    try:
+        output_format, argv = ParseOutputArgs(sys.argv)
+    except ValueError as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        sys.exit(-1)
+
+    if (len(argv) > 3):
         sys.stderr.write('Error (coords2angles_Omega): number of arguments should not exceed 2.\n'\
                              '    (The two arguments correspond to the number of lines of\n'\
                              '     text to omit from the beginning and end of the file, respectively.)\n'\
@@ -29,11 +39,11 @@ def main():
                              '     If no argument is passed, then by default, no data is ignored.\nExiting...\n\n')
         sys.exit(-1)
 
-    elif (len(sys.argv) == 3):
-        truncate_a = int(sys.argv[1])
-        truncate_b = int(sys.argv[2])
-    elif (len(sys.argv) == 2):
-        truncate_a = int(sys.argv[1])
+    elif (len(argv) == 3):
+        truncate_a = int(argv[1])
+        truncate_b = int(argv[2])
+    elif (len(argv) == 2):
+        truncate_a = int(argv[1])
         truncate_b = truncate_a
     else:
         truncate_a = 0
@@ -63,23 +73,22 @@ def main():
     r_i = r_i[truncate_a:len(r_i)-truncate_b]
 
     N = len(r_i)
+    angles = []
     for i in range(0,N-4+1):
 
         if (len(r_i[i])==3)and(len(r_i[i+1])==3)and(len(r_i[i+2])==3)and(len(r_i[i+3])==3):
 
             Omega = CalcOmega(r_i[i], r_i[i+1], r_i[i+2], r_i[i+3])
 
-            sys.stdout.write(str(Omega*180.0/pi))
+            angles.append(Omega*180.0/pi)
 
         else:
             # Otherwise, we write out an impossible value (-720) to let the caller 
             # know that this particular angle could not be computed
-            sys.stdout.write('-720')
-
-        if i+1 < N-4+1:
-            sys.stdout.write(' ')
+            angles.append('-720')
 
-    sys.stdout.write('\n')
+    # (All of the angles are printed on the same line.)
+    sys.stdout.write(output_format.Row(angles) + '\n')
 
 
 if __name__ == "__main__":
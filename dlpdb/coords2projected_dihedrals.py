@@ -40,6 +40,8 @@ containing 4 numbers:
  the script prints out a list of 4 impossibe negative values:
  "-720 -1 -1 -1" to let the caller know that 
  this particular angle could not be computed.)
+(The "-precision N" and "-delim STR" arguments control the format of the
+ numbers printed.  See output_format.py.)
 
 Note:   
 The "IUPAC/IUB" dihedral-angle convention is used:
@@ -63,10 +65,12 @@ from math import sqrt, cos, sin, tan, acos, asin, atan, pi, floor
 try:
     from .closest_line_points import ClosestLinePoints
     from .coords2dihedrals import Coords2DihedralsAnglesLengths,Coords2Dihedrals
+    from .output_format import ParseOutputArgs, WriteRows
 except (ImportError, SystemError, ValueError):
     # not installed as a package
     from closest_line_points import ClosestLinePoints
     from coords2dihedrals import Coords2DihedralsAnglesLengths,Coords2Dihedrals
+    from output_format import ParseOutputArgs, WriteRows
 
 
 import signal
@@ -116,12 +120,17 @@ def Coords2ProjectedDihedrals(r0, r1, r2, r3, branch_of_log=pi):
 
 
 def main():
+    try:
+        output_format, argv = ParseOutputArgs(sys.argv)
+    except ValueError as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        sys.exit(-1)
 
     branch_of_log = pi  # by default, dihedral angles lie in range: [-180,180.0)
     truncate_a    = 0
     truncate_b    = 0
 
-    if (len(sys.argv) > 4):
+    if (len(argv) > 4):
         sys.stderr.write('Error (coords2dihedrals): number of arguments should not exceed 3.\n'\
                          '    If an odd-number of arguments are passed (1 or 3), then\n'
                          '    the first argument is assumed to be the branch-of-log, a number which is\n'
@@ -136,15 +145,15 @@ def main():
 
     # NOTE: The "truncate" arguments are not really supported any more.  Instead
     #       use other scripts to post-process the results printed by this program.
-    elif (len(sys.argv) == 4):
-        branch_of_log = float(sys.argv[1])
-        truncate_a    =   int(sys.argv[2])
-        truncate_b    =   int(sys.argv[3])
-    elif (len(sys.argv) == 3):
-        truncate_a = int(sys.argv[1])
-        truncate_b = int(sys.argv[2])
-    elif (len(sys.argv) == 2):
-        branch_of_log = float(sys.argv[1])
+    elif (len(argv) == 4):
+        branch_of_log = float(argv[1])
+        truncate_a    =   int(argv[2])
+        truncate_b    =   int(argv[3])
+    elif (len(argv) == 3):
+        truncate_a = int(argv[1])
+        truncate_b = int(argv[2])
+    elif (len(argv) == 2):
+        branch_of_log = float(argv[1])
         branch_of_log *= pi/180.0
 
 
@@ -174,6 +183,7 @@ def main():
     coords_list = coords_list[truncate_a:len(coords_list)-truncate_b]
 
     N = len(coords_list)
+    rows = []
     for i in range(0,N):
         if len(coords_list[i]) == 3*4:
             r0 = [coords_list[i][3*0+0],
@@ -192,15 +202,16 @@ def main():
             phi,l10,l21,l32 = Coords2ProjectedDihedralsLengths(r0, r1, r2, r3,
                                                                branch_of_log)
 
-            sys.stdout.write(str(phi*180.0/pi) + ' ' +
-                             str(l10) + ' ' +
-                             str(l21) + ' ' +
-                             str(l32) +
-                             '\n')
+            rows.append([phi*180.0/pi,
+                         l10,
+                         l21,
+                         l32])
         else:
             # Otherwise, we write out an impossible values to let the caller 
             # know that this particular dihedral angle could not be computed
-            sys.stdout.write('-720 -1 -1 -1\n')
+            rows.append(['-720', '-1', '-1', '-1'])
+
+    WriteRows(rows, output_format)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,610 @@
+#!/usr/bin/env python
+
+"""
+ Typical usage:
+
+    ls -f1 *.pdb | cull_chains.py -identity 40 -max-res 2.5 > cullpdb_pc40.txt
+
+ This program removes redundant protein chains from a (long) list of PDB
+ files, without the help of the PISCES server (see dlpisces.py).  This makes
+ it possible to cull custom subsets of the PDB (such as DNA-binding proteins).
+ The output is a list of non-redundant chains in the same format as the lists
+ generated by the PISCES server:
+
+IDs         length Exptl.  resolution  R-factor FreeRvalue
+7ODCA       424  XRAY        1.600    0.20    0.23
+2AXPA       173  XRAY        2.500    0.26    0.29
+
+ ...so it can be used as the input for dlpisces.py.
+ (Note: dlpisces.py will download the PDB files in this list again.)
+
+ The chains are ranked by resolution (best first), then R-factor, then length.
+ Each chain is kept only if its sequence identity with every chain that
+ was kept before it does not exceed the "-identity" threshold (in percent).
+ Here the sequence identity is the number of identical residues in the
+ alignment, divided by the length of the shorter chain.
+
+ Comparing every pair of chains would be too slow for large lists.  Instead:
+   1) Identical sequences are detected using a dictionary.
+   2) A (fixed) fraction of the k-mers (words of length k, see kmers.py) in
+      every chain which was kept so far are stored in a lookup table.  Only the
+      kept chains sharing at least "-min-shared" of these k-mers with the
+      new chain (on nearby diagonals) are compared with it.  (The shared
+      k-mers also reveal how the two sequences should be shifted relative to
+      each other.)  At most 200 chains are stored for each k-mer.  For
+      k-mers found in more chains than that, a random sample of 200 of
+      them is stored.
+   3) The identity along that (ungapped) diagonal is computed first.  If it is
+      not high enough, the sequences are aligned (allowing gaps) using
+      dynamic programming restricted to a narrow band around that diagonal.
+
+ Optional arguments:
+
+   -identity P     Maximum sequence identity (percent).  (Default: 40)
+   -max-res R      Discard chains whose resolution is worse than R Angstroms
+                   (or unknown).  (By default, no chains are discarded.)
+   -min-len L      Discard chains with fewer than L residues. (Default: 40)
+   -k K            The k-mer length used to find similar chains. (Default: 4)
+                   (Shorter k-mers find more distant relatives, but they are
+                    shared by many more unrelated chains.  The number of
+                    chains compared with each new chain then grows with the
+                    number of chains kept, so the running time grows
+                    quadratically with the length of the list.)
+   -frac F         The fraction of k-mers stored in the lookup table.
+                   Increasing F finds more distant relatives (at the cost of
+                   speed).  (Default: 1.0)
+   -min-shared N   Only compare chains which share at least N of these k-mers
+                   (on nearby diagonals).  (Default: 3)
+   -band B         The width of the band used during alignment. (Default: 16)
+   -fasta FILE     Read the chains from a FASTA file (for example, created by
+                   pdbs2fasta.py), instead of from PDB files.
+                   (The header of each sequence should look like ">1abc_A".
+                    In that case, the chains are ranked by length only.)
+   -clusters FILE  Also write the cluster that every chain belongs to into
+                   FILE (including the redundant chains).  Each line contains
+                   the ID of a kept chain (the cluster's representative),
+                   followed by the ID of a chain in its cluster.  This file
+                   can be used to weight each chain (see chain_weights.py).
+   -np N           Use at most N processes to read the PDB files.
+                   (By default, one process per CPU is used.)
+
+ PDB files can also be passed as arguments instead of via the standard input.
+ Only ATOM records (in the first MODEL) are used to determine the sequence.
+ Chains which do not consist mostly of the 20 standard amino acids are ignored.
+"""
+
+import sys
+import random
+# Sometimes this program pipes its output to other programs which halt early.
+# Below we silently suppress the ugly "Broken pipe" message this generates:
+import signal
+signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+try:
+    from .resnames import num_amino_acids, ResName2Code, AminoAcid1to3
+    from .kmers import SampleKmers
+    from .pdbs2fasta import PDBCode, ReadChainCodes
+    from .batch import ReadFileNames, MapFiles
+except ImportError:
+    from resnames import num_amino_acids, ResName2Code, AminoAcid1to3
+    from kmers import SampleKmers
+    from pdbs2fasta import PDBCode, ReadChainCodes
+    from batch import ReadFileNames, MapFiles
+
+
+g_program_name = __file__.split('/')[-1]
+g_date_str     = '2026-10-19'
+g_version_str  = '0.3.0'
+
+
+# Scores used when aligning two sequences:
+match_score    = 2
+mismatch_score = -1
+gap_score      = -2
+
+# During culling, residues are converted into integers in the range
+# [0, num_amino_acids].  All non-standard residues are assigned this code:
+other_code = num_amino_acids
+
+
+
+class ChainEntry(object):
+    """ A protein chain, along with the experimental details of its PDB entry """
+
+    def __init__(self, pdb_code, chainID, codes,
+                 exptl=None, resolution=None, r_factor=None, free_r=None):
+        self.pdb_code = pdb_code
+        self.chainID = chainID
+        self.codes = codes
+        self.exptl = exptl
+        self.resolution = resolution
+        self.r_factor = r_factor
+        self.free_r = free_r
+
+    def ID(self):
+        return self.pdb_code.upper() + self.chainID
+
+    def RankKey(self):
+        """ Chains with smaller keys are considered first """
+        return ((self.resolution == None), self.resolution or 0.0,
+                (self.r_factor == None), self.r_factor or 0.0,
+                -len(self.codes), self.ID())
+
+    def PiscesLine(self):
+        def FormatFloat(x, fmt):
+            if x == None:
+                return 'NA'
+            return fmt % x
+        return (self.ID().ljust(5) + str(len(self.codes)).rjust(10) + '  ' +
+                (self.exptl or 'NA').ljust(4) +
+                FormatFloat(self.resolution, '%.3f').rjust(13) +
+                FormatFloat(self.r_factor, '%.2f').rjust(8) +
+                FormatFloat(self.free_r, '%.2f').rjust(8))
+
+
+pisces_header = 'IDs         length Exptl.  resolution  R-factor FreeRvalue'
+
+
+
+def ParseFloat(s):
+    try:
+        return float(s)
+    except ValueError:
+        return None
+
+
+
+def ReadEntryInfo(file_name, lines=None):
+    """
+    ReadEntryInfo() reads the header of a PDB file, and returns a tuple
+    containing the PDB code, the experimental method ('XRAY', 'NMR', 'EM', ...),
+    the resolution, R-factor, and free R-factor (or None, if not available).
+    (If "lines" is not None, it is used instead of the contents of the file.)
+
+    """
+    pdb_code = None
+    exptl = None
+    resolution = None
+    r_factor = None
+    free_r = None
+    pdb_file = None
+    if lines == None:
+        pdb_file = open(file_name, 'r')
+        lines = pdb_file
+    for line in lines:
+        line_type = line[0:6]
+        if line_type in ("ATOM  ", "HETATM", "MODEL "):
+            break   # (The information we need appears before the coordinates)
+        elif line_type == "HEADER":
+            if len(line[62:66].strip()) == 4:
+                pdb_code = line[62:66].lower()
+        elif line_type == "EXPDTA":
+            method = line[10:79].upper()
+            if method.find('NMR') != -1:
+                exptl = 'NMR'
+            elif method.find('ELECTRON') != -1:
+                exptl = 'EM'
+            elif len(method.split()) > 0:
+                exptl = method.split()[0].replace('-', '')
+        elif line[0:10] == "REMARK   2":
+            tokens = line[10:].split()
+            if (len(tokens) >= 2) and (tokens[0] == 'RESOLUTION.'):
+                resolution = ParseFloat(tokens[1])
+        elif line[0:10] == "REMARK   3":
+            text = line[10:].strip()
+            i_colon = text.find(':')
+            if i_colon == -1:
+                continue
+            tokens = text[i_colon+1:].split()
+            if len(tokens) == 0:
+                continue
+            if (text.startswith('R VALUE') and
+                (text.find('WORKING SET') != -1) and (r_factor == None)):
+                r_factor = ParseFloat(tokens[0])
+            elif (text.startswith('FREE R VALUE ') and
+                  (text.find('TEST SET') == -1) and (free_r == None)):
+                free_r = ParseFloat(tokens[0])
+    if pdb_file != None:
+        pdb_file.close()
+    if pdb_code == None:
+        pdb_code = PDBCode(file_name)[0:4].lower()
+    return pdb_code, exptl, resolution, r_factor, free_r
+
+
+
+def IsProtein(codes):
+    """ Do most of the residues belong to the 20 standard amino acids? """
+    num_aa = len([c for c in codes if c < num_amino_acids])
+    return 2*num_aa > len(codes)
+
+
+
+def ReadChainEntries(file_name):
+    """
+    ReadChainEntries() returns a list of ChainEntry objects, one for each
+    protein chain in a PDB file.
+
+    """
+    pdb_code, exptl, resolution, r_factor, free_r = ReadEntryInfo(file_name)
+    chain2keys, chain2codes, intervals = ReadChainCodes(file_name)
+    entries = []
+    for chainID in sorted(chain2codes):
+        codes = [min(c, other_code) for c in chain2codes[chainID]]
+        if IsProtein(codes):
+            entries.append(ChainEntry(pdb_code, chainID, codes,
+                                      exptl, resolution, r_factor, free_r))
+    return entries
+
+
+
+def ReadFastaEntries(in_file):
+    """
+    ReadFastaEntries() reads a FASTA file whose headers look like ">1abc_A"
+    and returns a list of ChainEntry objects (one per sequence).
+
+    """
+    entries = []
+    names = []
+    sequences = []
+    for line in in_file:
+        line = line.strip()
+        if len(line) == 0:
+            continue
+        if line[0] == '>':
+            names.append(line[1:].split()[0])
+            sequences.append([])
+        elif len(names) > 0:
+            sequences[-1].append(line)
+    for name, sequence in zip(names, sequences):
+        i_underscore = name.find('_')
+        if i_underscore == -1:
+            pdb_code = name
+            chainID = ' '
+        else:
+            pdb_code = name[:i_underscore]
+            chainID = name[i_underscore+1:]
+        codes = [min(ResName2Code(AminoAcid1to3(c.upper())), other_code)
+                 for c in ''.join(sequence)]
+        entries.append(ChainEntry(pdb_code, chainID, codes))
+    return entries
+
+
+
+def UngappedIdentities(a, b, offset):
+    """
+    Count the identical residues when residue i in sequence "a"
+    is aligned with residue i-offset in sequence "b" (without gaps).
+
+    """
+    i_begin = max(0, offset)
+    i_end = min(len(a), len(b)+offset)
+    n = 0
+    for i in range(i_begin, i_end):
+        if (a[i] == b[i-offset]) and (a[i] != other_code):
+            n += 1
+    return n
+
+
+
+def BandedIdentities(a, b, offset, band):
+    """
+    BandedIdentities() aligns sequences "a" and "b" (without penalizing gaps
+    at either end), and returns the number of identical residues in the
+    highest-scoring alignment.  Only alignments in which residue i of "a" is
+    matched with residues between i-offset-band and i-offset+band in "b" are
+    considered.  (The cost is proportional to len(a)*band.)
+
+    """
+    n = len(a)
+    m = len(b)
+    neg = -(1 << 30)
+    prev_s = [neg] * (m+1)   # best score (for the previous row)
+    prev_n = [0] * (m+1)     # number of identical residues (previous row)
+    cur_s = [neg] * (m+1)    # best score (for the current row)
+    cur_n = [0] * (m+1)      # number of identical residues (current row)
+    best_s = neg
+    best_n = 0
+    for i in range(0, n+1):
+        j_lo = max(0, i-offset-band)
+        j_hi = min(m, i-offset+band)
+        if j_lo > j_hi:
+            if j_lo > m:
+                break
+            continue
+        # Cells adjacent to the band are read later.  They must be unreachable:
+        if j_lo > 0:
+            cur_s[j_lo-1] = neg
+        if j_hi < m:
+            cur_s[j_hi+1] = neg
+        if (i == 0) or (j_lo == 0):
+            # (Gaps at the beginning of either sequence are not penalized.)
+            if i == 0:
+                j_begin = j_hi+1
+                for j in range(j_lo, j_hi+1):
+                    cur_s[j] = 0
+                    cur_n[j] = 0
+            else:
+                j_begin = 1
+                cur_s[0] = 0
+                cur_n[0] = 0
+        else:
+            j_begin = j_lo
+        if i > 0:
+            ai = a[i-1]
+            for j in range(j_begin, j_hi+1):
+                if (ai == b[j-1]) and (ai != other_code):
+                    s = prev_s[j-1] + match_score
+                    c = prev_n[j-1] + 1
+                else:
+                    s = prev_s[j-1] + mismatch_score
+                    c = prev_n[j-1]
+                t = prev_s[j] + gap_score
+                if t > s:
+                    s = t
+                    c = prev_n[j]
+                t = cur_s[j-1] + gap_score
+                if t > s:
+                    s = t
+                    c = cur_n[j-1]
+                cur_s[j] = s
+                cur_n[j] = c
+        # (Gaps at the end of either sequence are not penalized either.)
+        if i == n:
+            for j in range(j_lo, j_hi+1):
+                if cur_s[j] > best_s:
+                    best_s = cur_s[j]
+                    best_n = cur_n[j]
+        elif (j_hi == m) and (cur_s[m] > best_s):
+            best_s = cur_s[m]
+            best_n = cur_n[m]
+        prev_s, cur_s = cur_s, prev_s
+        prev_n, cur_n = cur_n, prev_n
+    return best_n
+
+
+
+def BestDiagonal(offsets, band):
+    """
+    Each shared k-mer suggests an offset (a diagonal) for aligning two
+    sequences.  BestDiagonal() finds the largest group of offsets which lie
+    within "band" of each other, and returns its size and median offset.
+    (Hits which are scattered on unrelated diagonals are usually spurious.)
+
+    """
+    offsets = sorted(offsets)
+    best_count = 0
+    best_offset = 0
+    i_first = 0
+    for i_last in range(0, len(offsets)):
+        while offsets[i_last] - offsets[i_first] > band:
+            i_first += 1
+        if i_last - i_first + 1 > best_count:
+            best_count = i_last - i_first + 1
+            best_offset = offsets[(i_first + i_last)//2]
+    return best_count, best_offset
+
+
+
+class RedundancyCuller(object):
+    """
+    RedundancyCuller keeps track of a growing set of non-redundant sequences.
+    AddIfNovel() adds a new sequence to the set, unless it is too similar
+    to one of the sequences already there.
+
+    """
+
+    def __init__(self, max_identity, k=4, fraction=1.0, min_shared=3,
+                 band=16, max_postings=200):
+        self.max_identity = max_identity
+        self.k = k
+        self.fraction = fraction
+        self.min_shared = min_shared
+        self.band = band
+        # The number of sequences stored for each k-mer is bounded.  Once a
+        # k-mer has been seen in more than "max_postings" kept sequences, a
+        # random sample (of that size) of these sequences is stored instead.
+        # (Otherwise k-mers which are common in the PDB, for example in
+        #  low-complexity regions, would be compared with all of them.)
+        self.max_postings = max_postings
+        self.kept = []
+        self.seq2index = {}
+        self.kmer2postings = {}
+        self.kmer2count = {}
+        self.random = random.Random(0)
+
+    def Kmers(self, codes):
+        """
+        Return the (kmer, position) pairs sampled from "codes".  Only the
+        first occurrence of each k-mer is used.  (Repeats such as His-tags
+        would otherwise pile up on the same diagonal.)
+
+        """
+        kmer2pos = {}
+        for kmer, pos in SampleKmers(codes, self.k, other_code+1, self.fraction):
+            if kmer not in kmer2pos:
+                kmer2pos[kmer] = pos
+        return kmer2pos.items()
+
+    def IsSimilar(self, codes_a, codes_b, offset):
+        min_len = min(len(codes_a), len(codes_b))
+        if min_len == 0:
+            return False
+        threshold = self.max_identity * min_len
+        if UngappedIdentities(codes_a, codes_b, offset) > threshold:
+            return True
+        return BandedIdentities(codes_a, codes_b, offset, self.band) > threshold
+
+    def FindSimilar(self, codes):
+        """
+        Return the index of a kept sequence which is too similar to "codes"
+        (or None, if there are no such sequences).
+
+        """
+        seq = bytes(codes)
+        if seq in self.seq2index:
+            return self.seq2index[seq]
+        offsets = {}
+        for kmer, pos in self.Kmers(codes):
+            postings = self.kmer2postings.get(kmer)
+            if postings == None:
+                continue
+            for index, pos_kept in postings:
+                if index in offsets:
+                    offsets[index].append(pos - pos_kept)
+                else:
+                    offsets[index] = [pos - pos_kept]
+        candidates = []
+        for index in offsets:
+            if len(offsets[index]) >= self.min_shared:
+                num_shared, offset = BestDiagonal(offsets[index], self.band)
+                if num_shared >= self.min_shared:
+                    candidates.append((num_shared, index, offset))
+        candidates.sort(reverse=True)
+        for num_shared, index, offset in candidates:
+            if self.IsSimilar(codes, self.kept[index], offset):
+                return index
+        return None
+
+    def Add(self, codes):
+        index = len(self.kept)
+        self.kept.append(codes)
+        self.seq2index[bytes(codes)] = index
+        for kmer, pos in self.Kmers(codes):
+            postings = self.kmer2postings.get(kmer)
+            if postings == None:
+                self.kmer2postings[kmer] = [(index, pos)]
+                self.kmer2count[kmer] = 1
+                continue
+            count = self.kmer2count[kmer] + 1
+            self.kmer2count[kmer] = count
+            if len(postings) < self.max_postings:
+                postings.append((index, pos))
+            else:
+                # (reservoir sampling)
+                i = self.random.randrange(0, count)
+                if i < self.max_postings:
+                    postings[i] = (index, pos)
+        return index
+
+    def AddIfNovel(self, codes):
+        if self.FindSimilar(codes) != None:
+            return False
+        self.Add(codes)
+        return True
+
+
+
+def ClusterChains(entries, culler):
+    """
+    ClusterChains() returns a list of (representative, entry) pairs (one for
+    every entry).  The representatives are the entries which are not redundant
+    (considering the highest ranking entries first).  The representative of a
+    redundant entry is the (first) representative which it is similar to.
+
+    """
+    representatives = []
+    pairs = []
+    for entry in sorted(entries, key=ChainEntry.RankKey):
+        index = culler.FindSimilar(entry.codes)
+        if index == None:
+            index = culler.Add(entry.codes)
+            representatives.append(entry)
+        pairs.append((representatives[index], entry))
+    return pairs
+
+
+
+def CullChains(entries, culler):
+    """
+    CullChains() returns the subset of entries which are not redundant,
+    (considering the highest ranking entries first).
+
+    """
+    return [entry for representative, entry in ClusterChains(entries, culler)
+            if representative is entry]
+
+
+
+def main():
+    num_procs = None
+    fasta_file_name = None
+    clusters_file_name = None
+    max_identity = 40.0
+    max_resolution = None
+    min_length = 40
+    k = 4
+    fraction = 1.0
+    min_shared = 3
+    band = 16
+    file_names = []
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] in ('-np', '-fasta', '-identity', '-max-res',
+                           '-min-len', '-k', '-frac', '-min-shared', '-band',
+                           '-clusters'):
+            if i+1 >= len(sys.argv):
+                sys.stderr.write('Error: The '+sys.argv[i]+' argument should be followed by another argument.\n')
+                exit(-1)
+            if sys.argv[i] == '-np':
+                num_procs = int(sys.argv[i+1])
+            elif sys.argv[i] == '-fasta':
+                fasta_file_name = sys.argv[i+1]
+            elif sys.argv[i] == '-clusters':
+                clusters_file_name = sys.argv[i+1]
+            elif sys.argv[i] == '-identity':
+                max_identity = float(sys.argv[i+1])
+            elif sys.argv[i] == '-max-res':
+                max_resolution = float(sys.argv[i+1])
+            elif sys.argv[i] == '-min-len':
+                min_length = int(sys.argv[i+1])
+            elif sys.argv[i] == '-k':
+                k = int(sys.argv[i+1])
+            elif sys.argv[i] == '-frac':
+                fraction = float(sys.argv[i+1])
+            elif sys.argv[i] == '-min-shared':
+                min_shared = int(sys.argv[i+1])
+            elif sys.argv[i] == '-band':
+                band = int(sys.argv[i+1])
+            i += 2
+        else:
+            file_names.append(sys.argv[i])
+            i += 1
+
+    sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
+
+    entries = []
+    if fasta_file_name != None:
+        fasta_file = open(fasta_file_name, 'r')
+        entries = ReadFastaEntries(fasta_file)
+        fasta_file.close()
+    else:
+        if len(file_names) == 0:
+            file_names = ReadFileNames(sys.stdin)
+        for file_entries in MapFiles(ReadChainEntries, file_names, num_procs, 16):
+            entries += file_entries
+
+    entries = [entry for entry in entries
+               if ((len(entry.codes) >= min_length) and
+                   ((max_resolution == None) or
+                    ((entry.resolution != None) and
+                     (entry.resolution <= max_resolution))))]
+
+    culler = RedundancyCuller(max_identity/100.0, k, fraction, min_shared, band)
+    pairs = ClusterChains(entries, culler)
+    kept = [entry for representative, entry in pairs
+            if representative is entry]
+    sys.stderr.write(str(len(kept))+' of '+str(len(entries))+' chains kept\n')
+
+    sys.stdout.write(pisces_header+'\n')
+    for entry in kept:
+        sys.stdout.write(entry.PiscesLine()+'\n')
+
+    if clusters_file_name != None:
+        clusters_file = open(clusters_file_name, 'w')
+        for representative, entry in pairs:
+            clusters_file.write(representative.ID()+' '+entry.ID()+'\n')
+        clusters_file.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -16,24 +16,52 @@ different DNA strands which completely hybridize with each other (no overhangs),
 AND the order must be reversed.  (Because the two strands in DNA are physically
 oriented in opposite directions.)
 
+   --- Batch mode ---
+
+Alternately, if the "-batch" argument is used, then each PDB file is treated
+as a separate (complete) PDB file, which may contain several DNA chains.
+For each file, the sequences of every pair of DNA chains are compared,
+(in every possible register) to find the longest stretch of consecutive
+Watson-Crick (A-T, C-G) pairs.  Chains are paired with each other greedily,
+(longest duplex first).  Nucleotides outside of this stretch (overhangs, and
+bubbles containing mismatches) are discarded, and the remaining nucleotides
+are interleaved as described above.  Each duplex is written to a new file:
+   PDBCODE_interleaved_XY.pdb
+where X and Y are the chainIDs of the two strands (or "_" if blank).
+Only the first MODEL (of NMR structures) and the first alternate location
+of each atom are used.  The files are processed
+in parallel.  (Since this only considers the sequence, it is still a good idea
+to inspect the results visually.)  Optional arguments:
+   -min-bp N     Ignore duplexes with fewer than N base pairs (default 4)
+   -swap         Also create a PDBCODE_interleaved_YX.pdb file, with the
+                 order of the two strands swapped.
+   -outdir DIR   Create the new files in directory DIR.
+   -np N         Use at most N processes.
+
 """
 
 import sys
 from operator import attrgetter
 from collections import defaultdict
 
+import os
+
 try:
     from .resid import *
+    from .batch import ReadFileNames, MapFiles
 except ImportError:
     from resid import *
+    from batch import ReadFileNames, MapFiles
 
 
 g_program_name = __file__.split('/')[-1]
-g_date_str     = '2017-4-18'
-g_version_str  = '0.9.0'
+g_date_str     = '2026-10-19'
+g_version_str  = '0.10.1'
 
 
 usage_string = "Usage:\n\n  "+g_program_name+" file1.pdb file2.pdb > file_merged.pdb\n\n"
+usage_string += "  "+g_program_name+" -batch [-min-bp N] [-swap] [-outdir DIR] [-np N] \\\n"
+usage_string += "     file1.pdb file2.pdb file3.pdb ...\n\n"
 
 usage_string += __doc__
 
@@ -45,6 +73,8 @@ def ResID2Text_from_pdb_file(file_name):
     This function reads a pdb file, and creates a dictionary containing
     the text for each residue, indexed by it's identifier.  Identifiers
     in PDB files (ResIDs) have 3 parts (chainID,resSeq,iCode).
+    Only the first MODEL is read (in NMR structures), and only the first
+    alternate location (altLoc " " or "A") of each atom is kept.
 
     """
 
@@ -53,13 +83,16 @@ def ResID2Text_from_pdb_file(file_name):
     resID2text = defaultdict(list)
     
     chain_text = {}
+    model_ID = None
 
     for line in pdb_file:
         #if line[0:6] in ("ATOM  ", "HETATM"):
-        if line[0:6] in "ATOM  ":
+        if line[0:6] == "ATOM  ":
             #atomID    = int(line[6:11])
             #atomType  = line[12:16]
-            #altLoc    = line[16:17]
+            altLoc    = line[16:17]
+            if altLoc not in (' ', 'A'):
+                continue
             #resType   = line[17:20]
             chainID   = line[21:22]
             resSeq    = line[22:26]
@@ -72,6 +105,12 @@ def ResID2Text_from_pdb_file(file_name):
 
             resID2text[resID].append(line)
 
+        elif line[0:6] == "MODEL ":
+            if model_ID == None:
+                model_ID = line[10:14]
+            else:
+                break   # Ignore the other models
+
     pdb_file.close()
     return resID2text
 
@@ -105,42 +144,225 @@ def SortedResidueText_from_pdb_file(file_name):
     return index2text
 
 
-def main():
-    if len(sys.argv) != 3:
-        sys.stderr.write("Error: Expected two arguments (two pdb files)\n")
-        sys.stderr.write(usage_string)
-        exit(1)
+# Nucleotides are encoded as small integers, chosen so that the codes of
+# two Watson-Crick partners always add up to 3.  (Anything else is -1.)
+dna_base_codes = {' DA':0, ' DC':1, ' DG':2, ' DT':3}
 
-    sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
 
-    sys.stderr.write('  Reading file \"'+sys.argv[1]+'\"\n')
-    strand1 = SortedResidueText_from_pdb_file(sys.argv[1])
-    sys.stderr.write('  Reading file \"'+sys.argv[2]+'\"\n')
-    strand2 = SortedResidueText_from_pdb_file(sys.argv[2])
-    if (len(strand1) != len(strand2)):
-        sys.stderr.write("Error: The two PDB files must have the same length.\n")
-        exit(1)
 
+def WriteInterleaved(strand1, strand2, out_file, new_chainID=' '):
+    """
+    Write the residues from strand1 (in order), alternating with the residues
+    from strand2 (in reverse order), renumbering them consecutively.
+    (strand1 and strand2 are lists of lists of lines of text.)
 
+    """
     N = len(strand1)
-    new_chainID=' '
     i = 1;
     for n in range(0, N):
         for line in strand1[n]:
             new_resSeq = str(i).rjust(4)
             new_line = (line[0:21] + new_chainID + new_resSeq + line[26:])
             # (leave the iCode in line[26:27] alone)
-            sys.stdout.write(new_line)
+            out_file.write(new_line)
         i += 1
         for line in strand2[N-n-1]:
             new_resSeq = str(i).rjust(4)
             new_line = (line[0:21] + new_chainID + new_resSeq + line[26:])
             # (leave the iCode in line[26:27] alone)
-            sys.stdout.write(new_line)
+            out_file.write(new_line)
         i += 1
 
 
 
+def ChainText_from_pdb_file(file_name):
+    """
+    Read a pdb file and return a dictionary which maps each chainID to
+    a list of the residues in that chain (sorted according to their ResIDs).
+    Each residue is a list of lines of text.
+
+    """
+    resID2text = ResID2Text_from_pdb_file(file_name)
+    resIDs_sorted = sorted(resID2text,
+                           key=attrgetter('chainID','seqNum','iCode'))
+    chain2residues = defaultdict(list)
+    for resID in resIDs_sorted:
+        chain2residues[resID.chainID].append(resID2text[resID])
+    return chain2residues
+
+
+
+def LongestDuplex(codes1, codes2):
+    """
+    Find the longest stretch of consecutive complementary nucleotides between
+    two strands.  codes1 and codes2 are lists of the integer codes of the
+    nucleotides in each strand (in their usual 5'->3' order).  Each possible
+    register is scanned once, so this costs O(len(codes1)*len(codes2)).
+    Returns (length, start1, start2), where the duplex contains
+    codes1[start1:start1+length] and codes2[start2:start2+length].
+
+    """
+    n1 = len(codes1)
+    n2 = len(codes2)
+    codes2r = codes2[::-1]  # (the two strands run in opposite directions)
+    best = (0, 0, 0)
+    for shift in range(-(n2-1), n1):
+        run = 0
+        for i in range(max(0, shift), min(n1, n2+shift)):
+            a = codes1[i]
+            if (a >= 0) and (a + codes2r[i-shift] == 3):
+                run += 1
+                if run > best[0]:
+                    best = (run, i-run+1, i-shift-run+1)
+            else:
+                run = 0
+    length, start1, start2r = best
+    # convert the position in the reversed strand back to the original strand
+    return (length, start1, n2-start2r-length)
+
+
+
+def InterleaveDuplexes(file_name,
+                       min_bp=4,
+                       swap=False,
+                       out_dir=None):
+    """
+    Find the DNA duplexes in a PDB file, trim their overhangs, and write the
+    interleaved residues of each duplex to a new PDB file (see "Batch mode").
+    Returns a list of (out_file_name, number_of_base_pairs) tuples.
+
+    """
+    chain2residues = ChainText_from_pdb_file(file_name)
+    chain2codes = {}
+    for chainID in chain2residues:
+        codes = [dna_base_codes.get(res_text[0][17:20], -1)
+                 for res_text in chain2residues[chainID]]
+        if max(codes) >= 0:
+            chain2codes[chainID] = codes
+
+    candidates = []
+    chainIDs = sorted(chain2codes)
+    for a in range(0, len(chainIDs)):
+        for b in range(a+1, len(chainIDs)):
+            length, start1, start2 = LongestDuplex(chain2codes[chainIDs[a]],
+                                                   chain2codes[chainIDs[b]])
+            if length >= min_bp:
+                candidates.append((length, chainIDs[a], chainIDs[b],
+                                   start1, start2))
+
+    # Pair up the chains greedily (longest duplexes first)
+    candidates.sort(key=lambda c: -c[0])
+    pdb_code = os.path.basename(file_name)
+    i = pdb_code.lower().rfind('.pdb')
+    if i != -1:
+        pdb_code = pdb_code[:i]
+    if out_dir != None:
+        pdb_code = os.path.join(out_dir, pdb_code)
+    chains_used = set([])
+    created = []
+    for length, chainID1, chainID2, start1, start2 in candidates:
+        if (chainID1 in chains_used) or (chainID2 in chains_used):
+            continue
+        chains_used.add(chainID1)
+        chains_used.add(chainID2)
+        strand1 = chain2residues[chainID1][start1:start1+length]
+        strand2 = chain2residues[chainID2][start2:start2+length]
+        orders = [(chainID1, strand1, chainID2, strand2)]
+        if swap:
+            orders.append((chainID2, strand2, chainID1, strand1))
+        for cA, sA, cB, sB in orders:
+            # (Blank chainIDs are written as "_" in the file name)
+            out_file_name = (pdb_code+'_interleaved_'+
+                             cA.replace(' ', '_')+cB.replace(' ', '_')+'.pdb')
+            out_file = open(out_file_name, 'w')
+            WriteInterleaved(sA, sB, out_file)
+            out_file.close()
+            created.append((out_file_name, length))
+    return created
+
+
+
+class _InterleaveDuplexesFunctor:
+    # (A picklable version of InterleaveDuplexes() with the arguments bound)
+    def __init__(self, min_bp, swap, out_dir):
+        self.min_bp = min_bp
+        self.swap = swap
+        self.out_dir = out_dir
+    def __call__(self, file_name):
+        return InterleaveDuplexes(file_name,
+                                  self.min_bp,
+                                  self.swap,
+                                  self.out_dir)
+
+
+
+def main_batch(argv):
+    min_bp = 4
+    swap = False
+    out_dir = None
+    num_procs = None
+    file_names = []
+    i = 0
+    while i < len(argv):
+        if argv[i] in ('-min-bp', '-outdir', '-np'):
+            if i+1 >= len(argv):
+                sys.stderr.write("Error: The "+argv[i]+" argument should be followed by another argument.\n")
+                exit(1)
+            if argv[i] == '-min-bp':
+                min_bp = int(argv[i+1])
+            elif argv[i] == '-outdir':
+                out_dir = argv[i+1]
+            else:
+                num_procs = int(argv[i+1])
+            i += 2
+        elif argv[i] == '-swap':
+            swap = True
+            i += 1
+        else:
+            file_names.append(argv[i])
+            i += 1
+
+    if len(file_names) == 0:
+        file_names = ReadFileNames(sys.stdin)
+    if (out_dir != None) and (not os.path.isdir(out_dir)):
+        os.makedirs(out_dir)
+
+    interleave = _InterleaveDuplexesFunctor(min_bp, swap, out_dir)
+    for file_name, created in zip(file_names,
+                                  MapFiles(interleave, file_names, num_procs)):
+        if len(created) == 0:
+            sys.stderr.write('  \"'+file_name+'\": no duplexes found\n')
+        for out_file_name, length in created:
+            sys.stderr.write('  \"'+file_name+'\": created \"'+out_file_name+
+                             '\" ('+str(length)+' base pairs)\n')
+
+
+
+def main():
+    if (len(sys.argv) > 1) and (sys.argv[1] == '-batch'):
+        sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
+        main_batch(sys.argv[2:])
+        return
+
+    if len(sys.argv) != 3:
+        sys.stderr.write("Error: Expected two arguments (two pdb files)\n")
+        sys.stderr.write(usage_string)
+        exit(1)
+
+    sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
+
+    sys.stderr.write('  Reading file \"'+sys.argv[1]+'\"\n')
+    strand1 = SortedResidueText_from_pdb_file(sys.argv[1])
+    sys.stderr.write('  Reading file \"'+sys.argv[2]+'\"\n')
+    strand2 = SortedResidueText_from_pdb_file(sys.argv[2])
+    if (len(strand1) != len(strand2)):
+        sys.stderr.write("Error: The two PDB files must have the same length.\n")
+        exit(1)
+
+    WriteInterleaved(strand1, strand2, sys.stdout)
+
+
+
 
 if __name__ == "__main__":
 
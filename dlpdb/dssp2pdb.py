@@ -25,6 +25,11 @@
 
 import sys
 
+try:
+    from .resnames import AminoAcid1to3
+except ImportError:
+    from resnames import AminoAcid1to3
+
 # author: Andrew Jewett
 g_program_name = __file__.split('/')[-1]
 g_date_str = '2012-12-10'
@@ -51,30 +56,7 @@ def Int2Digits(i, base):
 # The next function converts 1-letter amino acid names into 3-letter names.
 # If the user doesn not specify a PDB file (with 3-letter res names), use this.
 def ResNamesFrom1Char(c):
-    lookup = {'A':'ALA',
-              'R':'ARG',
-              'N':'ASN',
-              'D':'ASP',
-              'C':'CYS',
-              'E':'GLU',
-              'Q':'GLN',
-              'G':'GLY',
-              'H':'HIS',
-              'I':'ILE',
-              'L':'LEU',
-              'K':'LYS',
-              'M':'MET',
-              'F':'PHE',
-              'P':'PRO',
-              'S':'SER',
-              'T':'THR',
-              'W':'TRP',
-              'Y':'TYR',
-              'V':'VAL'}
-    if (lookup.has_key(c)):
-        return lookup[c]
-    else:
-        return c+c+c
+    return AminoAcid1to3(c)
 
 
 
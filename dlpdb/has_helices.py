@@ -19,6 +19,7 @@ def main():
     for line in sys.stdin:
         if (line[0:6] == "HELIX "):
             helix_found = True;
+            break  # (no need to read the rest of the file)
 
     if (helix_found):
         exit(0)  # normal termination indicates a helix was found
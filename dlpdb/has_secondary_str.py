@@ -20,6 +20,7 @@ def main():
             (line[0:6] == "SHEET ") or
             (line[0:5] == "TURN ")):
             secondary_str_found = True;
+            break  # (no need to read the rest of the file)
 
     if (secondary_str_found):
         exit(0) #normal termination indicates a helix/sheet/turn was found
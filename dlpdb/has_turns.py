@@ -19,6 +19,7 @@ def main():
     for line in sys.stdin:
         if (line[0:5] == "TURN "):
             turn_found = True;
+            break  # (no need to read the rest of the file)
 
     if (turn_found):
         exit(0)  # normal termination indicates a turn was found
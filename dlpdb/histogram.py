@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+
+"""
+ Typical usage:
+
+    histogram.py -bin-width 0.1 -min 0 < distances_raw.dat > distances_hist.dat
+
+    histogram.py -bin-width 5 -min -180 -weights weights.dat \\
+        < angles_raw.dat > angles_hist.dat
+
+ This program reads a file containing numbers (such as the "_raw.dat" files
+ created by extract_distances.sh, which contain one line per PDB file), and
+ prints a histogram of these numbers.  Each line of output contains:
+
+    x  count  density
+
+ where x is the center of a bin, "count" is the number of numbers in that
+ bin (or the sum of their weights), and "density" is count/(total*bin_width)
+ (an estimate of the probability density at x).
+
+ Optional arguments:
+
+   -bin-width W   The width of each bin.  (Default: 1)
+   -origin X      The bins are the intervals [X+n*W, X+(n+1)*W).  (Default: 0)
+   -min X         Ignore numbers less than X.  (For example, "-min 0" ignores
+                  the impossible values (-1 or -360) which extract_distances.sh
+                  uses to indicate missing atoms.)
+   -max X         Ignore numbers greater than X.
+   -weights FILE  FILE contains one weight for each line of the input
+                  (for example, created using chain_weights.py).  Every number
+                  on that line is counted using that weight.
+   -partial       Print the counts in each bin in a format which can be added
+                  exactly to the counts from other parts of the data (for
+                  example computed on different computers).
+   -shard k/N     Label the counts printed by "-partial" as the k'th of N
+                  parts.  (The input should contain only that part.)
+   -reduce        Add together the counts in the files which follow (each
+                  created using "-shard k/N -partial"), and print the
+                  histogram.  (See reduce_partials.py.)
+"""
+
+import sys
+import math
+# Sometimes this program pipes its output to other programs which halt early.
+# Below we silently suppress the ugly "Broken pipe" message this generates:
+import signal
+signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+try:
+    from .chain_weights import ReadWeights, WeightsDigest
+    from .batch import ParseShard
+    from .reduce_partials import Partials, ReducePartials, Exact
+except ImportError:
+    from chain_weights import ReadWeights, WeightsDigest
+    from batch import ParseShard
+    from reduce_partials import Partials, ReducePartials, Exact
+
+
+g_program_name = __file__.split('/')[-1]
+g_date_str     = '2026-10-19'
+g_version_str  = '0.2.0'
+
+
+
+class Histogram(object):
+    """
+    Histogram counts the (weighted) number of numbers in each bin.
+    Only the bins which are not empty are stored.  The weighted counts are
+    stored exactly (see reduce_partials.Exact()), so they do not depend on
+    the order in which the numbers were added.
+    (While the numbers are being added, an integer count is kept for each
+     bin and each different weight.  Weights typically take only a few
+     different values, so each count is only multiplied by its weight once,
+     when Flush() is invoked.  Until then bin2count and total are incomplete.)
+
+    """
+
+    def __init__(self, bin_width=1.0, origin=0.0):
+        self.bin_width = bin_width
+        self.origin = origin
+        self.bin2count = {}
+        self.total = 0
+        self.weight2counts = {}
+        self.weight2num = {}
+
+    def Add(self, numbers, weight=1.0):
+        """ Add a list of numbers (each counted "weight" times) """
+        counts = self.weight2counts.get(weight)
+        if counts == None:
+            counts = {}
+            self.weight2counts[weight] = counts
+            self.weight2num[weight] = 0
+        origin = self.origin
+        bin_width = self.bin_width
+        for x in numbers:
+            b = math.floor((x - origin) / bin_width)
+            counts[b] = counts.get(b, 0) + 1
+        self.weight2num[weight] += len(numbers)
+
+    def Flush(self):
+        """
+        Add the integer counts (for each weight) to bin2count and total,
+        after multiplying them by the (exact) weight.
+
+        """
+        bin2count = self.bin2count
+        for weight in self.weight2counts:
+            counts = self.weight2counts[weight]
+            exact_weight = Exact(weight)
+            for b in counts:
+                bin2count[b] = bin2count.get(b, 0) + exact_weight*counts[b]
+            self.total += exact_weight * self.weight2num[weight]
+        self.weight2counts = {}
+        self.weight2num = {}
+
+    def Results(self):
+        """
+        Return a list of (x, count, density) tuples for every bin between
+        the smallest and largest non-empty bins (inclusive).
+
+        """
+        self.Flush()
+        results = []
+        if len(self.bin2count) == 0:
+            return results
+        total = float(self.total)
+        for b in range(min(self.bin2count), max(self.bin2count)+1):
+            count = float(self.bin2count.get(b, 0))
+            density = 0.0
+            if total > 0.0:
+                density = count / (total * self.bin_width)
+            results.append((self.origin + (b + 0.5) * self.bin_width,
+                            count,
+                            density))
+        return results
+
+
+
+def main():
+    bin_width = 1.0
+    origin = 0.0
+    x_min = None
+    x_max = None
+    weights_file_name = None
+    shard = None
+    write_partial = False
+    reduce_partials = False
+    file_names = []
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] in ('-bin-width', '-origin', '-min', '-max', '-weights',
+                           '-shard'):
+            if i+1 >= len(sys.argv):
+                sys.stderr.write('Error: The '+sys.argv[i]+' argument should be followed by another argument.\n')
+                exit(-1)
+            if sys.argv[i] == '-bin-width':
+                bin_width = float(sys.argv[i+1])
+            elif sys.argv[i] == '-origin':
+                origin = float(sys.argv[i+1])
+            elif sys.argv[i] == '-min':
+                x_min = float(sys.argv[i+1])
+            elif sys.argv[i] == '-max':
+                x_max = float(sys.argv[i+1])
+            elif sys.argv[i] == '-weights':
+                weights_file_name = sys.argv[i+1]
+            elif sys.argv[i] == '-shard':
+                try:
+                    shard = ParseShard(sys.argv[i+1])
+                except ValueError as err:
+                    sys.stderr.write('Error: '+str(err)+'\n')
+                    exit(-1)
+            i += 2
+        elif sys.argv[i] == '-partial':
+            write_partial = True
+            i += 1
+        elif sys.argv[i] == '-reduce':
+            reduce_partials = True
+            i += 1
+        elif reduce_partials:
+            file_names.append(sys.argv[i])
+            i += 1
+        else:
+            sys.stderr.write('Error: Unrecognized argument: \"'+sys.argv[i]+'\"\n')
+            exit(-1)
+
+    sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
+
+    if bin_width <= 0.0:
+        sys.stderr.write('Error: The bin width must be positive.\n')
+        exit(-1)
+
+    if reduce_partials:
+        try:
+            partials = ReducePartials(file_names,
+                                      g_program_name+' v'+g_version_str)
+            partials.CheckComplete()
+        except (ValueError, IOError) as err:
+            sys.stderr.write('Error: '+str(err)+'\n')
+            exit(-1)
+        histogram = Histogram(float(partials.Setting('bin-width')),
+                              float(partials.Setting('origin')))
+        for key in partials.Keys():
+            histogram.bin2count[int(key[0])] = partials.Values(key)[0]
+        histogram.total = sum(histogram.bin2count.values())
+        for x, count, density in histogram.Results():
+            sys.stdout.write(str(x)+' '+str(count)+' '+str(density)+'\n')
+        return
+
+    weights = None
+    if weights_file_name != None:
+        try:
+            weights_file = open(weights_file_name, 'r')
+            weights = ReadWeights(weights_file)
+            weights_file.close()
+        except (ValueError, IOError) as err:
+            sys.stderr.write('Error: '+str(err)+'\n')
+            exit(-1)
+
+    histogram = Histogram(bin_width, origin)
+    n = 0
+    for line in sys.stdin:
+        numbers = [float(token) for token in line.split()]
+        if x_min != None:
+            numbers = [x for x in numbers if x >= x_min]
+        if x_max != None:
+            numbers = [x for x in numbers if x <= x_max]
+        weight = 1.0
+        if weights != None:
+            if n >= len(weights):
+                sys.stderr.write('Error: The weights file contains fewer lines than the input.\n')
+                exit(-1)
+            weight = weights[n]
+        histogram.Add(numbers, weight)
+        n += 1
+
+    if write_partial:
+        settings = [('bin-width', repr(bin_width)), ('origin', repr(origin)),
+                    ('min', x_min), ('max', x_max),
+                    ('weights', WeightsDigest(weights_file_name))]
+        partials = Partials(g_program_name+' v'+g_version_str, settings,
+                            1, shard)
+        partials.num_files = n
+        histogram.Flush()
+        for b in histogram.bin2count:
+            partials.Add((b,), [histogram.bin2count[b]])
+        partials.Write(sys.stdout)
+        return
+
+    for x, count, density in histogram.Results():
+        sys.stdout.write(str(x)+' '+str(count)+' '+str(density)+'\n')
+
+
+if __name__ == "__main__":
+    main()
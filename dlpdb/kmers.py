@@ -0,0 +1,197 @@
+"""
+Functions for working with k-mers (short words of length k) in sequences
+which have been converted into lists of small integers
+(for example, using the residue codes in "resnames.py").
+
+A k-mer of integers, each less than "base", is represented by a single
+integer (its value when interpreted as a k-digit number in base "base").
+The codes for all of the k-mers in a sequence are computed in a single pass
+(a "rolling" code), rather than by slicing the sequence k times.
+
+Sequences of 1-letter amino acid codes can also be converted into
+integers using a "reduced alphabet", in which similar amino acids are
+grouped together and share the same integer (see EncodeSequence()).
+"""
+
+
+from collections import Counter
+
+
+g_hash_mult = 0x9E3779B97F4A7C15   # (an odd 64-bit constant, see HashKmer())
+g_hash_mask = (1 << 64) - 1
+
+# Use a list to store k-mer counts if there are at most this many possible
+# k-mers.  Otherwise use a dictionary (which only stores the k-mers observed).
+g_max_dense_kmers = 1 << 22
+
+# The code assigned to residues which do not belong to any group:
+invalid_code = 255
+
+
+# Reduced alphabets.  Each is a list of (letter, members) pairs.  The residues
+# in the n'th group are assigned the integer n, and are printed using "letter".
+reduced_alphabets = {
+    # 'N' non-polar, 'P' polar, and 'O' "other", according to:
+    #   West, MW; Hecht, MH.
+    #   "Binary patterning of polar and nonpolar amino acids in the sequences
+    #    and structures of native proteins"
+    #   Protein Sci. 1995, Oct, Vol 4, No 10, pp 2032-2039
+    'NPO': [('N', 'FLIMV'), ('P', 'RKDENQH'), ('O', 'SPTAYWCG')],
+    # 'H' hydrophobic, 'P' polar
+    'HP': [('H', 'ACFGILMPVWY'), ('P', 'DEHKNQRST')],
+    # the 20 standard amino acids (not reduced)
+    'AA20': [(c, c) for c in 'ACDEFGHIKLMNPQRSTVWY']
+}
+
+
+
+def KmerCodes(codes, k, base):
+    """
+    KmerCodes() returns a list containing the integer code for each of the
+    len(codes)-k+1 k-mers in "codes".  (Every entry in "codes" must be a
+    non-negative integer less than "base".)
+
+    """
+    kmer_codes = []
+    if len(codes) < k:
+        return kmer_codes
+    span = base ** (k-1)
+    kmer = 0
+    for i in range(0, k-1):
+        kmer = kmer*base + codes[i]
+    for i in range(k-1, len(codes)):
+        kmer = kmer*base + codes[i]
+        kmer_codes.append(kmer)
+        kmer -= codes[i-k+1] * span
+    return kmer_codes
+
+
+
+def HashKmer(kmer):
+    """
+    A cheap (deterministic) hash function which scrambles the bits in a
+    k-mer code, returning an integer in the range [0, 2^64).
+
+    """
+    return (kmer * g_hash_mult) & g_hash_mask
+
+
+
+def SampleKmers(codes, k, base, fraction):
+    """
+    SampleKmers() returns a list of (kmer, position) pairs for a subset of the
+    k-mers in "codes".  Only k-mers whose hash is smaller than "fraction"
+    (times 2^64) are kept.  (This is a "FracMinHash" sketch.)  Because the
+    decision to keep a k-mer does not depend on the sequence it came from,
+    the k-mers shared by two sequences are sampled from both sequences.
+
+    """
+    threshold = int(fraction * (1 << 64))
+    kmer_codes = KmerCodes(codes, k, base)
+    return [(kmer_codes[i], i) for i in range(0, len(kmer_codes))
+            if HashKmer(kmer_codes[i]) < threshold]
+
+
+
+def ParseAlphabet(spec):
+    """
+    ParseAlphabet() returns the list of (letter, members) pairs for one of the
+    alphabets in "reduced_alphabets" (if "spec" is its name), or for a custom
+    alphabet of the form "N:FLIMV,P:RKDENQH,O:SPTAYWCG".
+
+    """
+    if spec in reduced_alphabets:
+        return reduced_alphabets[spec]
+    groups = []
+    for token in spec.split(','):
+        i_colon = token.find(':')
+        if (i_colon != 1) or (len(token) < 3):
+            raise ValueError('Invalid alphabet: \"'+spec+'\"\n'
+                             '  (Expected a list of groups like '
+                             '\"N:FLIMV,P:RKDENQH,O:SPTAYWCG\")')
+        groups.append((token[0], token[2:]))
+    return groups
+
+
+
+def AlphabetTable(groups):
+    """
+    AlphabetTable() returns a 256-byte table (for use with bytes.translate())
+    which converts each 1-letter code into the index of the group containing
+    it (or into "invalid_code", if no group contains it).
+
+    """
+    table = bytearray([invalid_code] * 256)
+    for n in range(0, len(groups)):
+        for c in groups[n][1]:
+            table[ord(c)] = n
+    return bytes(table)
+
+
+
+def EncodeSequence(sequence, table):
+    """
+    Convert a string of 1-letter codes into a bytes object containing the
+    group index of each residue.  "table" is created using AlphabetTable().
+
+    """
+    return sequence.encode().translate(table)
+
+
+
+def NewKmerCounts(k, base):
+    """
+    NewKmerCounts() returns an empty container for counting k-mers:
+    a list (with one entry per possible k-mer), or a dictionary (Counter)
+    if the number of possible k-mers is too large.
+
+    """
+    if base ** k <= g_max_dense_kmers:
+        return [0] * (base ** k)
+    return Counter()
+
+
+
+def CountKmers(encoded, k, base, counts):
+    """
+    CountKmers() adds the k-mers in "encoded" (a list or bytes object of
+    integer codes) to "counts" (created using NewKmerCounts()).
+    K-mers containing "invalid_code" are skipped.
+    Returns the number of k-mers counted.
+
+    """
+    num_counted = 0
+    dense = isinstance(counts, list)
+    for segment in bytes(encoded).split(bytes([invalid_code])):
+        kmer_codes = KmerCodes(segment, k, base)
+        if dense:
+            for kmer in kmer_codes:
+                counts[kmer] += 1
+        else:
+            counts.update(kmer_codes)
+        num_counted += len(kmer_codes)
+    return num_counted
+
+
+
+def KmerItems(counts):
+    """ Return a list of (kmer, count) pairs for all k-mers which were counted """
+    if isinstance(counts, list):
+        return [(kmer, counts[kmer]) for kmer in range(0, len(counts))
+                if counts[kmer] > 0]
+    return list(counts.items())
+
+
+
+def KmerString(kmer, k, letters):
+    """
+    Convert the integer code for a k-mer back into a string,
+    using letters[n] to represent the integer n.
+
+    """
+    base = len(letters)
+    chars = [letters[0]] * k
+    for i in range(k-1, -1, -1):
+        chars[i] = letters[kmer % base]
+        kmer //= base
+    return ''.join(chars)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+
+"""
+ Typical usage:
+
+    select_interval.py A 10 " " A 40 " " < 1abc.pdb \\
+      | memo.py pdb2coords.py " CA " i+1 " CA " i+2 " CA " \\
+      | coords2angles.py
+
+    EXTRACTCOORDS="memo.py pdb2coords.py -blank" extract_angles.sh ...
+
+ This program runs a command (one "stage" of a pipeline), sending it the
+ standard input, and printing its standard output.  The output is saved
+ in a cache directory, keyed by a hash of:
+    the input,
+    the command (and its arguments),
+    the environment variables read by the extract_*.sh scripts (SELECT and
+      EXTRACTCOORDS, see command_environment),
+    the contents of the program (found in the PATH) which runs the command,
+    and the version (and the source code) of dlpdb.
+ (So the saved outputs are not reused after dlpdb is upgraded, even when the
+  command is an installed "console_scripts" wrapper which does not change.)
+ If the same command is later run on the same input, the saved output is
+ printed instead (without running the command).  This is useful when the
+ same intermediate result is needed by several different pipelines (for
+ example the coordinates used to compute distances, angles, and dihedrals).
+ (Only commands whose output depends only on their input and arguments
+  should be used this way.  Outputs of failed commands are not saved.)
+
+ The cache directory is given by the "-cache" argument, or by the DLPDB_CACHE
+ environment variable.  If neither is present, the command is simply run.
+ The outputs are stored compressed.  The "-max-size" argument limits the
+ total size of the cache.  When this is exceeded, the outputs which were used
+ least recently are deleted.  (The limit is saved in the cache directory, and
+ is respected by all of the programs which use it, see batch.py.)
+
+ Optional arguments (which must appear before the command):
+
+   -cache DIR       The cache directory.
+   -max-size MB     Limit the size of the cache to MB megabytes.
+"""
+
+import sys
+import os
+
+try:
+    from .batch import FileDigest, OpenCache, PackageFiles, PackageDigest
+except ImportError:
+    from batch import FileDigest, OpenCache, PackageFiles, PackageDigest
+
+
+g_program_name = __file__.split('/')[-1]
+g_date_str     = '2026-10-19'
+g_version_str  = '0.2.0'
+
+
+
+def FindProgram(name):
+    """
+    Return the path of the program which runs a command named "name"
+    (searching the PATH, like shutil.which()), or None if it is not found.
+
+    """
+    if os.path.dirname(name) != '':
+        dir_names = ['']
+    else:
+        dir_names = os.environ.get('PATH', os.defpath).split(os.pathsep)
+    for dir_name in dir_names:
+        file_name = os.path.join(dir_name, name)
+        if os.path.isfile(file_name) and os.access(file_name, os.X_OK):
+            return file_name
+    return None
+
+
+
+# The environment variables which are read by the commands (the
+# extract_*.sh scripts), and which therefore affect their output:
+command_environment = ('SELECT', 'EXTRACTCOORDS')
+
+def EnvironmentPairs(names=None):
+    """
+    Return a list of "NAME=value" strings for each of the environment
+    variables in "names" (command_environment by default) which are set.
+
+    """
+    if names == None:
+        names = command_environment
+    return [name+'='+os.environ[name] for name in names
+            if name in os.environ]
+
+
+
+def CommandKey(command, env_names=None):
+    """
+    Return a string describing a command (a list of arguments), followed by
+    the environment variables which it reads (see EnvironmentPairs()), and
+    including a hash of the program which runs it (if it can be found in the
+    PATH), so that results created by older versions of the program are not
+    reused.  (The ResultCache's tag includes a hash of dlpdb itself.  See
+    PackageDigest() in batch.py.)
+
+    """
+    description = '\0'.join(command + EnvironmentPairs(env_names))
+    program = FindProgram(command[0])
+    if program != None:
+        description += '\0' + FileDigest(program)
+    return description
+
+
+
+def RunStage(command, data, cache=None):
+    """
+    Run a command, sending it "data" (bytes) as its standard input.
+    Returns a tuple containing the exit status and standard output (bytes)
+    of the command.  If a ResultCache is supplied, the output is looked up
+    (and stored) there.
+
+    """
+    key = None
+    if cache != None:
+        key = cache.DataKey(CommandKey(command), data)
+        found, output = cache.Load(key)
+        if found:
+            cache.num_hits += 1
+            return 0, output
+    import subprocess
+    process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE)
+    output = process.communicate(data)[0]
+    if (cache != None) and (process.returncode == 0):
+        cache.num_misses += 1
+        cache.Store(key, output)
+    return process.returncode, output
+
+
+
+def main():
+    cache_dir = None
+    max_size = None
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] in ('-cache', '-max-size'):
+            if i+1 >= len(sys.argv):
+                sys.stderr.write('Error: The '+sys.argv[i]+' argument should be followed by another argument.\n')
+                exit(-1)
+            if sys.argv[i] == '-cache':
+                cache_dir = sys.argv[i+1]
+            elif sys.argv[i] == '-max-size':
+                max_size = int(float(sys.argv[i+1]) * 1048576)
+            i += 2
+        else:
+            break  # The remaining arguments are the command
+    command = sys.argv[i:]
+
+    if len(command) == 0:
+        sys.stderr.write('Error: Expected a command after the optional arguments.\n')
+        exit(-1)
+
+    try:
+        cache = OpenCache(cache_dir, g_program_name+' v'+g_version_str,
+                          max_size=max_size)
+    except (ValueError, OSError) as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        exit(-1)
+    if cache == None:
+        # (No cache was specified.  Just run the command.)
+        import subprocess
+        exit(subprocess.call(command))
+
+    try:
+        status, output = RunStage(command, sys.stdin.buffer.read(), cache)
+    except OSError as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        exit(-1)
+    sys.stdout.buffer.write(output)
+    sys.stdout.flush()
+    if status != 0:
+        exit(status)
+
+
+if __name__ == "__main__":
+    main()
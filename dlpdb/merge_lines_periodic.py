@@ -36,14 +36,15 @@ Explanation: This script splits a text file into equally sized "blocks"
 
 
 import sys
+from collections import deque
 
 g_filename    = __file__.split('/')[-1]
 g_module_name  = g_filename
 g_program_name = g_filename
 if g_filename.rfind('.py') != -1:
     g_module_name = g_filename[:g_filename.rfind('.py')]
-g_date_str     = '2017-2-12'
-g_version_str  = '0.2.1'
+g_date_str     = '2026-10-19'
+g_version_str  = '0.3.0'
 
 
 
@@ -144,6 +145,105 @@ def SafelyEncodeString(in_str,
 
 
 
+class PeriodicLineMerger:
+    """
+    PeriodicLineMerger merges the lines from one snapshot as they are read
+    (one line at a time, using AddLine()), and writes each merged line as soon
+    as all of the lines it needs have been read.  Only the lines which might
+    still be needed are kept in memory.  (When the period is positive, this
+    is a sliding window spanning a little more than max(offsets)-min(offsets)
+    lines.  When the period is 0, only the lines selected by the offsets are
+    kept.)  Call Finish() after the last line in the snapshot has been read.
+
+    """
+
+    def __init__(self,
+                 out_file,
+                 offsets,
+                 period,
+                 nskip,
+                 delimeter_atom,
+                 delimeter_monomer):
+        self.out_file = out_file
+        self.offsets = offsets
+        self.offsets_min = min(offsets)
+        self.offsets_max = max(offsets)
+        self.offsets_set = set(offsets)
+        self.period = period
+        self.nskip = nskip
+        self.delimeter_atom = delimeter_atom
+        self.delimeter_monomer = delimeter_monomer
+        self.Reset()
+
+    def Reset(self):
+        self.num_lines = 0      # the number of lines read from this snapshot
+        self.I = 0              # the next monomer (block) to be written
+        self.window = deque()   # lines which might still be needed
+        self.window_start = 0   # the index of the first line in the window
+        self.selected = {}      # (used instead of the window when period==0)
+
+    def AddLine(self, line):
+        if self.period == 0:
+            if (self.num_lines - self.nskip) in self.offsets_set:
+                self.selected[self.num_lines] = line
+            self.num_lines += 1
+            return
+        self.window.append(line)
+        self.num_lines += 1
+        # Write out all of the monomers whose lines have been read already
+        while self._IsReady(self.I):
+            self._WriteMonomer(self.I, self.num_lines)
+            self.I += 1
+        # Discard the lines which no remaining monomer needs
+        lowest_needed = self.I*self.period + self.nskip + self.offsets_min
+        while (self.window_start < lowest_needed) and (len(self.window) > 0):
+            self.window.popleft()
+            self.window_start += 1
+
+    def Finish(self):
+        if self.period == 0:
+            num_monomers = 1
+        else:
+            num_monomers = (self.num_lines - self.nskip) // self.period
+        while self.I < num_monomers:
+            self._WriteMonomer(self.I, self.num_lines)
+            self.I += 1
+        self.Reset()
+
+    def _IsReady(self, I):
+        # Have enough lines been read to decide what to write for monomer I?
+        # (We must know whether monomer I lies within the snapshot, as well as
+        #  the lines it refers to.)
+        last_needed = max((I+1)*self.period + self.nskip - 1,
+                          I*self.period + self.offsets_max,
+                          I*self.period + self.nskip + self.offsets_max)
+        return last_needed < self.num_lines
+
+    def _Line(self, i):
+        if self.period == 0:
+            return self.selected[i]
+        return self.window[i - self.window_start]
+
+    def _WriteMonomer(self, I, num_lines):
+        # If any of the entries will be missing, then ignore the whole list
+        # of atoms (lines) for this monomer (block).
+        if (I*self.period + self.offsets_min < self.nskip):
+            return
+        if (I*self.period + self.offsets_max >= num_lines):
+            return
+        pieces = []
+        for J in range(0, len(self.offsets)):
+            i = (I*self.period + self.nskip) + self.offsets[J]
+            if (self.nskip <= i) and (i < num_lines):
+                pieces.append(self._Line(i))
+                if J+1 < len(self.offsets):
+                    pieces.append(self.delimeter_atom)
+                else:
+                    pieces.append(self.delimeter_monomer)
+        self.out_file.write(''.join(pieces))
+
+
+
 def ProcessSnapshot(lines, 
                     out_file, 
                     offsets, 
@@ -152,30 +252,15 @@ def ProcessSnapshot(lines,
                     delimeter_atom,
                     delimeter_monomer):
 
-    offsets_min = min(offsets)
-    offsets_max = max(offsets)
-    if period == 0:
-        num_monomers = 1
-    else:
-        num_monomers = (len(lines)-nskip)/period
-    for I in range(0, num_monomers):
-
-        # If any of the entries will be missing, then ignore the whole list
-        # of atoms (lines) for this monomer (block).
-        if (I*period + offsets_min < nskip):
-            continue
-        if (I*period + offsets_max >= len(lines)):
-            continue
-
-        for J in range(0, len(offsets)):
-            j = offsets[J]
-            i = (I*period + nskip) + j
-            if (nskip <= i) and (i < len(lines)):
-                out_file.write(lines[i])
-                if J+1 < len(offsets):
-                    out_file.write(delimeter_atom)
-                else:
-                    out_file.write(delimeter_monomer)
+    merger = PeriodicLineMerger(out_file,
+                                offsets,
+                                period,
+                                nskip,
+                                delimeter_atom,
+                                delimeter_monomer)
+    for line in lines:
+        merger.AddLine(line)
+    merger.Finish()
 
 
 
@@ -224,21 +309,21 @@ def main():
             elif argv[i].lower() == '-s':
                 if i+1 >= len(argv):
                     raise InputError('Error: '+argv[i]+' flag should be followed by a number.\n')
-                g_nskip = float(argv[i+1])
+                g_nskip = int(argv[i+1])
                 sys.stderr.write('   skip first '+str(g_nskip)+' non-comment lines\n')
                 del(argv[i:i+2])
 
-            elif argv[i].lower() == '-d':
+            elif argv[i] == '-d':
                 if i+1 >= len(argv):
                     raise InputError('Error: '+argv[i]+' flag should be followed by a string.\n')
                 g_delimeter_atom = EscCharStrToChar(argv[i+1])
                 sys.stderr.write('   delimeter_atom = \"'+SafelyEncodeString(g_delimeter_atom)+'\"\n')
                 del(argv[i:i+2])
 
-            elif argv[i].lower() == '-D':
+            elif argv[i] == '-D':
                 if i+1 >= len(argv):
                     raise InputError('Error: '+argv[i]+' flag should be followed by string.\n')
-                g_delimeter_atom = EscCharStrToChar(argv[i+1])
+                g_delimeter_monomer = EscCharStrToChar(argv[i+1])
                 sys.stderr.write('   delimeter_monomer = \"'+SafelyEncodeString(g_delimeter_monomer)+'\"\n')
                 del(argv[i:i+2])
 
@@ -265,8 +350,15 @@ def main():
 
 
         # --- Now (finally) read the lines in the standard input ----
+        # (The lines are merged as they are read, so the entire snapshot
+        #  never needs to be stored in memory.)
         n_snapshots = 0
-        lines = []
+        merger = PeriodicLineMerger(sys.stdout,
+                                    g_offsets,
+                                    g_period,
+                                    g_nskip,
+                                    g_delimeter_atom,
+                                    g_delimeter_monomer)
         in_file = sys.stdin
         for line_orig in in_file:
 
@@ -281,35 +373,22 @@ def main():
             # of the next snapshot.
 
             if len(line_orig.strip()) == 0:
-                if n_snapshots > 0:
-                    sys.stdout.write(g_delimeter_snapshot)
-                if len(lines) > 0:
-                    ProcessSnapshot(lines, 
-                                    sys.stdout,
-                                    g_offsets, 
-                                    g_period,
-                                    g_nskip, 
-                                    g_delimeter_atom,
-                                    g_delimeter_monomer)
+                if merger.num_lines > 0:
+                    merger.Finish()
                     n_snapshots += 1
-                # Clear the lines buffer to begin reading the new snapshot
-                del lines[:]
+                elif n_snapshots > 0:
+                    sys.stdout.write(g_delimeter_snapshot)
             else:
                 if len(line.strip()) > 0:
-                    lines.append(line)
-
-        if len(lines) > 0:
-            if n_snapshots > 0:
-                sys.stdout.write(g_delimeter_snapshot)
-            # After reading all of the lines in the file, deal with any lines 
-            # left over since reading the last frame
-            ProcessSnapshot(lines, 
-                            sys.stdout,
-                            g_offsets, 
-                            g_period,
-                            g_nskip, 
-                            g_delimeter_atom,
-                            g_delimeter_monomer)
+                    # Separate the output from different snapshots
+                    if (merger.num_lines == 0) and (n_snapshots > 0):
+                        sys.stdout.write(g_delimeter_snapshot)
+                    merger.AddLine(line)
+
+        # After reading all of the lines in the file, deal with any lines 
+        # left over since reading the last frame
+        if merger.num_lines > 0:
+            merger.Finish()
 
 
     except (ValueError, InputError) as err:
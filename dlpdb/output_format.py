@@ -0,0 +1,117 @@
+"""
+Functions used by the programs in dlpdb which print long tables of numbers
+(pdb2coords.py, pdb2coords_ave.py, coords2angles.py, coords2dihedrals.py,
+coords2projected_dihedrals.py, coords2distances.py, coords2helixAngleOmega.py,
+pdb2gyration.py).
+
+These programs accept the following arguments:
+
+   -precision N   Print N digits after the decimal point.
+                  (By default, every digit is printed, which is usually
+                   16 or 17 significant digits.  This makes the output
+                   files larger, and slower to print and to read.)
+   -delim STR     Separate the numbers on each line using STR.
+                  (Default: " ".  Use "\\t" for tab-separated output.)
+
+Lines are formatted many at a time, and written in large blocks.
+(Numbers which are already strings, such as coordinates copied from a
+ PDB file, and the impossible values printed when a number could not
+ be computed, are printed unchanged.)
+"""
+
+import sys
+
+
+# The number of lines formatted (and written) at once by WriteRows()
+rows_per_block = 4096
+
+
+
+class OutputFormat(object):
+    """
+    OutputFormat converts lists of numbers (or strings) into lines of text
+    using the same precision and delimiter.
+
+    """
+
+    def __init__(self, precision=None, delimiter=' '):
+        self.precision = precision
+        self.delimiter = delimiter
+        if precision == None:
+            # ('%s' formats floats the same way as str())
+            self.number_format = '%s'
+        else:
+            self.number_format = '%.'+str(precision)+'f'
+        self.row_formats = {}
+
+    def Number(self, x):
+        if isinstance(x, str):
+            return x
+        return self.number_format % x
+
+    def RowFormat(self, n):
+        """ Return the format string for a row containing n numbers """
+        if n not in self.row_formats:
+            self.row_formats[n] = self.delimiter.join([self.number_format] * n)
+        return self.row_formats[n]
+
+    def Row(self, values):
+        """ Return a line of text (without a newline) """
+        try:
+            return self.RowFormat(len(values)) % tuple(values)
+        except TypeError:
+            # (Some of the values are strings)
+            return self.delimiter.join([self.Number(x) for x in values])
+
+    def Rows(self, rows):
+        """ Return a block of text containing one line per row """
+        return ''.join([self.Row(row) + '\n' for row in rows])
+
+
+
+def WriteRows(rows, output_format, out_file=sys.stdout):
+    """
+    Format and write an iterable of rows (lists of numbers or strings),
+    rows_per_block rows at a time.
+
+    """
+    block = []
+    for row in rows:
+        block.append(row)
+        if len(block) >= rows_per_block:
+            out_file.write(output_format.Rows(block))
+            block = []
+    if len(block) > 0:
+        out_file.write(output_format.Rows(block))
+
+
+
+def ParseOutputArgs(argv):
+    """
+    ParseOutputArgs() removes the "-precision" and "-delim" arguments
+    (and the arguments which follow them) from a list of arguments.
+    It returns an OutputFormat object and the remaining arguments.
+    (Invalid arguments raise a ValueError.)
+
+    """
+    argv = [arg for arg in argv]
+    precision = None
+    delimiter = ' '
+    i = 1
+    while i < len(argv):
+        if argv[i] in ('-precision', '-delim'):
+            if i+1 >= len(argv):
+                raise ValueError('The '+argv[i]+' argument should be followed by another argument.')
+            if argv[i] == '-precision':
+                try:
+                    precision = int(argv[i+1])
+                except ValueError:
+                    precision = -1
+                if precision < 0:
+                    raise ValueError('The -precision argument should be followed by a non-negative integer.')
+            else:
+                delimiter = argv[i+1].replace('\\t', '\t')
+            del argv[i:i+2]
+        else:
+            i += 1
+    return OutputFormat(precision, delimiter), argv
@@ -45,6 +45,25 @@ from the next residue.  (The " N  " atom in this example.)
  " C  "  i+1  " N  " i+0 " CA  "
  More generally, you can also use "i+2", or "i+3", ..., and "i-1", "i-2",...
  to mix atoms from more distant residues together.)
+Atoms from different chains are never mixed together on the same line.
+(Those lines are treated as if the atoms were missing.)  If the "-breaks"
+argument is used, atoms on opposite sides of a break in the chain are not
+mixed together either.  A break occurs wherever two consecutive residues
+are not bonded (where the distance between the " C  " atom and the " N  "
+atom of the next residue, or the " O3'" and " P  " atoms in DNA/RNA,
+exceeds 2 Angstroms).  Residues lacking these atoms are assumed to be bonded.
+(Do not use "-breaks" with PDB files whose residues were deliberately
+ rearranged, such as files created by dna_interleave_residues.py.)
+
+The atoms (and residues) can also be limited using a selection, such as:
+   -select "chain A and b < 40"
+(The atoms which are not selected are treated as if they were missing,
+ and residues lacking any selected atoms are omitted.
+ See select_atoms.py for details.)
+
+The "-precision N" and "-delim STR" arguments control the format of the
+numbers printed.  (Coordinates copied from the PDB file are printed unchanged.
+See output_format.py.)
 
 Sometimes this program pipes its output to other programs which halt early.
 Below we silently suppress the ugly "Broken pipe" message this generates:
@@ -52,14 +71,13 @@ Below we silently suppress the ugly "Broken pipe" message this generates:
 
 # author: Andrew Jewett
 g_program_name = __file__.split('/')[-1]
-g_date_str = '2017-4-21'
-g_version_str = '0.5.1'
+g_date_str = '2026-10-19'
+g_version_str = '0.9.0'
 
 
 
 import sys
 from operator import attrgetter
-from math import sqrt
 # Sometimes this program pipes its output to other programs which stops reading
 # the PDB file prematurely (such as when multiple MODEL records are present).
 # Below we silently suppress the ugly "Broken pipe" message this generates:
@@ -68,20 +86,118 @@ signal.signal(signal.SIGPIPE, signal.SIG_DFL)
 
 try:
     from .resid import *
+    from .pdb2gyration import SegmentOffsets, SegmentMoments, RadiusOfGyration
+    from .select_atoms import AtomSelection, SelectAtoms
+    from .output_format import ParseOutputArgs, WriteRows
 except ImportError:
     from resid import *
+    from pdb2gyration import SegmentOffsets, SegmentMoments, RadiusOfGyration
+    from select_atoms import AtomSelection, SelectAtoms
+    from output_format import ParseOutputArgs, WriteRows
 
 
 # Ignore atoms on the backbone (other than CA), 
 RAVE_exclude_atoms = [' N  ', ' H  ', ' C  ', ' O  ', ' CA ']
 RAVE_exclude_residues = set(['GLY', 'PRO']) #Glycine residues do not have CB atoms
 
+# Consecutive residues are bonded together if the distance between one of
+# these pairs of atoms is less than max_link_length.  (These are the peptide
+# bonds in proteins, and the phosphodiester bonds in DNA and RNA.)
+link_atom_pairs = [(' C  ', ' N  '), (" O3'", ' P  '), (' O3*', ' P  ')]
+link_atoms = set([name for pair in link_atom_pairs for name in pair])
+max_link_length = 2.0
+
+
+
+def Linked(links_a, links_b):
+    """
+    Linked() returns whether two consecutive residues are bonded together.
+    ("links_a" and "links_b" are dictionaries containing the coordinates of
+     the atoms in each residue whose names appear in link_atoms.)
+    If neither residue contains a pair of linking atoms, it returns None.
+
+    """
+    for name_a, name_b in link_atom_pairs:
+        if (name_a in links_a) and (name_b in links_b):
+            r_a = links_a[name_a]
+            r_b = links_b[name_b]
+            dx = r_b[0]-r_a[0]
+            dy = r_b[1]-r_a[1]
+            dz = r_b[2]-r_a[2]
+            return dx*dx + dy*dy + dz*dz <= max_link_length*max_link_length
+    return None
+
+
+
+def ResidueSegments(chainIDs, links=None):
+    """
+    ResidueSegments() assigns an integer to every residue (in order) which
+    increases by one wherever there is a break in the chain:  wherever the
+    chainID changes, or (if "links" is not None) wherever two consecutive
+    residues are not bonded together (see Linked()).
+    Residues which share the same integer belong to the same "segment".
+
+    """
+    segments = [0] * len(chainIDs)
+    segment = 0
+    for i in range(1, len(chainIDs)):
+        if ((chainIDs[i] != chainIDs[i-1]) or
+            ((links != None) and (Linked(links[i-1], links[i]) == False))):
+            segment += 1
+        segments[i] = segment
+    return segments
+
+
+
+def GatherRows(columns, offsets, segments):
+    """
+    GatherRows() returns the rows of output (one list per line).
+    columns[j][i] is the j'th entry (eg. the coordinates of the j'th atom)
+    of the i'th residue, and offsets[j] is the (non-negative) offset of the
+    residue it comes from.  Row r contains columns[j][r-num_extra+offsets[j]]
+    (or None, if that residue does not exist), where num_extra=max(offsets).
+    Each column is gathered using a single slice of the (padded) column.
+    Rows containing residues from different segments (see ResidueSegments())
+    are masked (filled with None).
+
+    """
+    N = len(segments)
+    num_extra = 0
+    if len(offsets) > 0:
+        num_extra = max(offsets)
+    num_rows = N + num_extra
+    if len(columns) == 0:
+        return [[] for r in range(0, num_rows)]
+    padding = [None] * num_extra
+    gathered = []
+    for j in range(0, len(columns)):
+        padded = padding + columns[j] + padding
+        gathered.append(padded[offsets[j]:offsets[j]+num_rows])
+    rows = [list(row) for row in zip(*gathered)]
+    if (num_extra > 0) and (N > 0):
+        # The segments of the first and last residue used by each row:
+        first = segments[0:1]*num_extra + segments
+        last  = segments + segments[-1:]*num_extra
+        masked = [None] * len(columns)
+        for r in range(0, num_rows):
+            if first[r] != last[r]:
+                rows[r] = masked
+    return rows
+
 
 def main():
+    try:
+        output_format, argv = ParseOutputArgs(sys.argv)
+    except ValueError as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        exit(-1)
+
     atoms_needed = []
     atoms_res_offsets = []
     atoms_res_offset = 0
     omit_incomplete = False
+    check_links = False
+    selection = None
     use_all_residues = True
     firstR = None
     lastR = None
@@ -92,27 +208,42 @@ def main():
 
 
 
-    if len(sys.argv) > 1:
+    if len(argv) > 1:
         i = 1
-        while i < len(sys.argv):
+        while i < len(argv):
 
-            if ((sys.argv[i] == '-blank') or (sys.argv[i] == 'blank')):
+            if ((argv[i] == '-blank') or (argv[i] == 'blank')):
                 omit_incomplete = True
                 i += 1
 
-            elif ((sys.argv[i] == 'i') or
-                  ((sys.argv[i][:1] == 'i') and (len(sys.argv[i]) >= 3) and
-                   (sys.argv[i][1:2] in ['+','-','=']))):
-                if sys.argv[i] == 'i':
+            elif argv[i] == '-breaks':
+                check_links = True
+                i += 1
+
+            elif argv[i] == '-select':
+                if i+1 >= len(argv):
+                    sys.stderr.write('Error: The -select argument should be followed by a selection.\n')
+                    exit(-1)
+                try:
+                    selection = AtomSelection(argv[i+1])
+                except ValueError as err:
+                    sys.stderr.write('Error: '+str(err)+'\n')
+                    exit(-1)
+                i += 2
+
+            elif ((argv[i] == 'i') or
+                  ((argv[i][:1] == 'i') and (len(argv[i]) >= 3) and
+                   (argv[i][1:2] in ['+','-','=']))):
+                if argv[i] == 'i':
                     atoms_res_offset = 0
                 else:
-                    atoms_res_offset = int(sys.argv[i][1:].lstrip('='))
+                    atoms_res_offset = int(argv[i][1:].lstrip('='))
                 i += 1
 
-            elif ((len(sys.argv[i]) >= 2) and
-                  (sys.argv[i][0] == '[') and (sys.argv[i][-1] == ']')):
+            elif ((len(argv[i]) >= 2) and
+                  (argv[i][0] == '[') and (argv[i][-1] == ']')):
 
-                tokens=(sys.argv[i][1:-1]).split(':')
+                tokens=(argv[i][1:-1]).split(':')
                 if len(tokens[0].strip()) > 0:
                     final_range_a = int(tokens[0])
                 if len(tokens[1].strip()) > 0:
@@ -121,24 +252,24 @@ def main():
                     final_slice_incr = int(tokens[2])
                 i += 1
 
-            elif (len(sys.argv[i]) == 4):
+            elif (len(argv[i]) == 4):
                 # Keep track of the atom type name and the order it appeared
-                atoms_needed.append(sys.argv[i])
+                atoms_needed.append(argv[i])
                 # Keep track of from which residue it comes from
                 atoms_res_offsets.append(atoms_res_offset)
                 i += 1
 
-            else: # if not is_digit(sys.argv[i][0])
+            else: # if not is_digit(argv[i][0])
 
                 # If the next argument is a number, then interpret this number
                 # as a residue sequence number
-                if len(sys.argv) < i+6:
+                if len(argv) < i+6:
                     sys.stderr.write("Error: Not enough arguments or argument type error:\n"
-                                     "       Offending arguemt #"+str(i)+": \""+sys.argv[i]+"\"\n")
+                                     "       Offending arguemt #"+str(i)+": \""+argv[i]+"\"\n")
 
-                    if len(sys.argv[i]) == 1:
+                    if len(argv[i]) == 1:
                         sys.stderr.write("\n"
-                                         "       Is argument \""+sys.argv[i]+"\" a chain ID letter?\n"
+                                         "       Is argument \""+argv[i]+"\" a chain ID letter?\n"
                                          "       (Chain IDs are only passed as arguments when you want to limit the\n"
                                          "        residues considered to within an interval in the PDB file.\n"
                                          "        To specify an interval, you must provide 5 more aruments.  See below.)\n"
@@ -167,22 +298,28 @@ def main():
                                          "Note: PDB files are not passed as arguments\n"
                                          "      but are read from the standard input, for example using the notation\n"
                                          "\n"
-                                         "      "+sys.argv[0]+" < file.pdb\n")
+                                         "      "+argv[0]+" < file.pdb\n")
                     exit(-1)
                 else:
                     use_all_residues = False
-                    firstR = ResID(sys.argv[i], int(sys.argv[i+1]), sys.argv[i+2])
-                    lastR  = ResID(sys.argv[i+3], int(sys.argv[i+4]), sys.argv[i+5])
+                    firstR = ResID(argv[i], int(argv[i+1]), argv[i+2])
+                    lastR  = ResID(argv[i+3], int(argv[i+4]), argv[i+5])
                     #sys.stderr.write('  Interval selected: (\"'+firstR.chainID+'\", '+str(firstR.seqNum)+', \"'+firstR.iCode+'\") ... (\"'+lastR.chainID+'\", '+str(lastR.seqNum)+', \"'+lastR.iCode+'\")\n')
                     i += 6
 
     resID2coords   = {}
-    resID2CrdTot   = {}
-    resID2CrdSqTot = {}
-    resID2CrdNum   = {}
+    resID2links    = {}
+    resID2RAVEcrds = {}
+    use_RAVE = (('RAVE' in atoms_needed) or ('RGYR' in atoms_needed))
     model_ID = None
 
-    for line in sys.stdin:
+    lines = sys.stdin
+    records = ("ATOM  ",)
+    if selection != None:
+        lines = SelectAtoms(sys.stdin, selection)
+        records = ("ATOM  ", "HETATM")
+
+    for line in lines:
         #print("\""+line.rstrip()+"\"")
         if line[0:6] == "MODEL ":
             if model_ID == None:
@@ -191,7 +328,7 @@ def main():
                 # Otherwise, if it's not the first model quit
                 sys.stderr.write('  Warning(pdb2coords.py): Omitted alternate models from pdb file.\n')
                 break
-        elif line[0:6] == "ATOM  ":
+        elif line[0:6] in records:
             #atomID    = int(line[6:11])
             atomType  = line[12:16]
             altLoc    = line[16:17]
@@ -207,27 +344,24 @@ def main():
             if (use_all_residues or ((firstR<=resID) and (resID<=lastR))):
                 if resID not in resID2coords:
                     resID2coords[resID]   = [None for i in range(0,len(atoms_needed))]
-                    resID2CrdTot[resID]   = [0.0, 0.0, 0.0]
-                    resID2CrdSqTot[resID] = [0.0, 0.0, 0.0]
-                    resID2CrdNum[resID]   = 0
+                    resID2links[resID]    = {}
+                    resID2RAVEcrds[resID] = []
 
                 if altLoc == ' ':  # (Ignore "alternate" atom records)
+                    if atomType in link_atoms:
+                        resID2links[resID][atomType] = (float(x_str),
+                                                        float(y_str),
+                                                        float(z_str))
                     for i in range(0, len(atoms_needed)):
-
                         if atomType == atoms_needed[i]:
                             resID2coords[resID][i] = [x_str, y_str, z_str]
 
-                        if ((not (atomType in RAVE_exclude_atoms)) and
-                            (not (resType in RAVE_exclude_residues))):
-                            resID2CrdNum[resID] += 1
-                            crd_tot = resID2CrdTot[resID]
-                            crd_tot[0] += float(x_str)
-                            crd_tot[1] += float(y_str)
-                            crd_tot[2] += float(z_str)
-                            crd_sq_tot = resID2CrdSqTot[resID]
-                            crd_sq_tot[0] += float(x_str)**2
-                            crd_sq_tot[1] += float(y_str)**2
-                            crd_sq_tot[2] += float(z_str)**2
+                    if (use_RAVE and
+                        (not (atomType in RAVE_exclude_atoms)) and
+                        (not (resType in RAVE_exclude_residues))):
+                        resID2RAVEcrds[resID].append([float(x_str),
+                                                      float(y_str),
+                                                      float(z_str)])
 
 
 
@@ -244,13 +378,8 @@ def main():
     assert(len(atoms_needed) == len(atoms_res_offsets))
 
     if len(atoms_needed) > 0:
-        min_offset = None
-        max_offset = None
-        for offset in atoms_res_offsets:
-            if ((min_offset == None) or (min_offset > offset)):
-                min_offset = offset
-            if ((max_offset == None) or (max_offset < offset)):
-                max_offset = offset
+        min_offset = min(atoms_res_offsets)
+        max_offset = max(atoms_res_offsets)
     else:
         sys.stderr.write('  Warning(pdb2coords.py): NO ATOM TYPES SELECTED.\n')
         min_offset = 0
@@ -261,58 +390,48 @@ def main():
     # default (if omit_incomplete is False), additional lines of coordinate
     # data will be printed which contain references to missing coordinates
     # (because some of the needed atoms are out of index range).
-    # The "num_extra" variable equals the number the number of additional lines
-    # of output.
-    num_extra = max_offset - min_offset
+    # The number of additional lines of output equals max_offset-min_offset.
     N = len(sequence_of_resIDs)
 
     for i in range(0, len(atoms_res_offsets)):
         atoms_res_offsets[i] -= min_offset
 
-    sorted_positions = [ [None for j in range(0,len(atoms_needed))] 
-                         for i in range(0, N+num_extra) ]
+    # The average position ("RAVE") and radius of gyration ("RGYR") of the
+    # atoms in every residue are computed together (see pdb2gyration.py).
+    if use_RAVE:
+        offsets = SegmentOffsets([len(resID2RAVEcrds[resID])
+                                  for resID in sequence_of_resIDs])
+        RAVE_coords = [r for resID in sequence_of_resIDs
+                       for r in resID2RAVEcrds[resID]]
+        RAVE_nums, RAVE_centroids, RAVE_tensors = SegmentMoments(RAVE_coords,
+                                                                 offsets)
 
     for i in range(0, N):
         resID = sequence_of_resIDs[i]
         positions[i] = resID2coords[resID]
 
-        # now deal with atoms of type "RAVE"
-        for j in range(0, len(atoms_needed)):
-            if atoms_needed[j] == 'RAVE':
-                RAVE_num_atoms = resID2CrdNum[resID]
-                if RAVE_num_atoms > 0:
-                    positions[i][j] = [str(resID2CrdTot[resID][0] / RAVE_num_atoms),
-                                       str(resID2CrdTot[resID][1] / RAVE_num_atoms),
-                                       str(resID2CrdTot[resID][2] / RAVE_num_atoms)]
-                else:
-                    assert(positions[i][j] == None)
-            elif atoms_needed[j] == 'RGYR':
-                RAVE_num_atoms = resID2CrdNum[resID]
-                if RAVE_num_atoms > 0:
-                    rave   = ((resID2CrdTot[resID][0] / RAVE_num_atoms),
-                              (resID2CrdTot[resID][1] / RAVE_num_atoms),
-                              (resID2CrdTot[resID][2] / RAVE_num_atoms))
-                    rsqave = ((resID2CrdSqTot[resID][0] / RAVE_num_atoms),
-                              (resID2CrdSqTot[resID][1] / RAVE_num_atoms),
-                              (resID2CrdSqTot[resID][2] / RAVE_num_atoms))
-                    rgyrsq = 0.0
-                    for d in range(0,3):
-                        rgyrsq += rsqave[d] - (rave[d]*rave[d])
-                    rgyr = sqrt(rgyrsq)
-                    positions[i][j] = [str(rgyr), '', '']
-                    if rgyr == 0.0:
-                        print('resID=\"'+str(resID)+'\"')
-                        exit(0)
-                else:
-                    assert(positions[i][j] == None)
-
-
-    for i in range(-num_extra, N):
-        for j in range(0,len(atoms_needed)):
-            I = i + atoms_res_offsets[j]
-            assert(I >= i)
-            if (0 <= I) and (I < N):
-                sorted_positions[i+num_extra][j] = positions[I][j]
+        # now deal with atoms of type "RAVE" and "RGYR"
+        # (residues lacking these atoms are treated as missing)
+        if use_RAVE and (RAVE_nums[i] > 0):
+            for j in range(0, len(atoms_needed)):
+                if atoms_needed[j] == 'RAVE':
+                    positions[i][j] = RAVE_centroids[i]
+                elif atoms_needed[j] == 'RGYR':
+                    positions[i][j] = [RadiusOfGyration(RAVE_tensors[i]),
+                                       '', '']
+
+
+    # Lines which mix atoms from residues in different chains (or on
+    # opposite sides of a break in the chain, if check_links is True)
+    # are treated as if those atoms were missing.
+    links = None
+    if check_links:
+        links = [resID2links[resID] for resID in sequence_of_resIDs]
+    segments = ResidueSegments([resID.chainID for resID in sequence_of_resIDs],
+                               links)
+    columns = [[positions[i][j] for i in range(0, N)]
+               for j in range(0, len(atoms_needed))]
+    sorted_positions = GatherRows(columns, atoms_res_offsets, segments)
 
     if final_range_a == None:
         final_range_a = 0
@@ -320,24 +439,26 @@ def main():
         final_range_a += max_offset
 
     if final_range_b == None:
-        final_range_b = N+num_extra
+        final_range_b = len(sorted_positions)
     else:
         final_range_b += max_offset
 
+    rows = []
     for i in range(final_range_a, final_range_b, final_slice_incr):
-        coords_str_list = []
+        coords_list = []
         for j in range(0,len(sorted_positions[i])):
             if sorted_positions[i][j] == None:
                 if omit_incomplete:
-                    coords_str_list = []
+                    coords_list = []
                     break
                 else:
-                    coords_str_list += ['?','?','?']
+                    coords_list += ['?','?','?']
             else:
-                coords_str_list += sorted_positions[i][j]
+                coords_list += sorted_positions[i][j]
+        rows.append(coords_list)
 
-        # Finally, write out the coordinates.
-        sys.stdout.write(' '.join(coords_str_list) + '\n')
+    # Finally, write out the coordinates.
+    WriteRows(rows, output_format)
 
 
 if __name__ == "__main__":
@@ -14,8 +14,14 @@
    Backbone atoms (other than alpha-carbon " CA " atoms) are ignored.
    Glycine residues are also ignored.
 
- These settings can not be changed without editing the code for this script.
- (unlike other scripts whose behavior can be changed by command-line arguments)
+ Additional residue types can be ignored by passing their (3-letter) names
+ as arguments.  The atoms can also be limited using a selection, such as:
+   -select "b < 40 and not name H*"
+ (See select_atoms.py for details.)  Otherwise these settings can not be
+ changed without editing the code for this script.
+
+ The "-precision N" and "-delim STR" arguments control the format of the
+ numbers printed.  (See output_format.py.)
 
  Output:
    The number of lines of output should match the number of residues.
@@ -30,8 +36,14 @@ from operator import attrgetter
 
 try:
     from .resid import *
+    from .pdb2gyration import SegmentOffsets, SegmentMoments
+    from .select_atoms import AtomSelection, SelectAtoms
+    from .output_format import ParseOutputArgs, WriteRows
 except ImportError:
     from resid import *
+    from pdb2gyration import SegmentOffsets, SegmentMoments
+    from select_atoms import AtomSelection, SelectAtoms
+    from output_format import ParseOutputArgs, WriteRows
 
 
 # --- THE FOLLOWING FEATURES (interval restrictions) may be removed later:--
@@ -58,29 +70,47 @@ ignore_these_residues = set(['GLY', 'PRO'])
 
 
 def main():
+    try:
+        output_format, argv = ParseOutputArgs(sys.argv)
+    except ValueError as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        exit(-1)
+
     use_all_residues = True
+    selection = None
 
-    if len(sys.argv) > 1:
+    if len(argv) > 1:
         i = 1
-        while i < len(sys.argv):
+        while i < len(argv):
 
-            if (len(sys.argv[i]) == 3):
+            if argv[i] == '-select':
+                if i+1 >= len(argv):
+                    sys.stderr.write('Error: The -select argument should be followed by a selection.\n')
+                    exit(-1)
+                try:
+                    selection = AtomSelection(argv[i+1])
+                except ValueError as err:
+                    sys.stderr.write('Error: '+str(err)+'\n')
+                    exit(-1)
+                i += 2
+
+            elif (len(argv[i]) == 3):
                 # Add the string to the list of amino acids we want to ignore
-                resType = sys.argv[i]
+                resType = argv[i]
                 ignore_these_residues.add(resType)
                 i += 1
 
-            else: # if not is_digit(sys.argv[i][0])
+            else: # if not is_digit(argv[i][0])
 
                 # If the next argument is a number, then interpret this number
                 # as a residue sequence number
-                if len(sys.argv) < i+6:
+                if len(argv) < i+6:
                     sys.stderr.write("Error: Not enough arguments or argument type error:\n"
-                                     "       Offending arguemt #"+str(i)+": \""+sys.argv[i]+"\"\n")
+                                     "       Offending arguemt #"+str(i)+": \""+argv[i]+"\"\n")
 
-                    if len(sys.argv[i]) == 1:
+                    if len(argv[i]) == 1:
                         sys.stderr.write("\n"
-                                         "       Is argument \""+sys.argv[i]+"\" a chain ID letter?\n"
+                                         "       Is argument \""+argv[i]+"\" a chain ID letter?\n"
                                          "       (Chain IDs are only passed as arguments when you want to limit the\n"
                                          "        residues considered to within an interval in the PDB file.\n"
                                          "        To specify an interval, you must provide 5 more aruments.  See below.)\n"
@@ -106,19 +136,25 @@ def main():
                                          "Note: PDB files are not passed as arguments\n"
                                          "      but are read from the standard input, for example using the notation\n"
                                          "\n"
-                                         "      "+sys.argv[0]+" < file.pdb\n")
+                                         "      "+argv[0]+" < file.pdb\n")
                     exit(-1)
                 else:
                     use_all_residues = False
-                    first = ResID(sys.argv[i], int(sys.argv[i+1]), sys.argv[i+2])
-                    last  = ResID(sys.argv[i+3], int(sys.argv[i+4]), sys.argv[i+5])
+                    first = ResID(argv[i], int(argv[i+1]), argv[i+2])
+                    last  = ResID(argv[i+3], int(argv[i+4]), argv[i+5])
                     #sys.stderr.write('  Interval selected: (\"'+first.chainID+'\", '+str(first.seqNum)+', \"'+first.iCode+'\") ... (\"'+last.chainID+'\", '+str(last.seqNum)+', \"'+last.iCode+'\")\n')
                     i += 6
 
     resID2pos = {}
 
-    for line in sys.stdin:
-        if (line[0:6] == "ATOM  "):
+    lines = sys.stdin
+    records = ("ATOM  ",)
+    if selection != None:
+        lines = SelectAtoms(sys.stdin, selection)
+        records = ("ATOM  ", "HETATM")
+
+    for line in lines:
+        if (line[0:6] in records):
             #atomID    = int(line[6:11])
             atomType  = line[12:16]
             #altLoc    = line[16:17]
@@ -142,7 +178,7 @@ def main():
                 # ignore all atoms which are not heavy atoms (hydrogen atoms).
                 if ((resType not in ignore_these_residues) and
                     (atomType not in ignore_these_atoms)):
-                    resID2pos[resID].append([x, y, z, atomType])
+                    resID2pos[resID].append([x, y, z])
 
     # Extract an (unordered) list of the resIDs of the residues in the sequence
     resIDs = [resID for resID in resID2pos]
@@ -151,36 +187,17 @@ def main():
     # Consequently, we must sort the list by chainID, seqNum, and finnaly iCode:
     sequence_of_resIDs = sorted(resIDs, key=attrgetter('chainID','seqNum','iCode'))
 
-    # Now loop through the sequence of resIDs, and calculate 
-    # the average position of the atoms in that residue.
-
-    for resID in sequence_of_resIDs:
-        coords = resID2pos[resID]
-        if coords == []:
-            sys.stdout.write('\n')
-        else:
-            xyz_tot = [0.0 for d in range(0,3)]
-            num_atoms_in_res = len(coords)
-            for i in range(0, num_atoms_in_res):
-
-                for d in range(0,3):
-                    xyz_tot[d] += coords[i][d]
-
-            x_ave = xyz_tot[0] / num_atoms_in_res
-            y_ave = xyz_tot[1] / num_atoms_in_res
-            z_ave = xyz_tot[2] / num_atoms_in_res
-
-
-            x_str = str(x_ave)
-            y_str = str(y_ave)
-            z_str = str(z_ave)
-
-            # Alternately, I could have used:
-            # x_str = "%5.3" % x_ave
-            # y_str = "%5.3" % y_ave
-            # z_str = "%5.3" % z_ave
-
-            sys.stdout.write(x_str+' '+y_str+' '+z_str+'\n')
+    # Now calculate the average position of the atoms in every residue.
+    # (All of the residues are handled together.  See pdb2gyration.py.)
+    offsets = SegmentOffsets([len(resID2pos[resID])
+                              for resID in sequence_of_resIDs])
+    coords = [xyz for resID in sequence_of_resIDs for xyz in resID2pos[resID]]
+    nums, centroids, tensors = SegmentMoments(coords, offsets)
+
+    # For residues lacking eligible atoms, a blank line is printed.
+    WriteRows([[] if nums[k] == 0 else centroids[k]
+               for k in range(0, len(sequence_of_resIDs))],
+              output_format)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,362 @@
+#!/usr/bin/env python
+
+"""
+ Typical usage:
+
+    pdb2gyration.py < PDB_FILE > residue_shapes.dat
+
+ This program reads a PDB file and prints the average position (centroid)
+ and radius of gyration of the atoms in each residue, one line per residue:
+
+    chainID seqNum iCode resName n  x y z  rg
+
+ where "n" is the number of atoms used, "x y z" is their average position
+ (all atoms have the same weight), and "rg" is their radius of gyration.
+ (Residues are sorted by chainID, seqNum and iCode.  The chainID and iCode
+  are printed as "_" when they are blank.  For residues lacking eligible
+  atoms, n is 0 and the remaining numbers are replaced by "?".)
+
+ By default, only side-chain atoms are used:  The backbone atoms (" N  ",
+ " H  ", " CA ", " C  " and " O  ") are ignored, as are glycine and proline
+ residues.  These are the same atoms used by the "RAVE" and "RGYR" atom
+ names in pdb2coords.py.
+
+ Optional arguments:
+
+   -tensor          Also print the 6 independent components of the gyration
+                    tensor:  Sxx Syy Szz Sxy Sxz Syz
+                    (S_ab is the average of (r_a - c_a)*(r_b - c_b) over
+                     the atoms in the residue, where c is the centroid.
+                     Its trace is rg^2.)
+   -axes            Also print the 3 eigenvalues of the gyration tensor
+                    (in decreasing order), followed by the 3 corresponding
+                    eigenvectors (the principal axes, 3 numbers each).
+   -all-atoms       Do not ignore any atoms (use the backbone atoms as well).
+   -all-residues    Do not ignore any residues (not even GLY or PRO).
+   -exclude-atom NAME     Also ignore atoms named NAME (4 characters, such as
+                          " CB ").  This argument can be repeated.
+   -exclude-residue RES   Also ignore residues of type RES (such as LYS).
+                          This argument can be repeated.
+   -select EXPR     Only use the atoms selected by EXPR (for example
+                    "resname PHE,TYR,TRP and b < 40"), in addition to the
+                    exclusions above.  See select_atoms.py for details.
+   -precision N     Print N digits after the decimal point.
+   -delim STR       Separate the columns using STR.  (See output_format.py)
+
+ -----------------------------------------------------------------------
+
+ The functions in this module compute these quantities for many residues
+ at once.  The coordinates of every atom are stored in a single list,
+ sorted by residue, and each residue occupies a contiguous "segment" of
+ that list (beginning at offsets[k] and ending before offsets[k+1]).
+ The sums needed for each segment are computed in a single sweep over
+ the list (see ReduceSegments()).
+"""
+
+import sys
+from math import sqrt
+# Sometimes this program pipes its output to other programs which stops reading
+# the PDB file prematurely (such as when multiple MODEL records are present).
+# Below we silently suppress the ugly "Broken pipe" message this generates:
+import signal
+signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+try:
+    from .resid import PackResID, UnpackResID
+    from .select_atoms import AtomSelection, SelectAtoms
+    from .output_format import ParseOutputArgs, WriteRows
+except ImportError:
+    from resid import PackResID, UnpackResID
+    from select_atoms import AtomSelection, SelectAtoms
+    from output_format import ParseOutputArgs, WriteRows
+
+
+g_program_name = __file__.split('/')[-1]
+g_date_str     = '2026-10-19'
+g_version_str  = '0.3.0'
+
+
+# Ignore the atoms on the backbone (including CA),
+exclude_atoms = set([' N  ', ' H  ', ' C  ', ' O  ', ' CA '])
+exclude_residues = set(['GLY', 'PRO']) #Glycine residues do not have CB atoms
+
+
+
+def SegmentOffsets(sizes):
+    """
+    Convert a list of segment sizes into a list of offsets
+    (eg. [3, 0, 2] -> [0, 3, 3, 5]).  The last offset is the total size.
+
+    """
+    offsets = [0]
+    for size in sizes:
+        offsets.append(offsets[-1] + size)
+    return offsets
+
+
+
+def ReduceSegments(values, offsets):
+    """
+    Return the sum of the values in each segment
+    (values[offsets[k]:offsets[k+1]]), as a list of len(offsets)-1 sums.
+    (Empty segments have a sum of 0.0.)
+
+    """
+    return [sum(values[offsets[k]:offsets[k+1]], 0.0)
+            for k in range(0, len(offsets)-1)]
+
+
+
+def SegmentMoments(coords, offsets):
+    """
+    SegmentMoments() accepts a list of [x,y,z] coordinates (sorted by
+    segment) and the offsets of each segment, and returns three lists
+    (one entry per segment):
+       the number of atoms in each segment,
+       the centroid of each segment (or None, if it is empty),
+       the gyration tensor of each segment [Sxx, Syy, Szz, Sxy, Sxz, Syz]
+         (or None, if it is empty).
+    The centroids are computed first, and the gyration tensors are
+    computed from the coordinates relative to their centroid.  (This avoids
+    the loss of precision which occurs when the average of x^2 and the
+    square of the average of x are large numbers which nearly cancel.)
+
+    """
+    num_segments = len(offsets) - 1
+    sizes = [offsets[k+1] - offsets[k] for k in range(0, num_segments)]
+    # The segment containing each atom:
+    segment_of = [k for k in range(0, num_segments) for i in range(0, sizes[k])]
+
+    x = [r[0] for r in coords]
+    y = [r[1] for r in coords]
+    z = [r[2] for r in coords]
+    sums = [ReduceSegments(x, offsets),
+            ReduceSegments(y, offsets),
+            ReduceSegments(z, offsets)]
+    centroids = [None if sizes[k] == 0 else
+                 [sums[0][k] / sizes[k], sums[1][k] / sizes[k], sums[2][k] / sizes[k]]
+                 for k in range(0, num_segments)]
+
+    dx = [x[i] - centroids[segment_of[i]][0] for i in range(0, len(x))]
+    dy = [y[i] - centroids[segment_of[i]][1] for i in range(0, len(y))]
+    dz = [z[i] - centroids[segment_of[i]][2] for i in range(0, len(z))]
+    products = [[a*b for a, b in zip(dx, dx)],
+                [a*b for a, b in zip(dy, dy)],
+                [a*b for a, b in zip(dz, dz)],
+                [a*b for a, b in zip(dx, dy)],
+                [a*b for a, b in zip(dx, dz)],
+                [a*b for a, b in zip(dy, dz)]]
+    second_sums = [ReduceSegments(p, offsets) for p in products]
+    tensors = [None if sizes[k] == 0 else
+               [second_sums[c][k] / sizes[k] for c in range(0, 6)]
+               for k in range(0, num_segments)]
+
+    return sizes, centroids, tensors
+
+
+
+def RadiusOfGyration(tensor):
+    """ Return the radius of gyration (the square root of the tensor's trace) """
+    return sqrt(max(tensor[0] + tensor[1] + tensor[2], 0.0))
+
+
+
+def PrincipalAxes(tensor, tolerance=1.0e-15, max_sweeps=50):
+    """
+    PrincipalAxes() diagonalizes a symmetric 3x3 tensor
+    [Sxx, Syy, Szz, Sxy, Sxz, Syz] using Jacobi rotations, and returns
+    a list of its 3 eigenvalues (in decreasing order), and a list of the
+    3 corresponding eigenvectors (unit vectors, 3 numbers each).
+
+    """
+    a = [[tensor[0], tensor[3], tensor[4]],
+         [tensor[3], tensor[1], tensor[5]],
+         [tensor[4], tensor[5], tensor[2]]]
+    v = [[1.0, 0.0, 0.0],
+         [0.0, 1.0, 0.0],
+         [0.0, 0.0, 1.0]]
+    scale = abs(a[0][0]) + abs(a[1][1]) + abs(a[2][2])
+    for sweep in range(0, max_sweeps):
+        off_diagonal = abs(a[0][1]) + abs(a[0][2]) + abs(a[1][2])
+        if off_diagonal <= tolerance * scale:
+            break
+        for p, q in ((0, 1), (0, 2), (1, 2)):
+            if a[p][q] == 0.0:
+                continue
+            # Choose the rotation which eliminates a[p][q]
+            theta = (a[q][q] - a[p][p]) / (2.0 * a[p][q])
+            t = 1.0 / (abs(theta) + sqrt(theta*theta + 1.0))
+            if theta < 0.0:
+                t = -t
+            c = 1.0 / sqrt(t*t + 1.0)
+            s = t * c
+            for k in range(0, 3):
+                a_kp = a[k][p]
+                a_kq = a[k][q]
+                a[k][p] = c*a_kp - s*a_kq
+                a[k][q] = s*a_kp + c*a_kq
+            for k in range(0, 3):
+                a_pk = a[p][k]
+                a_qk = a[q][k]
+                a[p][k] = c*a_pk - s*a_qk
+                a[q][k] = s*a_pk + c*a_qk
+            for k in range(0, 3):
+                v_kp = v[k][p]
+                v_kq = v[k][q]
+                v[k][p] = c*v_kp - s*v_kq
+                v[k][q] = s*v_kp + c*v_kq
+    order = sorted(range(0, 3), key=lambda i: -a[i][i])
+    eigenvalues = [a[i][i] for i in order]
+    eigenvectors = [[v[0][i], v[1][i], v[2][i]] for i in order]
+    return eigenvalues, eigenvectors
+
+
+
+def ReadResidueAtoms(lines,
+                     exclude_atoms=exclude_atoms,
+                     exclude_residues=exclude_residues,
+                     records=("ATOM  ",)):
+    """
+    ReadResidueAtoms() reads the ATOM records (or the other types of records
+    listed in "records") from the lines of a PDB file
+    (stopping at the second MODEL record, and ignoring "alternate" atoms),
+    and returns:
+       a sorted list of the residues (packed resIDs, see PackResID()),
+       a dictionary mapping each packed resID to its residue type (eg "LYS"),
+       a dictionary mapping each packed resID to a list of the [x,y,z]
+       coordinates of its atoms (excluding the atoms in exclude_atoms,
+       and every atom in the residues whose types are in exclude_residues).
+
+    """
+    key2resname = {}
+    key2coords = {}
+    model_ID = None
+    for line in lines:
+        if line[0:6] == "MODEL ":
+            if model_ID == None:
+                model_ID = line[10:14]
+            else:
+                sys.stderr.write('  Warning('+g_program_name+'): Omitted alternate models from pdb file.\n')
+                break
+        elif line[0:6] in records:
+            key = PackResID(line[21:22], int(line[22:26]), line[26:27])
+            resType = line[17:20]
+            if key not in key2coords:
+                key2coords[key] = []
+                key2resname[key] = resType
+            if ((line[16:17] == ' ') and
+                (line[12:16] not in exclude_atoms) and
+                (resType not in exclude_residues)):
+                key2coords[key].append([float(line[30:38]),
+                                        float(line[38:46]),
+                                        float(line[46:54])])
+    return sorted(key2coords), key2resname, key2coords
+
+
+
+def ResidueMoments(keys, key2coords):
+    """
+    Compute the number of atoms, the centroid and the gyration tensor of
+    every residue in "keys" (in the same order).  (See SegmentMoments().)
+
+    """
+    offsets = SegmentOffsets([len(key2coords[key]) for key in keys])
+    coords = [r for key in keys for r in key2coords[key]]
+    return SegmentMoments(coords, offsets)
+
+
+
+def main():
+    try:
+        output_format, argv = ParseOutputArgs(sys.argv)
+    except ValueError as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        exit(-1)
+
+    print_tensor = False
+    print_axes = False
+    exclude_atoms_used = set(exclude_atoms)
+    exclude_residues_used = set(exclude_residues)
+    selection = None
+    i = 1
+    while i < len(argv):
+        if argv[i] == '-tensor':
+            print_tensor = True
+            i += 1
+        elif argv[i] == '-axes':
+            print_axes = True
+            i += 1
+        elif argv[i] == '-all-atoms':
+            exclude_atoms_used = set([])
+            i += 1
+        elif argv[i] == '-all-residues':
+            exclude_residues_used = set([])
+            i += 1
+        elif argv[i] in ('-exclude-atom', '-exclude-residue', '-select'):
+            if i+1 >= len(argv):
+                sys.stderr.write('Error: The '+argv[i]+' argument should be followed by another argument.\n')
+                exit(-1)
+            if argv[i] == '-exclude-atom':
+                if len(argv[i+1]) != 4:
+                    sys.stderr.write('Error: Atom-type names should be exactly 4 characters long, and typically\n'
+                                     '       contain spaces.  For example: \" CB \" or \" C1\'\"\n')
+                    exit(-1)
+                exclude_atoms_used.add(argv[i+1])
+            elif argv[i] == '-exclude-residue':
+                exclude_residues_used.add(argv[i+1])
+            else:
+                try:
+                    selection = AtomSelection(argv[i+1])
+                except ValueError as err:
+                    sys.stderr.write('Error: '+str(err)+'\n')
+                    exit(-1)
+            i += 2
+        else:
+            sys.stderr.write('Error: Unrecognized argument: \"'+argv[i]+'\"\n'
+                             '       (Note: PDB files are read from the standard input.)\n')
+            exit(-1)
+
+    sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
+
+    lines = sys.stdin
+    records = ("ATOM  ",)
+    if selection != None:
+        lines = SelectAtoms(sys.stdin, selection)
+        records = ("ATOM  ", "HETATM")
+    keys, key2resname, key2coords = ReadResidueAtoms(lines,
+                                                     exclude_atoms_used,
+                                                     exclude_residues_used,
+                                                     records)
+    sizes, centroids, tensors = ResidueMoments(keys, key2coords)
+
+    num_columns = 4
+    if print_tensor:
+        num_columns += 6
+    if print_axes:
+        num_columns += 12
+
+    rows = []
+    for k in range(0, len(keys)):
+        resID = UnpackResID(keys[k])
+        row = [resID.chainID if resID.chainID != ' ' else '_',
+               str(resID.seqNum),
+               resID.iCode if resID.iCode != ' ' else '_',
+               key2resname[keys[k]], str(sizes[k])]
+        if sizes[k] == 0:
+            row += ['?'] * num_columns
+        else:
+            row += list(centroids[k])
+            row.append(RadiusOfGyration(tensors[k]))
+            if print_tensor:
+                row += list(tensors[k])
+            if print_axes:
+                eigenvalues, eigenvectors = PrincipalAxes(tensors[k])
+                row += list(eigenvalues)
+                for e in eigenvectors:
+                    row += list(e)
+        rows.append(row)
+    WriteRows(rows, output_format)
+
+
+if __name__ == "__main__":
+    main()
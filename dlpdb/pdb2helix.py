@@ -10,18 +10,15 @@ This script is not really intended to be used on it's own.
 
 import sys
 
+try:
+    from .pdb2ss import ParseSSRecord
+except ImportError:
+    from pdb2ss import ParseSSRecord
+
 def main():
     for line in sys.stdin:
         if (line[0:6] == "HELIX "):
-            initChainID = line[19:20]
-            initSeqNum  = int(line[21:25])
-            initICode   = line[25:26]
-            endChainID  = line[31:32]
-            endSeqNum   = int(line[33:37])
-            endICode    = line[37:38]
-            sys.stdout.write("\""+initChainID+"\" "+str(initSeqNum)+" \""+initICode+
-                             "\"  \""+
-                             endChainID+"\" "+str(endSeqNum)+" \""+endICode+"\"\n")
+            sys.stdout.write(str(ParseSSRecord(line))+"\n")
 
 
 if __name__ == "__main__":
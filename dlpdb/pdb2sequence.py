@@ -13,8 +13,7 @@
  Each residue is converted to a 1-letter amino-acid code.
  The 20 standard amino-acids, and 5 nucleic acid types are supported.
  Unknown residue types are denoted 'x'.
- (To add additional residue types, edit the code and add entries to the
- "three2one" lookup table.)
+ (To add additional residue types, edit the lookup table in "resnames.py".)
 
  WARNING: Residues represented as HETATM records will be ignored (skipped)!
 
@@ -43,8 +42,10 @@ from operator import attrgetter
 
 try:
     from .resid import *
+    from .resnames import ResNames2Sequence
 except ImportError:
     from resid import *
+    from resnames import ResNames2Sequence
 
 
 def main():
@@ -67,43 +68,6 @@ def main():
                          "ChainID_first SeqNum_first ICode_first ChainID_last SeqNum_last ICode_last\n")
         exit(-1)
 
-    three2one = {\
-        'GLY':'G',\
-        'ALA':'A',\
-        'SER':'S',\
-        'CYS':'C',\
-        'VAL':'V',\
-            \
-        'THR':'T',\
-        'ILE':'I',\
-        'PRO':'P',\
-        'MET':'M',\
-        'ASP':'D',\
-            \
-        'ASN':'N',\
-        'LEU':'L',\
-        'LYS':'K',\
-        'GLU':'E',\
-        'GLN':'Q',\
-            \
-        'ARG':'R',\
-        'HIS':'H',\
-        'PHE':'F',\
-        'TYR':'Y',\
-        'TRP':'W',
-            \
-        ' DA':'A',\
-        ' DC':'C',\
-        ' DG':'G',\
-        ' DT':'T',\
-            \
-        '  A':'A',\
-        '  U':'U', \
-        '  G':'G',\
-        '  C':'C'}
-
-
-
     resID2type3 = {}
 
     for line in sys.stdin:
@@ -133,14 +97,8 @@ def main():
     # and convert it to a 1-letter residue name ('A', 'P', 'G', 'V'...)
     # and store the sequence in a string 'APGV...'
 
-    sequence = ''
-    for resID in sequence_of_resIDs:
-        three_letter_code = resID2type3[resID]
-        if three_letter_code in three2one:
-            c = three2one[three_letter_code]
-        else:
-            c = 'x' # default character used for unknown/non-standard residues
-        sequence += c
+    sequence = ResNames2Sequence([resID2type3[resID]
+                                  for resID in sequence_of_resIDs])
 
     # Now, finally print out the sequence:
     sys.stdout.write(sequence+'\n')
@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+
+"""
+ Usage:
+
+    pdb2ss.py < PDB_FILE
+    pdb2ss.py -intervals < PDB_FILE
+
+ This program reads the HELIX, SHEET, and TURN records from a PDB file
+ (all of them in a single pass) and prints the secondary structure of every
+ residue in the file (one residue per line).  Each line contains:
+
+    "ChainID" SeqNum "ICode" ResName Label
+
+ The residues are sorted by chainID, seqNum, and iCode.  The "Label" is a
+ single character:
+    H   the residue belongs to a HELIX
+    E   the residue belongs to a (beta) SHEET strand
+    T   the residue belongs to a TURN
+    -   the residue does not belong to any of these
+
+ If the "-intervals" argument is passed, then this program prints the
+ intervals themselves instead (one per line, preceded by the record type):
+
+    HELIX "A" 3 " "  "A" 10 " "
+    SHEET "B" 14 " "  "B" 19 " "
+     :
+
+ (The part of each line following the record type uses the same format
+  as the output of pdb2helix.py, pdb2sheet.py, and pdb2turn.py.)
+
+ The functions and classes defined here (ReadSSIntervals(), SSIndex) can
+ also be used from within python.  An SSIndex answers the question
+ "which secondary structure element contains residue X?" in O(log n) time,
+ where n is the number of HELIX/SHEET/TURN records.  This makes it cheap to
+ label the residues from a large collection of PDB files.
+"""
+
+import sys
+from bisect import bisect_right
+# Sometimes this program pipes its output to other programs which stops reading
+# the PDB file prematurely (such as when multiple MODEL records are present).
+# Below we silently suppress the ugly "Broken pipe" message this generates:
+import signal
+signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+try:
+    from .resid import *
+except ImportError:
+    from resid import *
+
+
+# The 1-letter labels assigned to each type of secondary structure:
+ss_labels = {'HELIX':'H', 'SHEET':'E', 'TURN':'T'}
+ss_label_none = '-'
+
+
+
+class SSInterval:
+    """
+    An SSInterval stores the first and last residue of a HELIX, SHEET,
+    or TURN (as well as the record type, and the line it was read from).
+
+    """
+    def __init__(self, ss_type, first, last, line=None):
+        self.ss_type = ss_type
+        self.first = first
+        self.last = last
+        self.line = line
+
+    def Label(self):
+        return ss_labels[self.ss_type]
+
+    def __str__(self):
+        # (This is the format expected by "select_interval.py")
+        return ("\""+self.first.chainID+"\" "+str(self.first.seqNum)+
+                " \""+self.first.iCode+"\"  \""+
+                self.last.chainID+"\" "+str(self.last.seqNum)+
+                " \""+self.last.iCode+"\"")
+
+    def __repr__(self):
+        return self.ss_type+' '+str(self)
+
+
+
+def ParseSSRecord(line):
+    """
+    If "line" is a HELIX, SHEET, or TURN record, ParseSSRecord() returns
+    an SSInterval object.  Otherwise it returns None.
+    (Information on the PDB HELIX/SHEET/TURN format was obtained from:
+     http://www.wwpdb.org/documentation/format32/sect5.html)
+
+    """
+    line_type = line[0:6]
+    if line_type == "HELIX ":
+        ss_type = 'HELIX'
+        first = ResID(line[19:20], int(line[21:25]), line[25:26] or ' ')
+        last  = ResID(line[31:32], int(line[33:37]), line[37:38] or ' ')
+    elif line_type == "SHEET ":
+        ss_type = 'SHEET'
+        first = ResID(line[21:22], int(line[22:26]), line[26:27] or ' ')
+        last  = ResID(line[32:33], int(line[33:37]), line[37:38] or ' ')
+    elif line_type == "TURN  ":
+        ss_type = 'TURN'
+        first = ResID(line[19:20], int(line[20:24]), line[24:25] or ' ')
+        last  = ResID(line[30:31], int(line[31:35]), line[35:36] or ' ')
+    else:
+        return None
+    return SSInterval(ss_type, first, last, line)
+
+
+
+def ReadSSIntervals(lines):
+    """
+    ReadSSIntervals() reads the lines of a PDB file (once) and returns
+    a list of SSInterval objects (one for every HELIX, SHEET, and TURN record).
+
+    """
+    intervals = []
+    for line in lines:
+        if line[0:6] in ("HELIX ", "SHEET ", "TURN  "):
+            intervals.append(ParseSSRecord(line))
+    return intervals
+
+
+
+class SSIndex:
+    """
+    An SSIndex is a sorted-array index over a list of SSIntervals.
+    The first and last residue of each interval are stored as packed integers
+    (see PackResID() in resid.py).  The intervals are sorted by their first
+    residue.  A binary tree (stored in an array, like a heap) contains the
+    largest last residue of the intervals in each part of this sorted list,
+    so that the intervals containing a residue are found in O(log(n)) time
+    (per interval found), even if some intervals overlap (which occurs in
+    bifurcated sheets) or are very long.
+
+    """
+    def __init__(self, intervals):
+        self.intervals = sorted(intervals, key=lambda I: I.first.Pack())
+        self.starts = [I.first.Pack() for I in self.intervals]
+        self.ends   = [I.last.Pack() for I in self.intervals]
+        # max_ends[node] is the largest of the ends in that node's subtree.
+        # The leaves (nodes size ... size+n-1) are the ends themselves.
+        # (Packed residues are never negative, so -1 is used for padding.)
+        size = 1
+        while size < len(self.ends):
+            size *= 2
+        self.size = size
+        self.max_ends = [-1] * (2*size)
+        self.max_ends[size:size+len(self.ends)] = self.ends
+        for node in range(size-1, 0, -1):
+            self.max_ends[node] = max(self.max_ends[2*node],
+                                      self.max_ends[2*node+1])
+
+    def _Search(self, key, last, find_all=True):
+        """
+        Return the indices (in decreasing order) of the intervals among
+        self.intervals[0:last+1] which end at or after "key".
+        (If find_all is False, only the first of these is returned.)
+
+        """
+        found = []
+        if last < 0:
+            return found
+        max_ends = self.max_ends
+        size = self.size
+        # Depth-first search (visiting the right child first), skipping
+        # subtrees which lie beyond "last", or which end before "key"
+        stack = [(1, 0, size-1)]
+        while len(stack) > 0:
+            node, lo, hi = stack.pop()
+            if (lo > last) or (max_ends[node] < key):
+                continue
+            if node >= size:
+                found.append(lo)
+                if not find_all:
+                    break
+                continue
+            mid = (lo + hi) // 2
+            stack.append((2*node, lo, mid))
+            stack.append((2*node+1, mid+1, hi))
+        return found
+
+    def FindAll(self, key):
+        """ Return a list of all of the intervals containing this residue.
+            ("key" is either a ResID or an integer returned by PackResID().)
+        """
+        if isinstance(key, ResID):
+            key = key.Pack()
+        i = bisect_right(self.starts, key) - 1
+        return [self.intervals[j] for j in self._Search(key, i)]
+
+    def Find(self, key):
+        """ Return the interval containing this residue (or None).
+            If there are several, the one which begins last is returned.
+        """
+        if isinstance(key, ResID):
+            key = key.Pack()
+        i = bisect_right(self.starts, key) - 1
+        found = self._Search(key, i, False)
+        if len(found) == 0:
+            return None
+        return self.intervals[found[0]]
+
+    def Label(self, key):
+        """ Return the 1-letter secondary structure label for this residue. """
+        interval = self.Find(key)
+        if interval == None:
+            return ss_label_none
+        return interval.Label()
+
+    def __len__(self):
+        return len(self.intervals)
+
+
+
+def main():
+    print_intervals = False
+    if len(sys.argv) > 1:
+        if (len(sys.argv) == 2) and (sys.argv[1] in ('-intervals', 'intervals')):
+            print_intervals = True
+        else:
+            sys.stderr.write("Error: The only argument this program accepts is \"-intervals\".\n"
+                             "       (PDB files are read from the standard input.)\n")
+            exit(-1)
+
+    intervals = []
+    key2resType = {}
+    model_ID = None
+
+    # Collect the HELIX/SHEET/TURN records and the residues in the same pass
+    for line in sys.stdin:
+        line_type = line[0:6]
+        if line_type in ("HELIX ", "SHEET ", "TURN  "):
+            intervals.append(ParseSSRecord(line))
+        elif print_intervals:
+            continue
+        elif line_type == "MODEL ":
+            if model_ID == None:
+                model_ID = line[10:14]
+            else:
+                break   # Ignore alternate models
+        elif line_type == "ATOM  ":
+            key = PackResID(line[21:22], int(line[22:26]), line[26:27])
+            key2resType[key] = line[17:20]
+
+    if print_intervals:
+        for interval in intervals:
+            sys.stdout.write(interval.ss_type+' '+str(interval)+'\n')
+        return
+
+    ss_index = SSIndex(intervals)
+    out_lines = []
+    for key in sorted(key2resType):
+        resID = UnpackResID(key)
+        out_lines.append('"'+resID.chainID+'" '+str(resID.seqNum)+' "'+
+                         resID.iCode+'" '+key2resType[key]+' '+
+                         ss_index.Label(key)+'\n')
+    sys.stdout.write(''.join(out_lines))
+
+
+if __name__ == "__main__":
+    main()
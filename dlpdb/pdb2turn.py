@@ -8,18 +8,15 @@
 
 import sys
 
+try:
+    from .pdb2ss import ParseSSRecord
+except ImportError:
+    from pdb2ss import ParseSSRecord
+
 def main():
     for line in sys.stdin:
         if (line[0:6] == "TURN  "):
-            initChainID = line[19:20]
-            initSeqNum  = int(line[20:24])
-            initICode   = line[24:25]
-            endChainID  = line[30:31]
-            endSeqNum   = int(line[31:35])
-            endICode    = line[35:36]
-            sys.stdout.write("\""+initChainID+"\" "+str(initSeqNum)+" \""+initICode+
-                             "\"  \""+
-                             endChainID+"\" "+str(endSeqNum)+" \""+endICode+"\"\n")
+            sys.stdout.write(str(ParseSSRecord(line))+"\n")
 
 
 if __name__ == "__main__":
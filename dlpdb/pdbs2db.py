@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+
+"""
+ Typical usage:
+
+    ls -f1 *.pdb | pdbs2db.py corpus.db
+
+    ls -f1 *.pdb | pdbs2db.py -atom " C3'" dna.db
+
+ This program reads a (long) list of PDB files (once each, in parallel),
+ and stores the information extracted from them in an SQLite database file,
+ which can then be searched many times (using query_db.py, or any other
+ program which reads SQLite files) without reading the PDB files again.
+
+ The database contains these tables:
+
+   entries      one row per PDB file:
+                  pdb file_name pdb_id exptl resolution r_factor free_r
+   chains       one row per chain:
+                  pdb chain num_residues first_resSeq last_resSeq
+   ss_elements  one row per HELIX, SHEET, or TURN record:
+                  pdb ss chain first_resSeq first_iCode last_resSeq last_iCode
+   residues     one row per residue (the same columns as pdbs2table.py):
+                  pdb chain resSeq iCode resName ss x y z phi psi omega
+                  distance angle dihedral
+   settings     the arguments used to create the database ("atom",
+                "dssp", and "select").  Adding PDB files to the database
+                using different arguments is an error.
+
+ "pdb" is the name of the PDB file (without the directory or ".pdb"),
+ and is used to join these tables together.  (So two different PDB files
+ with the same name, in different directories, cannot be stored in the
+ same database.  This is an error.)  "file_name" is the absolute path of
+ the PDB file.  "pdb_id" is the 4-character code from the HEADER record.
+ "exptl" is the experimental method (for example "XRAY", "NMR", or
+ "EM"), and "resolution" is in Angstroms (see cull_chains.py).  Missing
+ values are NULL.  Blank chainIDs and iCodes are stored as "".  The
+ distance, angle, and dihedral columns refer to the atom selected using
+ "-atom" (see pdbs2table.py).
+
+ If the database file already exists, the PDB files are added to it.
+ (PDB files which were already present are replaced.  Adding a different
+  file with the same name as one already present is an error, and the
+  database is not changed.)
+
+ Optional arguments:
+
+   -atom NAME     The 4-character name of the atom used for the coordinates
+                  and the distance, angle, and dihedral columns.
+                  (Default: " CA ".  Use " C3'" or " P  " for DNA or RNA.)
+   -dssp          Read the secondary structure from DSSP files
+                  (see pdbs2rama.py).
+   -select EXPR   Only use the atoms selected by EXPR (see select_atoms.py).
+   -cache DIR     Save the information read from each PDB file in directory
+                  DIR, and reuse it when the database is built again from
+                  the same files.  (If the DLPDB_CACHE environment variable
+                  is set, it is used by default.  See batch.py.)
+   -np N          Use at most N processes.  (By default, one per CPU.)
+
+ PDB files can also be passed as arguments (after the database file name)
+ instead of via the standard input.
+
+ -----------------------------------------------------------------------
+
+ The columns which are searched most often (resolution, exptl, resName, ss,
+ and the pdb/chain of each residue) are indexed, so that typical queries
+ only read the rows they need.  For example:
+
+    query_db.py dna.db "SELECT r.angle FROM residues r
+                        JOIN entries e ON r.pdb = e.pdb
+                        WHERE e.resolution < 2.0 AND r.angle IS NOT NULL"
+"""
+
+import sys
+import os
+import sqlite3
+from functools import partial
+# Sometimes this program pipes its output to other programs which halt early.
+# Below we silently suppress the ugly "Broken pipe" message this generates:
+import signal
+signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+try:
+    from .ss_propensity import DSSPFileName
+    from .pdb2ss import ReadSSIntervals
+    from .pdbs2fasta import PDBCode
+    from .cull_chains import ReadEntryInfo
+    from .pdbs2table import table_columns, ResidueTable
+    from .select_atoms import AtomSelection
+    from .batch import ReadFileNames, MapFiles, OpenCache
+except ImportError:
+    from ss_propensity import DSSPFileName
+    from pdb2ss import ReadSSIntervals
+    from pdbs2fasta import PDBCode
+    from cull_chains import ReadEntryInfo
+    from pdbs2table import table_columns, ResidueTable
+    from select_atoms import AtomSelection
+    from batch import ReadFileNames, MapFiles, OpenCache
+
+
+g_program_name = __file__.split('/')[-1]
+g_date_str     = '2026-10-19'
+g_version_str  = '0.3.0'
+
+
+# The SQLite type of each type of column in pdbs2table.py
+sql_types = {'string':'TEXT', 'int32':'INTEGER', 'float64':'REAL'}
+
+schema = ['CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT)',
+          'CREATE TABLE IF NOT EXISTS entries (pdb TEXT PRIMARY KEY, file_name TEXT, '
+          'pdb_id TEXT, exptl TEXT, resolution REAL, r_factor REAL, free_r REAL)',
+          'CREATE TABLE IF NOT EXISTS chains (pdb TEXT, chain TEXT, '
+          'num_residues INTEGER, first_resSeq INTEGER, last_resSeq INTEGER, '
+          'PRIMARY KEY (pdb, chain))',
+          'CREATE TABLE IF NOT EXISTS ss_elements (pdb TEXT, ss TEXT, chain TEXT, '
+          'first_resSeq INTEGER, first_iCode TEXT, '
+          'last_resSeq INTEGER, last_iCode TEXT)',
+          'CREATE TABLE IF NOT EXISTS residues (' +
+          ', '.join([name+' '+sql_types[column_type]
+                     for name, column_type in table_columns]) + ')',
+          'CREATE INDEX IF NOT EXISTS entries_resolution ON entries (resolution)',
+          'CREATE INDEX IF NOT EXISTS entries_exptl ON entries (exptl)',
+          'CREATE INDEX IF NOT EXISTS ss_elements_pdb ON ss_elements (pdb, chain)',
+          'CREATE INDEX IF NOT EXISTS residues_pdb ON residues (pdb, chain, resSeq)',
+          'CREATE INDEX IF NOT EXISTS residues_resName ON residues (resName, ss)',
+          'CREATE INDEX IF NOT EXISTS residues_ss ON residues (ss)']
+
+
+
+def ReadEntry(file_name, atom_name=' CA ', use_dssp=False, selection=None):
+    """
+    ReadEntry() reads a PDB file (once) and returns a tuple containing the
+    rows of the "entries" and "ss_elements" tables (for that file), and the
+    columns of its "residues" table (a dictionary, see
+    pdbs2table.ResidueTable()).
+
+    """
+    pdb_file = open(file_name, 'r')
+    lines = pdb_file.readlines()
+    pdb_file.close()
+    pdb_code = PDBCode(file_name)
+    pdb_id, exptl, resolution, r_factor, free_r = ReadEntryInfo(file_name,
+                                                                lines)
+    # (The absolute path is stored, since the same result is reused for
+    #  "x.pdb" and "./x.pdb", for example, when a ResultCache is used.)
+    entry = (pdb_code, os.path.abspath(file_name), pdb_id, exptl,
+             resolution, r_factor, free_r)
+    intervals = ReadSSIntervals(lines)
+    ss_rows = [(pdb_code, interval.Label(), interval.first.chainID.strip(),
+                interval.first.seqNum, interval.first.iCode.strip(),
+                interval.last.seqNum, interval.last.iCode.strip())
+               for interval in intervals]
+    residues = ResidueTable(file_name, atom_name, use_dssp, selection, lines)
+    return entry, ss_rows, residues
+
+
+
+def CreateTables(connection):
+    """ Create the tables and indices (unless they already exist) """
+    for statement in schema:
+        connection.execute(statement)
+
+
+
+def SameNameError(pdb_code, file_name1, file_name2):
+    """
+    Return the ValueError raised when two different PDB files have the same
+    name (and would therefore replace each other's rows in the database).
+
+    """
+    return ValueError('Two PDB files have the same name (\"'+pdb_code+'\"):\n'
+                      '       \"'+file_name1+'\"\n'
+                      '       \"'+file_name2+'\"\n'
+                      '       (They cannot be stored in the same database.)')
+
+
+
+def InsertEntry(connection, entry, ss_rows, residues):
+    """
+    Store the information from one PDB file (returned by ReadEntry()) in
+    the database (replacing the information previously stored for it).
+    If the database already contains a different file with the same name,
+    a ValueError is raised (see SameNameError()).
+
+    """
+    pdb_code = entry[0]
+    file_name = entry[1]
+    previous = connection.execute('SELECT file_name FROM entries WHERE pdb = ?',
+                                  (pdb_code,)).fetchall()
+    if ((len(previous) > 0) and
+        (os.path.abspath(previous[0][0]) != file_name)):
+        raise SameNameError(pdb_code, previous[0][0], file_name)
+    for table in ('entries', 'chains', 'ss_elements', 'residues'):
+        connection.execute('DELETE FROM '+table+' WHERE pdb = ?', (pdb_code,))
+    connection.execute('INSERT INTO entries VALUES (?,?,?,?,?,?,?)', entry)
+    connection.executemany('INSERT INTO ss_elements VALUES (?,?,?,?,?,?,?)',
+                           ss_rows)
+    names = [name for name, column_type in table_columns]
+    connection.executemany('INSERT INTO residues VALUES (' +
+                           ','.join(['?'] * len(names)) + ')',
+                           zip(*[[x.strip() if column_type == 'string' else x
+                                  for x in residues[name]]
+                                 for name, column_type in table_columns]))
+    connection.execute('INSERT INTO chains '
+                       'SELECT pdb, chain, COUNT(*), MIN(resSeq), MAX(resSeq) '
+                       'FROM residues WHERE pdb = ? GROUP BY chain', (pdb_code,))
+
+
+
+def UniqueFileNames(file_names):
+    """
+    Return the list of file names, omitting files which appear more than
+    once (eg. as "x.pdb" and "./x.pdb").  A ValueError is raised if two
+    different files have the same PDB code (see PDBCode()), since the
+    rows stored for one of them would replace those of the other.
+
+    """
+    pdb_code2path = {}
+    unique = []
+    for file_name in file_names:
+        path = os.path.abspath(file_name)
+        pdb_code = PDBCode(file_name)
+        if pdb_code in pdb_code2path:
+            if pdb_code2path[pdb_code] != path:
+                raise SameNameError(pdb_code, pdb_code2path[pdb_code], path)
+            continue
+        pdb_code2path[pdb_code] = path
+        unique.append(file_name)
+    return unique
+
+
+
+def BuildDatabase(db_file_name, file_names, atom_name=' CA ', use_dssp=False,
+                  selection=None, num_procs=None, cache=None):
+    """
+    Read a list of PDB files (in parallel) and store them in an SQLite
+    database (see above).  Everything is written in a single transaction.
+    (If a ResultCache is supplied, see batch.py, the information read from
+     each PDB file is stored there, and reused the next time.)
+    Different files with the same PDB code raise a ValueError (see
+    UniqueFileNames()).
+
+    """
+    file_names = UniqueFileNames(file_names)
+    connection = sqlite3.connect(db_file_name)
+    try:
+        CreateTables(connection)
+        # (Rows created using different arguments should not be mixed)
+        settings = [('atom', atom_name),
+                    ('dssp', str(bool(use_dssp))),
+                    ('select', '' if selection == None else selection.text)]
+        for name, value in settings:
+            previous = connection.execute('SELECT value FROM settings WHERE name = ?',
+                                          (name,)).fetchall()
+            if (len(previous) > 0) and (previous[0][0] != value):
+                raise ValueError('The database \"'+db_file_name+'\" was created using a different\n'
+                                 '       \"-'+name+'\" setting: \"'+previous[0][0]+'\" (not \"'+value+'\")\n'
+                                 '       (Use the same arguments, or a new database.)')
+            connection.execute('INSERT OR REPLACE INTO settings VALUES (?,?)',
+                               (name, value))
+        read_file = partial(ReadEntry, atom_name=atom_name, use_dssp=use_dssp,
+                            selection=selection)
+        for entry, ss_rows, residues in MapFiles(read_file, file_names,
+                                                 num_procs, 16, cache):
+            InsertEntry(connection, entry, ss_rows, residues)
+        connection.commit()
+    finally:
+        connection.close()
+
+
+
+def main():
+    num_procs = None
+    atom_name = ' CA '
+    use_dssp = False
+    selection = None
+    cache_dir = None
+    args = []
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] in ('-np', '-atom', '-select', '-cache'):
+            if i+1 >= len(sys.argv):
+                sys.stderr.write('Error: The '+sys.argv[i]+' argument should be followed by another argument.\n')
+                exit(-1)
+            if sys.argv[i] == '-np':
+                num_procs = int(sys.argv[i+1])
+            elif sys.argv[i] == '-atom':
+                atom_name = sys.argv[i+1]
+            elif sys.argv[i] == '-cache':
+                cache_dir = sys.argv[i+1]
+            elif sys.argv[i] == '-select':
+                try:
+                    selection = AtomSelection(sys.argv[i+1])
+                except ValueError as err:
+                    sys.stderr.write('Error: '+str(err)+'\n')
+                    exit(-1)
+            i += 2
+        elif sys.argv[i] == '-dssp':
+            use_dssp = True
+            i += 1
+        else:
+            args.append(sys.argv[i])
+            i += 1
+
+    sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
+
+    if len(args) == 0:
+        sys.stderr.write('Error: This program requires the name of a database file.\n'
+                         '       (The PDB file names are read from the standard input.)\n')
+        exit(-1)
+    if len(atom_name) != 4:
+        sys.stderr.write('Error: Atom-type names should be exactly 4 characters long, and typically\n'
+                         '       contain spaces.  For example: \" CA \" or \" C3\'\"\n')
+        exit(-1)
+
+    db_file_name = args[0]
+    file_names = args[1:]
+    if len(file_names) == 0:
+        file_names = ReadFileNames(sys.stdin)
+
+    related_files = None
+    if use_dssp:
+        related_files = lambda file_name: [DSSPFileName(file_name)]
+    try:
+        cache = OpenCache(cache_dir, g_program_name+' v'+g_version_str,
+                          related_files)
+    except (ValueError, OSError) as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        exit(-1)
+
+    try:
+        BuildDatabase(db_file_name, file_names, atom_name, use_dssp,
+                      selection, num_procs, cache)
+    except (ValueError, sqlite3.Error) as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        exit(-1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+
+"""
+ Typical usage:
+
+    ls -f1 *.pdb | pdbs2fasta.py > sequences.fasta
+
+    ls -f1 *.pdb | pdbs2fasta.py -ss > sequences_ss.fasta
+
+ This program extracts the sequences from a (long) list of PDB files
+ and writes them to the standard output as a single (multi-)FASTA file.
+ By default, one sequence is printed for each chain in every PDB file:
+
+ >1abc_A
+ MKTAYIAKQRQISFVKSHFSRQLEERLGLIEVQAPILSRVGDGTQDNLSGAEKAVQVKVKALPDAQ
+ >1abc_B
+ ...
+
+ If the "-ss" argument is used, one sequence is printed for each HELIX,
+ SHEET, and TURN record in every PDB file instead:
+
+ >1abc_A HELIX A3-A10
+ AKQRQISF
+ >1abc_A SHEET A14-A19
+ ...
+
+ The residue names are converted to 1-letter codes using the same lookup
+ table used by pdb2sequence.py (see "resnames.py").  Unknown residue types are
+ denoted 'x'.  As with pdb2sequence.py, HETATM records are ignored, and only
+ the first MODEL in each PDB file is read.
+
+ The files are processed in parallel.  The "-np N" argument limits the
+ number of processes to N.  (By default, one process per CPU is used.)
+ PDB files can also be passed as arguments instead of via the standard input.
+"""
+
+import sys
+import os
+from bisect import bisect_left, bisect_right
+# Sometimes this program pipes its output to other programs which halt early.
+# Below we silently suppress the ugly "Broken pipe" message this generates:
+import signal
+signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+try:
+    from .resid import *
+    from .resnames import resname2code, unknown_code, Codes2Sequence
+    from .pdb2ss import ParseSSRecord
+    from .batch import ReadFileNames, MapFiles
+except ImportError:
+    from resid import *
+    from resnames import resname2code, unknown_code, Codes2Sequence
+    from pdb2ss import ParseSSRecord
+    from batch import ReadFileNames, MapFiles
+
+
+g_program_name = __file__.split('/')[-1]
+g_date_str     = '2026-10-19'
+g_version_str  = '0.1.0'
+
+
+
+def PDBCode(file_name):
+    """ Guess the PDB code from the file name (eg. "pdbs/1abc.pdb" -> "1abc") """
+    pdb_code = os.path.basename(file_name)
+    i = pdb_code.lower().rfind('.pdb')
+    if i != -1:
+        pdb_code = pdb_code[:i]
+    return pdb_code
+
+
+
+def ReadChainCodes(file_name):
+    """
+    ReadChainCodes() reads a PDB file (once), and returns a tuple containing:
+      chain2keys   a dictionary containing the (sorted) list of packed residue
+                   keys (see PackResID()) for each chainID in the file
+      chain2codes  a dictionary containing the corresponding list of integer
+                   residue codes (see resnames.py) for each chainID
+      intervals    a list of the HELIX, SHEET, and TURN records in the file
+                   (as SSInterval objects)
+
+    """
+    chain2key2code = {}
+    intervals = []
+    model_ID = None
+    pdb_file = open(file_name, 'r')
+    for line in pdb_file:
+        line_type = line[0:6]
+        if line_type == "ATOM  ":
+            chainID = line[21:22]
+            key = PackResID(chainID, int(line[22:26]), line[26:27])
+            if chainID not in chain2key2code:
+                chain2key2code[chainID] = {}
+            chain2key2code[chainID][key] = resname2code.get(line[17:20],
+                                                            unknown_code)
+        elif line_type in ("HELIX ", "SHEET ", "TURN  "):
+            intervals.append(ParseSSRecord(line))
+        elif line_type == "MODEL ":
+            if model_ID == None:
+                model_ID = line[10:14]
+            else:
+                break   # Ignore alternate models
+    pdb_file.close()
+
+    chain2keys = {}
+    chain2codes = {}
+    for chainID in chain2key2code:
+        key2code = chain2key2code[chainID]
+        chain2keys[chainID] = sorted(key2code)
+        chain2codes[chainID] = [key2code[key] for key in chain2keys[chainID]]
+    return chain2keys, chain2codes, intervals
+
+
+
+def ReadChainSequences(file_name, use_ss=False):
+    """
+    ReadChainSequences() reads a PDB file (once), and returns a list of
+    (name, sequence) pairs, one per chain (or one per HELIX/SHEET/TURN record
+    if use_ss is True).
+
+    """
+    chain2keys, chain2codes, intervals = ReadChainCodes(file_name)
+    pdb_code = PDBCode(file_name)
+
+    sequences = []
+    if not use_ss:
+        for chainID in sorted(chain2codes):
+            name = pdb_code
+            if chainID != ' ':
+                name += '_' + chainID
+            sequences.append((name, Codes2Sequence(chain2codes[chainID])))
+    else:
+        for interval in intervals:
+            chainID = interval.first.chainID
+            if chainID not in chain2keys:
+                continue
+            keys = chain2keys[chainID]
+            i_first = bisect_left(keys, interval.first.Pack())
+            i_last  = bisect_right(keys, interval.last.Pack())
+            name = pdb_code
+            if chainID != ' ':
+                name += '_' + chainID
+            name += (' ' + interval.ss_type + ' ' +
+                     str(interval.first).strip() + '-' +
+                     str(interval.last).strip())
+            sequences.append((name,
+                              Codes2Sequence(chain2codes[chainID][i_first:i_last])))
+    return sequences
+
+
+
+def ReadChainSequencesSS(file_name):
+    return ReadChainSequences(file_name, use_ss=True)
+
+
+
+def main():
+    num_procs = None
+    use_ss = False
+    file_names = []
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] == '-np':
+            if i+1 >= len(sys.argv):
+                sys.stderr.write('Error: The -np argument should be followed by a number.\n')
+                exit(-1)
+            num_procs = int(sys.argv[i+1])
+            i += 2
+        elif sys.argv[i] == '-ss':
+            use_ss = True
+            i += 1
+        else:
+            file_names.append(sys.argv[i])
+            i += 1
+
+    sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
+
+    if len(file_names) == 0:
+        file_names = ReadFileNames(sys.stdin)
+
+    if use_ss:
+        read_sequences = ReadChainSequencesSS
+    else:
+        read_sequences = ReadChainSequences
+
+    for sequences in MapFiles(read_sequences, file_names, num_procs, 16):
+        sys.stdout.write(''.join(['>'+name+'\n'+sequence+'\n'
+                                  for name, sequence in sequences]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,532 @@
+#!/usr/bin/env python
+
+"""
+ Typical usage:
+
+    ls -f1 *.pdb | pdbs2rama.py -bin-width 10 > rama_hist.dat
+
+    ls -f1 *.pdb | pdbs2rama.py -angles > backbone_dihedrals.dat
+
+ This program reads a (long) list of PDB files (once each, in parallel),
+ and calculates the backbone dihedral angles (phi, psi, omega) of every
+ amino acid residue:
+    phi(i)   = dihedral(C(i-1), N(i),  CA(i),  C(i))
+    psi(i)   = dihedral(N(i),   CA(i), C(i),   N(i+1))
+    omega(i) = dihedral(CA(i),  C(i),  N(i+1), CA(i+1))
+ Angles are in degrees, in the range (-180,180].  (Angles which cannot be
+ calculated, because an atom is missing, or because there is a break in the
+ chain, are printed as "NA".  A chain break occurs wherever the distance
+ between C(i) and N(i+1) exceeds 2 Angstroms.)
+
+ By default, this program prints a 2-dimensional histogram (a "Ramachandran
+ plot") of the (phi, psi) angles, for each type of residue and each kind of
+ secondary structure.  Each line of the output contains:
+
+    res  ss  phi  psi  count
+
+ "res" is the 1-letter code of the amino acid (or "X"), "ss" is its secondary
+ structure ("H" helix, "E" strand, "T" turn, or "-" none of the above,
+ see ss_propensity.py), "phi" and "psi" are the centers of the bin, and
+ "count" is the number of residues in that bin.  Empty bins are omitted.
+ (The histogram for all residues can be obtained by adding the counts of
+  the lines with the same phi and psi, eg. using awk.)
+
+ Optional arguments:
+
+   -angles        Print the angles of every residue instead of a histogram:
+                     pdb  chain  resSeq  res  ss  phi  psi  omega
+   -bin-width W   The width of each bin in degrees.  (Default: 10)
+   -dssp          Read the secondary structure from the DSSP file
+                  corresponding to each PDB file (see ss_propensity.py)
+                  instead of its HELIX, SHEET, and TURN records.
+   -weights FILE  Count the residues in each PDB file using a weight read from
+                  FILE (one per line, in the same order as the PDB files,
+                  for example created using chain_weights.py).  Each PDB file
+                  must contain a single chain.
+   -chain-weights FILE  Count the residues in each chain using a weight read
+                  from FILE, which contains the ID of a chain (eg. "1ABCA")
+                  followed by its weight on each line (see ss_propensity.py).
+                  (Use this for PDB files containing several chains.)
+   -select EXPR   Only use the atoms selected by EXPR (for example
+                  "chain A and b < 40").  See select_atoms.py for details.
+   -cache DIR     Save the results from each PDB file in directory DIR, and
+                  reuse them when this program is run again on the same files
+                  (with the same arguments).  Only new or modified files are
+                  read again.  (If the DLPDB_CACHE environment variable is
+                  set, it is used by default.  See batch.py for details.)
+   -np N          Use at most N processes.  (By default, one per CPU.)
+   -shard k/N     Only read the k'th of N parts of the list of PDB files
+                  (see batch.py).
+   -partial       Print the histogram in a format which can be added exactly
+                  to the histograms of the other parts (see reduce_partials.py).
+   -reduce        Add together the histograms in the files which follow (each
+                  created using "-shard k/N -partial"), and print the result.
+                  (The same histogram is printed as if all of the PDB files
+                   had been read at once.)
+
+ PDB files can also be passed as arguments instead of via the standard input.
+ Only ATOM records (in the first MODEL, and the first alternate location)
+ are used (unless HETATM records are selected using "-select").
+"""
+
+import sys
+import math
+from functools import partial
+# Sometimes this program pipes its output to other programs which halt early.
+# Below we silently suppress the ugly "Broken pipe" message this generates:
+import signal
+signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+try:
+    from .resid import PackResID, UnpackResID
+    from .resnames import resname2code, unknown_code, res_names1, num_amino_acids
+    from .pdb2ss import SSIndex, ParseSSRecord, ss_label_none
+    from .pdbs2fasta import PDBCode
+    from .ss_propensity import DSSPFileName, ReadDSSPLabels
+    from .chain_weights import ReadWeights, WeightsDigest, ReadWeightTable, ChainWeight
+    from .batch import ReadFileNames, MapFiles, OpenCache, ParseShard, ShardIndices
+    from .reduce_partials import Partials, ReducePartials, Exact, Inexact
+    from .select_atoms import AtomSelection, SelectAtoms
+except ImportError:
+    from resid import PackResID, UnpackResID
+    from resnames import resname2code, unknown_code, res_names1, num_amino_acids
+    from pdb2ss import SSIndex, ParseSSRecord, ss_label_none
+    from pdbs2fasta import PDBCode
+    from ss_propensity import DSSPFileName, ReadDSSPLabels
+    from chain_weights import ReadWeights, WeightsDigest, ReadWeightTable, ChainWeight
+    from batch import ReadFileNames, MapFiles, OpenCache, ParseShard, ShardIndices
+    from reduce_partials import Partials, ReducePartials, Exact, Inexact
+    from select_atoms import AtomSelection, SelectAtoms
+
+
+g_program_name = __file__.split('/')[-1]
+g_date_str     = '2026-10-19'
+g_version_str  = '0.5.0'
+
+
+# The backbone atoms which are needed (and their column in each residue):
+backbone_atoms = {' N  ':0, ' CA ':1, ' C  ':2}
+
+# C(i) and N(i+1) are not considered bonded if they are farther apart than this
+max_peptide_bond = 2.0
+
+
+
+def ReadBackbone(file_name, selection=None):
+    """
+    ReadBackbone() reads a PDB file (once), and returns a tuple containing:
+      chain2keys   a dictionary containing the (sorted) list of packed residue
+                   keys (see PackResID()) for each chainID in the file
+      chain2codes  a dictionary containing the corresponding residue codes
+      chain2atoms  a dictionary containing the corresponding list of
+                   [N, CA, C] coordinates (each (x,y,z) or None if missing)
+      intervals    a list of the HELIX, SHEET, and TURN records in the file
+    If an AtomSelection is supplied, the atoms it does not select are ignored.
+
+    """
+    chain2key2atoms = {}
+    chain2key2code = {}
+    intervals = []
+    model_ID = None
+    pdb_file = open(file_name, 'r')
+    lines = pdb_file
+    records = ("ATOM  ",)
+    if selection != None:
+        lines = SelectAtoms(pdb_file, selection)
+        records = ("ATOM  ", "HETATM")
+    for line in lines:
+        line_type = line[0:6]
+        if line_type in records:
+            chainID = line[21:22]
+            key = PackResID(chainID, int(line[22:26]), line[26:27])
+            if chainID not in chain2key2atoms:
+                chain2key2atoms[chainID] = {}
+                chain2key2code[chainID] = {}
+            key2atoms = chain2key2atoms[chainID]
+            if key not in key2atoms:
+                key2atoms[key] = [None, None, None]
+                chain2key2code[chainID][key] = resname2code.get(line[17:20],
+                                                                unknown_code)
+            column = backbone_atoms.get(line[12:16])
+            # (use the first alternate location of each atom)
+            if (column != None) and (key2atoms[key][column] == None):
+                key2atoms[key][column] = (float(line[30:38]),
+                                          float(line[38:46]),
+                                          float(line[46:54]))
+        elif line_type in ("HELIX ", "SHEET ", "TURN  "):
+            intervals.append(ParseSSRecord(line))
+        elif line_type == "MODEL ":
+            if model_ID == None:
+                model_ID = line[10:14]
+            else:
+                break   # Ignore alternate models
+    pdb_file.close()
+
+    chain2keys = {}
+    chain2codes = {}
+    chain2atoms = {}
+    for chainID in chain2key2atoms:
+        keys = sorted(chain2key2atoms[chainID])
+        chain2keys[chainID] = keys
+        chain2codes[chainID] = [chain2key2code[chainID][key] for key in keys]
+        chain2atoms[chainID] = [chain2key2atoms[chainID][key] for key in keys]
+    return chain2keys, chain2codes, chain2atoms, intervals
+
+
+
+def Dihedral(r0, r1, r2, r3):
+    """
+    Return the dihedral angle (in degrees, in the range (-180,180]) defined
+    by 4 atoms.  (4 atoms in the "trans" conformation have an angle of 180.)
+    Returns None if any of the atoms are missing (None).
+
+    """
+    if (r0 == None) or (r1 == None) or (r2 == None) or (r3 == None):
+        return None
+    b1x = r1[0]-r0[0]; b1y = r1[1]-r0[1]; b1z = r1[2]-r0[2]
+    b2x = r2[0]-r1[0]; b2y = r2[1]-r1[1]; b2z = r2[2]-r1[2]
+    b3x = r3[0]-r2[0]; b3y = r3[1]-r2[1]; b3z = r3[2]-r2[2]
+    # n1 = b1 x b2,  n2 = b2 x b3
+    n1x = b1y*b2z - b1z*b2y; n1y = b1z*b2x - b1x*b2z; n1z = b1x*b2y - b1y*b2x
+    n2x = b2y*b3z - b2z*b3y; n2y = b2z*b3x - b2x*b3z; n2z = b2x*b3y - b2y*b3x
+    x = n1x*n2x + n1y*n2y + n1z*n2z
+    y = (b1x*n2x + b1y*n2y + b1z*n2z) * math.sqrt(b2x*b2x + b2y*b2y + b2z*b2z)
+    return math.degrees(math.atan2(y, x))
+
+
+
+def Bonded(C, N):
+    """ Are the C atom of one residue, and N atom of the next, bonded? """
+    if (C == None) or (N == None):
+        return False
+    dx = N[0]-C[0]; dy = N[1]-C[1]; dz = N[2]-C[2]
+    return dx*dx + dy*dy + dz*dz <= max_peptide_bond*max_peptide_bond
+
+
+
+def BackboneDihedrals(atoms):
+    """
+    BackboneDihedrals() accepts a list of [N, CA, C] coordinates (one per
+    residue, see ReadBackbone()), and returns 3 lists (phi, psi, omega)
+    containing the angles of each residue (or None, if undefined).
+
+    """
+    num_residues = len(atoms)
+    N  = [a[0] for a in atoms]
+    CA = [a[1] for a in atoms]
+    C  = [a[2] for a in atoms]
+    # bonded[i] is True if residue i is bonded to residue i+1
+    bonded = list(map(Bonded, C[:-1], N[1:]))
+    phi   = [None] + list(map(Dihedral, C[:-1], N[1:], CA[1:], C[1:]))
+    psi   = list(map(Dihedral, N[:-1], CA[:-1], C[:-1], N[1:])) + [None]
+    omega = list(map(Dihedral, CA[:-1], C[:-1], N[1:], CA[1:])) + [None]
+    for i in range(0, num_residues-1):
+        if not bonded[i]:
+            phi[i+1] = None
+            psi[i] = None
+            omega[i] = None
+    return phi[0:num_residues], psi[0:num_residues], omega[0:num_residues]
+
+
+
+def ResidueLabels(file_name, intervals, use_dssp):
+    """ Return a function which returns the secondary structure of a residue """
+    if use_dssp:
+        try:
+            dssp_file = open(DSSPFileName(file_name), 'r')
+            key2label = ReadDSSPLabels(dssp_file)
+            dssp_file.close()
+            return lambda key: key2label.get(key, ss_label_none)
+        except IOError:
+            sys.stderr.write('Warning: DSSP file \"'+DSSPFileName(file_name) +
+                             '\" not found.  Using the HELIX/SHEET/TURN records in \"' +
+                             file_name+'\" instead.\n')
+    return SSIndex(intervals).Label
+
+
+
+def ResidueAngles(file_name, use_dssp=False, selection=None):
+    """
+    ResidueAngles() reads a PDB file and returns a list of tuples (one per
+    residue) containing:  (key, code, ss, phi, psi, omega)
+
+    """
+    chain2keys, chain2codes, chain2atoms, intervals = ReadBackbone(file_name,
+                                                                   selection)
+    label = ResidueLabels(file_name, intervals, use_dssp)
+    rows = []
+    for chainID in sorted(chain2keys):
+        keys = chain2keys[chainID]
+        codes = chain2codes[chainID]
+        phi, psi, omega = BackboneDihedrals(chain2atoms[chainID])
+        for i in range(0, len(keys)):
+            rows.append((keys[i], codes[i], label(keys[i]),
+                         phi[i], psi[i], omega[i]))
+    return rows
+
+
+
+def AngleBin(angle, bin_width, num_bins):
+    return int(math.floor((angle + 180.0) / bin_width)) % num_bins
+
+
+
+def RamaCounts(file_name, bin_width=10.0, use_dssp=False, selection=None,
+               by_chain=False):
+    """
+    RamaCounts() reads a PDB file and returns a dictionary which maps each
+    (code, ss, phi_bin, psi_bin) to the number of residues with that
+    residue code, secondary structure, and (binned) phi and psi angles.
+    If by_chain is True, the residues in each chain are counted separately
+    (and the keys are (chainID, code, ss, phi_bin, psi_bin)).
+
+    """
+    num_bins = int(round(360.0 / bin_width))
+    counts = {}
+    for key, code, ss, phi, psi, omega in ResidueAngles(file_name, use_dssp,
+                                                        selection):
+        if (phi == None) or (psi == None):
+            continue
+        b = (min(code, num_amino_acids), ss,
+             AngleBin(phi, bin_width, num_bins),
+             AngleBin(psi, bin_width, num_bins))
+        if by_chain:
+            b = (UnpackResID(key).chainID,) + b
+        counts[b] = counts.get(b, 0) + 1
+    return counts
+
+
+
+def FormatAngle(angle):
+    if angle == None:
+        return 'NA'
+    return str(angle)
+
+
+
+def ResidueName1(code):
+    if code < num_amino_acids:
+        return res_names1[code]
+    return 'X'
+
+
+
+def WriteRamaCounts(total, bin_width, out_file):
+    """ Print the histogram (see above) created by RamaCounts() """
+    for b in sorted(total):
+        code, ss, phi_bin, psi_bin = b
+        out_file.write(ResidueName1(code)+' '+ss+' '+
+                       str(-180.0 + (phi_bin+0.5)*bin_width)+' '+
+                       str(-180.0 + (psi_bin+0.5)*bin_width)+' '+
+                       str(Inexact(total[b]))+'\n')
+
+
+
+def main():
+    num_procs = None
+    print_angles = False
+    bin_width = 10.0
+    use_dssp = False
+    weights_file_name = None
+    chain_weights_file_name = None
+    selection = None
+    cache_dir = None
+    shard = None
+    write_partial = False
+    reduce_partials = False
+    file_names = []
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] in ('-np', '-bin-width', '-weights', '-select', '-cache',
+                           '-shard', '-chain-weights'):
+            if i+1 >= len(sys.argv):
+                sys.stderr.write('Error: The '+sys.argv[i]+' argument should be followed by another argument.\n')
+                exit(-1)
+            if sys.argv[i] == '-np':
+                num_procs = int(sys.argv[i+1])
+            elif sys.argv[i] == '-bin-width':
+                bin_width = float(sys.argv[i+1])
+            elif sys.argv[i] == '-weights':
+                weights_file_name = sys.argv[i+1]
+            elif sys.argv[i] == '-chain-weights':
+                chain_weights_file_name = sys.argv[i+1]
+            elif sys.argv[i] == '-cache':
+                cache_dir = sys.argv[i+1]
+            elif sys.argv[i] == '-shard':
+                try:
+                    shard = ParseShard(sys.argv[i+1])
+                except ValueError as err:
+                    sys.stderr.write('Error: '+str(err)+'\n')
+                    exit(-1)
+            elif sys.argv[i] == '-select':
+                try:
+                    selection = AtomSelection(sys.argv[i+1])
+                except ValueError as err:
+                    sys.stderr.write('Error: '+str(err)+'\n')
+                    exit(-1)
+            i += 2
+        elif sys.argv[i] == '-angles':
+            print_angles = True
+            i += 1
+        elif sys.argv[i] == '-dssp':
+            use_dssp = True
+            i += 1
+        elif sys.argv[i] == '-partial':
+            write_partial = True
+            i += 1
+        elif sys.argv[i] == '-reduce':
+            reduce_partials = True
+            i += 1
+        elif sys.argv[i].startswith('-'):
+            sys.stderr.write('Error: Unrecognized argument: \"'+sys.argv[i]+'\"\n')
+            exit(-1)
+        else:
+            file_names.append(sys.argv[i])
+            i += 1
+
+    sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
+
+    if bin_width <= 0.0:
+        sys.stderr.write('Error: The bin width must be positive.\n')
+        exit(-1)
+    num_bins = int(round(360.0 / bin_width))
+    if abs(num_bins*bin_width - 360.0) > 1.0e-6:
+        sys.stderr.write('Error: The bin width must divide 360 evenly.\n')
+        exit(-1)
+    if print_angles and (write_partial or reduce_partials):
+        sys.stderr.write('Error: The -angles argument can not be used with -partial or -reduce.\n')
+        exit(-1)
+    if (weights_file_name != None) and (chain_weights_file_name != None):
+        sys.stderr.write('Error: The -weights and -chain-weights arguments can not be used together.\n')
+        exit(-1)
+    weighted = (weights_file_name != None) or (chain_weights_file_name != None)
+
+    if reduce_partials:
+        try:
+            partials = ReducePartials(file_names,
+                                      g_program_name+' v'+g_version_str)
+            partials.CheckComplete()
+        except (ValueError, IOError) as err:
+            sys.stderr.write('Error: '+str(err)+'\n')
+            exit(-1)
+        bin_width = float(partials.Setting('bin-width'))
+        total = {}
+        for key in partials.Keys():
+            b = (int(key[0]), key[1], int(key[2]), int(key[3]))
+            total[b] = partials.Values(key)[0]
+        WriteRamaCounts(total, bin_width, sys.stdout)
+        return
+
+    if len(file_names) == 0:
+        file_names = ReadFileNames(sys.stdin)
+
+    related_files = None
+    if use_dssp:
+        related_files = lambda file_name: [DSSPFileName(file_name)]
+    try:
+        cache = OpenCache(cache_dir, g_program_name+' v'+g_version_str,
+                          related_files)
+    except (ValueError, OSError) as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        exit(-1)
+
+    weights = [1 for file_name in file_names]
+    if weights_file_name != None:
+        try:
+            weights_file = open(weights_file_name, 'r')
+            weights = ReadWeights(weights_file)
+            weights_file.close()
+        except (ValueError, IOError) as err:
+            sys.stderr.write('Error: '+str(err)+'\n')
+            exit(-1)
+        if len(weights) < len(file_names):
+            sys.stderr.write('Error: The weights file contains fewer lines than the number of PDB files.\n')
+            exit(-1)
+    id2weight = None
+    if chain_weights_file_name != None:
+        try:
+            chain_weights_file = open(chain_weights_file_name, 'r')
+            id2weight = ReadWeightTable(chain_weights_file)
+            chain_weights_file.close()
+        except (ValueError, IOError) as err:
+            sys.stderr.write('Error: '+str(err)+'\n')
+            exit(-1)
+
+    if shard != None:
+        indices = ShardIndices(file_names, shard)
+        file_names = [file_names[n] for n in indices]
+        weights = [weights[n] for n in indices]
+
+    if print_angles:
+        read_file = partial(ResidueAngles, use_dssp=use_dssp,
+                            selection=selection)
+        n = 0
+        for rows in MapFiles(read_file, file_names, num_procs, 16, cache):
+            pdb_code = PDBCode(file_names[n])
+            for key, code, ss, phi, psi, omega in rows:
+                resID = UnpackResID(key)
+                sys.stdout.write(pdb_code+' '+resID.chainID+' '+
+                                 (str(resID.seqNum)+resID.iCode).strip()+' '+
+                                 ResidueName1(code)+' '+ss+' '+
+                                 FormatAngle(phi)+' '+FormatAngle(psi)+' '+
+                                 FormatAngle(omega)+'\n')
+            n += 1
+        return
+
+    total = {}
+    weight2counts = {}
+    read_file = partial(RamaCounts, bin_width=bin_width, use_dssp=use_dssp,
+                        selection=selection, by_chain=weighted)
+    n = 0
+    for counts in MapFiles(read_file, file_names, num_procs, 16, cache):
+        if not weighted:
+            for b in counts:
+                total[b] = total.get(b, 0) + counts[b]
+            n += 1
+            continue
+        chainIDs = set([b[0] for b in counts])
+        if (id2weight == None) and (len(chainIDs) > 1):
+            sys.stderr.write('Error: \"'+file_names[n]+'\" contains '+
+                             str(len(chainIDs))+' chains.\n'
+                             '       The -weights argument requires files containing a single chain.\n'
+                             '       (Use -chain-weights instead.)\n')
+            exit(-1)
+        # (The counts for each different weight are kept separately, and
+        #  multiplied by their weight once, at the end.)
+        chain2counts = {}
+        for chainID in chainIDs:
+            weight = weights[n]
+            if id2weight != None:
+                weight = ChainWeight(file_names[n], chainID, id2weight)
+            if weight not in weight2counts:
+                weight2counts[weight] = {}
+            chain2counts[chainID] = weight2counts[weight]
+        for b in counts:
+            weight_counts = chain2counts[b[0]]
+            weight_counts[b[1:]] = weight_counts.get(b[1:], 0) + counts[b]
+        n += 1
+    for weight in weight2counts:
+        exact_weight = Exact(weight)
+        weight_counts = weight2counts[weight]
+        for b in weight_counts:
+            total[b] = total.get(b, 0) + exact_weight*weight_counts[b]
+
+    if write_partial:
+        partials = Partials(g_program_name+' v'+g_version_str,
+                            [('bin-width', repr(bin_width)),
+                             ('dssp', use_dssp),
+                             ('select', selection),
+                             ('weights', WeightsDigest(weights_file_name)),
+                             ('chain-weights', WeightsDigest(chain_weights_file_name))],
+                            4, shard)
+        partials.num_files = len(file_names)
+        for b in total:
+            partials.Add(b, [total[b]])
+        partials.Write(sys.stdout)
+        return
+
+    WriteRamaCounts(total, bin_width, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,480 @@
+#!/usr/bin/env python
+
+"""
+ Typical usage:
+
+    ls -f1 *.pdb | pdbs2table.py > residues.dat
+
+    ls -f1 *.pdb | pdbs2table.py -atom " C3'" -format parquet -out dna.parquet
+
+ This program reads a (long) list of PDB files (once each, in parallel),
+ and creates a table containing one row for every residue.  The columns are:
+
+    pdb chain resSeq iCode resName ss x y z phi psi omega distance angle dihedral
+
+   pdb, chain, resSeq, iCode, resName  identify the residue
+   ss        its secondary structure ("H", "E", "T", or "-", see pdbs2rama.py)
+   x, y, z   the coordinates of one of its atoms (" CA ", by default)
+   phi, psi, omega   its backbone dihedral angles (see pdbs2rama.py)
+   distance  the distance between that atom in residues i and i+1,
+   angle     the angle between that atom in residues i, i+1, i+2, and
+   dihedral  the dihedral angle between that atom in residues i,...,i+3
+             (where i is the residue on that row).
+ All angles are in degrees.  Dihedral angles are in the range (-180,180].
+ Values which cannot be calculated (because an atom is missing, or because
+ they span the end of a chain or a break in the chain) are missing.
+ (Breaks are detected the same way as "pdb2coords.py -breaks".)
+
+ Unlike the output of pdb2coords.py (and the coords2*.py programs), the
+ meaning of each row does not depend on its position in the file, so the
+ rows can be filtered or sorted, and the tables from different runs can
+ be concatenated.
+
+ Optional arguments:
+
+   -format FMT    The format of the table:
+                    text     whitespace-separated text, with a header line.
+                             (Missing values are "NA".  Blank chainIDs and
+                              iCodes are printed as "_".)  This is the default.
+                    parquet  Apache Parquet (requires the "pyarrow" module)
+                    arrow    Apache Arrow IPC file (requires "pyarrow")
+                             (Missing values are null.  Blank chainIDs and
+                              iCodes are stored as "".)
+   -out FILE      Write the table to FILE.  (Required for parquet and arrow.
+                  Otherwise the table is printed to the standard output.)
+   -atom NAME     The 4-character name of the atom used for the coordinates
+                  and the distance, angle, and dihedral columns.
+                  (Default: " CA ".  Use " C3'" or " P  " for DNA or RNA.)
+   -dssp          Read the secondary structure from DSSP files
+                  (see pdbs2rama.py).
+   -select EXPR   Only use the atoms selected by EXPR (see select_atoms.py).
+   -precision N   Print N digits after the decimal point (text format only).
+   -cache DIR     Save the results from each PDB file in directory DIR, and
+                  reuse them when this program is run again on the same files
+                  (with the same arguments).  Only new or modified files are
+                  read again.  (If the DLPDB_CACHE environment variable is
+                  set, it is used by default.  See batch.py for details.)
+   -np N          Use at most N processes.  (By default, one per CPU.)
+   -shard k/N     Only read the k'th of N parts of the list of PDB files
+                  (see batch.py).  The tables created from each part (for
+                  example "-shard 2/8 -format parquet -out part2.parquet")
+                  together contain every row, and can be read as one dataset.
+
+ PDB files can also be passed as arguments instead of via the standard input.
+
+ -----------------------------------------------------------------------
+
+ Parquet and Arrow files are written in chunks (of about rows_per_chunk rows)
+ as the PDB files are read, so the entire table is never stored in memory.
+ The columns of these files can be loaded directly into numpy or pandas
+ (numeric columns without missing values, such as x, y, z in a corpus
+ where the atom is never missing, can be loaded without copying).
+ Parquet files can also be filtered while they are read, eg:
+
+    import pyarrow.parquet as pq
+    t = pq.read_table('dna.parquet', columns=['pdb','angle'],
+                      filters=[('ss', '=', 'H'), ('angle', '>', 80.0)])
+    angles = t.column('angle').to_numpy()
+"""
+
+import sys
+import math
+from functools import partial
+# Sometimes this program pipes its output to other programs which halt early.
+# Below we silently suppress the ugly "Broken pipe" message this generates:
+import signal
+signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+try:
+    from .resid import PackResID, UnpackResID
+    from .pdb2ss import ParseSSRecord
+    from .pdbs2fasta import PDBCode
+    from .ss_propensity import DSSPFileName
+    from .pdbs2rama import backbone_atoms, BackboneDihedrals, Dihedral, ResidueLabels
+    from .pdb2coords import link_atoms, ResidueSegments
+    from .coords2angles import Coords2AnglesLengths
+    from .select_atoms import AtomSelection, SelectAtoms
+    from .output_format import ParseOutputArgs
+    from .batch import ReadFileNames, MapFiles, OpenCache, ParseShard, ShardIndices
+except ImportError:
+    from resid import PackResID, UnpackResID
+    from pdb2ss import ParseSSRecord
+    from pdbs2fasta import PDBCode
+    from ss_propensity import DSSPFileName
+    from pdbs2rama import backbone_atoms, BackboneDihedrals, Dihedral, ResidueLabels
+    from pdb2coords import link_atoms, ResidueSegments
+    from coords2angles import Coords2AnglesLengths
+    from select_atoms import AtomSelection, SelectAtoms
+    from output_format import ParseOutputArgs
+    from batch import ReadFileNames, MapFiles, OpenCache, ParseShard, ShardIndices
+
+
+g_program_name = __file__.split('/')[-1]
+g_date_str     = '2026-10-19'
+g_version_str  = '0.3.0'
+
+
+# The name and type of each column in the table:
+table_columns = [('pdb', 'string'),
+                 ('chain', 'string'),
+                 ('resSeq', 'int32'),
+                 ('iCode', 'string'),
+                 ('resName', 'string'),
+                 ('ss', 'string'),
+                 ('x', 'float64'),
+                 ('y', 'float64'),
+                 ('z', 'float64'),
+                 ('phi', 'float64'),
+                 ('psi', 'float64'),
+                 ('omega', 'float64'),
+                 ('distance', 'float64'),
+                 ('angle', 'float64'),
+                 ('dihedral', 'float64')]
+
+# Parquet and Arrow tables are written in chunks of (approximately) this size
+rows_per_chunk = 65536
+
+
+
+def ReadResidues(file_name, atom_name=' CA ', selection=None, lines=None):
+    """
+    ReadResidues() reads a PDB file (once), and returns a tuple containing:
+      keys       the (sorted) list of packed residue keys (see PackResID())
+      resnames   a list of the corresponding residue names
+      atoms      a list of the coordinates of the atom named atom_name in
+                 each residue (x,y,z), or None if it is missing
+      backbone   a list of [N, CA, C] coordinates for each residue
+      links      a list of dictionaries containing the coordinates of the
+                 atoms used to detect breaks in the chain (see pdb2coords.py)
+      intervals  a list of the HELIX, SHEET, and TURN records in the file
+    (Only the first MODEL, and the first alternate location of each atom
+     are used.  If "lines" is not None, it is used instead of the contents
+     of the file.)
+
+    """
+    key2resname = {}
+    key2atom = {}
+    key2backbone = {}
+    key2links = {}
+    intervals = []
+    model_ID = None
+    pdb_file = None
+    if lines == None:
+        pdb_file = open(file_name, 'r')
+        lines = pdb_file
+    records = ("ATOM  ",)
+    if selection != None:
+        lines = SelectAtoms(lines, selection)
+        records = ("ATOM  ", "HETATM")
+    for line in lines:
+        line_type = line[0:6]
+        if line_type in records:
+            key = PackResID(line[21:22], int(line[22:26]), line[26:27])
+            if key not in key2resname:
+                key2resname[key] = line[17:20].strip()
+                key2atom[key] = None
+                key2backbone[key] = [None, None, None]
+                key2links[key] = {}
+            name = line[12:16]
+            column = backbone_atoms.get(name)
+            if ((name == atom_name) or (column != None) or
+                (name in link_atoms)):
+                xyz = (float(line[30:38]),
+                       float(line[38:46]),
+                       float(line[46:54]))
+                # (use the first alternate location of each atom)
+                if (name == atom_name) and (key2atom[key] == None):
+                    key2atom[key] = xyz
+                if (column != None) and (key2backbone[key][column] == None):
+                    key2backbone[key][column] = xyz
+                if (name in link_atoms) and (name not in key2links[key]):
+                    key2links[key][name] = xyz
+        elif line_type in ("HELIX ", "SHEET ", "TURN  "):
+            intervals.append(ParseSSRecord(line))
+        elif line_type == "MODEL ":
+            if model_ID == None:
+                model_ID = line[10:14]
+            else:
+                break   # Ignore alternate models
+    if pdb_file != None:
+        pdb_file.close()
+
+    keys = sorted(key2resname)
+    return (keys,
+            [key2resname[key] for key in keys],
+            [key2atom[key] for key in keys],
+            [key2backbone[key] for key in keys],
+            [key2links[key] for key in keys],
+            intervals)
+
+
+
+def Distance(r0, r1):
+    if (r0 == None) or (r1 == None):
+        return None
+    return math.sqrt((r1[0]-r0[0])**2 + (r1[1]-r0[1])**2 + (r1[2]-r0[2])**2)
+
+
+
+def Angle(r0, r1, r2):
+    """ Return the angle (in degrees) between 3 atoms (or None) """
+    if (r0 == None) or (r1 == None) or (r2 == None):
+        return None
+    try:
+        theta, l10, l21 = Coords2AnglesLengths(r0, r1, r2)
+    except ZeroDivisionError:
+        return None
+    return math.degrees(theta)
+
+
+
+def WindowColumn(function, atoms, segments, width):
+    """
+    Apply function() to the atoms in every window of "width" consecutive
+    residues (beginning at each residue).  Windows which extend past the
+    end of the list, or which contain residues from different segments
+    (see ResidueSegments()) are assigned None.
+
+    """
+    N = len(atoms)
+    values = [None] * N
+    if N >= width:
+        values[0:N-width+1] = map(function,
+                                  *[atoms[k:N-width+1+k] for k in range(0, width)])
+    for i in range(0, N-width+1):
+        if segments[i] != segments[i+width-1]:
+            values[i] = None
+    return values
+
+
+
+def ResidueTable(file_name, atom_name=' CA ', use_dssp=False, selection=None,
+                 lines=None):
+    """
+    ResidueTable() reads a PDB file and returns the table described above
+    (for that file), as a dictionary containing one list per column.
+    (If "lines" is not None, it is used instead of the contents of the file.)
+
+    """
+    keys, resnames, atoms, backbone, links, intervals = ReadResidues(file_name,
+                                                                     atom_name,
+                                                                     selection,
+                                                                     lines)
+    label = ResidueLabels(file_name, intervals, use_dssp)
+    resIDs = [UnpackResID(key) for key in keys]
+    chainIDs = [resID.chainID for resID in resIDs]
+    segments = ResidueSegments(chainIDs, links)
+
+    # The backbone dihedrals are computed one chain at a time
+    phi = []
+    psi = []
+    omega = []
+    i = 0
+    while i < len(keys):
+        j = i
+        while (j < len(keys)) and (chainIDs[j] == chainIDs[i]):
+            j += 1
+        chain_phi, chain_psi, chain_omega = BackboneDihedrals(backbone[i:j])
+        phi += chain_phi
+        psi += chain_psi
+        omega += chain_omega
+        i = j
+
+    return {'pdb':      [PDBCode(file_name)] * len(keys),
+            'chain':    chainIDs,
+            'resSeq':   [resID.seqNum for resID in resIDs],
+            'iCode':    [resID.iCode.strip() for resID in resIDs],
+            'resName':  resnames,
+            'ss':       [label(key) for key in keys],
+            'x':        [None if r == None else r[0] for r in atoms],
+            'y':        [None if r == None else r[1] for r in atoms],
+            'z':        [None if r == None else r[2] for r in atoms],
+            'phi':      phi,
+            'psi':      psi,
+            'omega':    omega,
+            'distance': WindowColumn(Distance, atoms, segments, 2),
+            'angle':    WindowColumn(Angle, atoms, segments, 3),
+            'dihedral': WindowColumn(Dihedral, atoms, segments, 4)}
+
+
+
+class TextTableWriter(object):
+    """ Writes the table as text, one row at a time (see OutputFormat) """
+
+    def __init__(self, out_file, output_format):
+        self.out_file = out_file
+        self.output_format = output_format
+        self.out_file.write(output_format.delimiter.join(
+            [name for name, column_type in table_columns]) + '\n')
+
+    def Write(self, columns):
+        text_columns = []
+        for name, column_type in table_columns:
+            column = columns[name]
+            if column_type == 'string':
+                column = ['_' if x in ('', ' ') else x for x in column]
+            elif column_type == 'int32':
+                column = [str(x) for x in column]
+            else:
+                column = ['NA' if x == None else x for x in column]
+            text_columns.append(column)
+        self.out_file.write(self.output_format.Rows(zip(*text_columns)))
+
+    def Close(self):
+        if self.out_file != sys.stdout:
+            self.out_file.close()
+
+
+
+class ArrowTableWriter(object):
+    """
+    Writes the table in Parquet or Arrow IPC format, one chunk at a time.
+    (This requires the "pyarrow" module.)
+
+    """
+
+    def __init__(self, file_name, table_format):
+        import pyarrow
+        self.pa = pyarrow
+        self.schema = pyarrow.schema([(name, getattr(pyarrow, column_type)())
+                                      for name, column_type in table_columns])
+        self.table_format = table_format
+        if table_format == 'parquet':
+            import pyarrow.parquet
+            self.writer = pyarrow.parquet.ParquetWriter(file_name, self.schema)
+        else:
+            import pyarrow.ipc
+            self.writer = pyarrow.ipc.new_file(file_name, self.schema)
+
+    def Write(self, columns):
+        # (Blank chainIDs and iCodes are stored as "", as in pdbs2db.py)
+        batch = self.pa.record_batch([self.pa.array([x.strip() for x in columns[name]]
+                                                    if column_type == 'string'
+                                                    else columns[name],
+                                                    type=self.schema.field(name).type)
+                                      for name, column_type in table_columns],
+                                     schema=self.schema)
+        if self.table_format == 'parquet':
+            # (each chunk becomes one row group)
+            self.writer.write_table(self.pa.Table.from_batches([batch]))
+        else:
+            self.writer.write_batch(batch)
+
+    def Close(self):
+        self.writer.close()
+
+
+
+def main():
+    try:
+        output_format, argv = ParseOutputArgs(sys.argv)
+    except ValueError as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        exit(-1)
+
+    num_procs = None
+    table_format = 'text'
+    out_file_name = None
+    atom_name = ' CA '
+    use_dssp = False
+    selection = None
+    cache_dir = None
+    shard = None
+    file_names = []
+    i = 1
+    while i < len(argv):
+        if argv[i] in ('-np', '-format', '-out', '-atom', '-select', '-cache',
+                       '-shard'):
+            if i+1 >= len(argv):
+                sys.stderr.write('Error: The '+argv[i]+' argument should be followed by another argument.\n')
+                exit(-1)
+            if argv[i] == '-np':
+                num_procs = int(argv[i+1])
+            elif argv[i] == '-format':
+                table_format = argv[i+1].lower()
+            elif argv[i] == '-out':
+                out_file_name = argv[i+1]
+            elif argv[i] == '-atom':
+                atom_name = argv[i+1]
+            elif argv[i] == '-cache':
+                cache_dir = argv[i+1]
+            elif argv[i] == '-shard':
+                try:
+                    shard = ParseShard(argv[i+1])
+                except ValueError as err:
+                    sys.stderr.write('Error: '+str(err)+'\n')
+                    exit(-1)
+            elif argv[i] == '-select':
+                try:
+                    selection = AtomSelection(argv[i+1])
+                except ValueError as err:
+                    sys.stderr.write('Error: '+str(err)+'\n')
+                    exit(-1)
+            i += 2
+        elif argv[i] == '-dssp':
+            use_dssp = True
+            i += 1
+        else:
+            file_names.append(argv[i])
+            i += 1
+
+    sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
+
+    if table_format not in ('text', 'parquet', 'arrow'):
+        sys.stderr.write('Error: The -format argument should be followed by "text", "parquet", or "arrow".\n')
+        exit(-1)
+    if len(atom_name) != 4:
+        sys.stderr.write('Error: Atom-type names should be exactly 4 characters long, and typically\n'
+                         '       contain spaces.  For example: \" CA \" or \" C3\'\"\n')
+        exit(-1)
+
+    if table_format == 'text':
+        out_file = sys.stdout
+        if out_file_name != None:
+            out_file = open(out_file_name, 'w')
+        writer = TextTableWriter(out_file, output_format)
+    else:
+        if out_file_name == None:
+            sys.stderr.write('Error: The -out argument is required when using \"-format '+table_format+'\".\n')
+            exit(-1)
+        try:
+            writer = ArrowTableWriter(out_file_name, table_format)
+        except ImportError:
+            sys.stderr.write('Error: \"-format '+table_format+'\" requires the \"pyarrow\" python module.\n'
+                             '       (Install it using \"pip install pyarrow\", or use \"-format text\".)\n')
+            exit(-1)
+
+    if len(file_names) == 0:
+        file_names = ReadFileNames(sys.stdin)
+    if shard != None:
+        file_names = [file_names[n] for n in ShardIndices(file_names, shard)]
+
+    related_files = None
+    if use_dssp:
+        related_files = lambda file_name: [DSSPFileName(file_name)]
+    try:
+        cache = OpenCache(cache_dir, g_program_name+' v'+g_version_str,
+                          related_files)
+    except (ValueError, OSError) as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        exit(-1)
+
+    read_file = partial(ResidueTable, atom_name=atom_name, use_dssp=use_dssp,
+                        selection=selection)
+    chunk = dict([(name, []) for name, column_type in table_columns])
+    num_rows = 0
+    for columns in MapFiles(read_file, file_names, num_procs, 16, cache):
+        for name, column_type in table_columns:
+            chunk[name] += columns[name]
+        num_rows += len(columns['pdb'])
+        if (table_format == 'text') or (num_rows >= rows_per_chunk):
+            writer.Write(chunk)
+            chunk = dict([(name, []) for name, column_type in table_columns])
+            num_rows = 0
+    if num_rows > 0:
+        writer.Write(chunk)
+    writer.Close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+
+"""
+ Typical usage:
+
+    query_db.py corpus.db "SELECT resName, ss, phi, psi FROM residues" > rama.dat
+
+    query_db.py -precision 2 dna.db \\
+       "SELECT r.angle FROM residues r JOIN entries e ON r.pdb = e.pdb
+        WHERE e.resolution < ? AND r.ss = ? AND r.angle IS NOT NULL" 2.0 H
+
+ This program reads a database created by pdbs2db.py, runs an SQL query,
+ and prints the results (one line per row, with a header line containing
+ the names of the columns).  Missing values (NULL) are printed as "NA",
+ and empty strings (such as blank chainIDs and iCodes) are printed as "_".
+ Any arguments following the query are substituted (in order) for the "?"
+ characters in the query.  (Arguments which look like numbers are
+ substituted as numbers.)  The database is opened read-only.
+
+ Optional arguments:
+
+   -no-header     Omit the header line.
+   -precision N   Print N digits after the decimal point.
+   -delim STR     Separate the columns using STR.  (Default: " ")
+
+ -----------------------------------------------------------------------
+
+ The same queries can be performed from within python using QueryColumns(),
+ which returns one list per column.  These are easily converted into numpy
+ arrays, for example:
+
+    import numpy as np
+    from dlpdb import QueryColumns
+    columns = QueryColumns('dna.db', 'SELECT angle FROM residues '
+                           'WHERE angle IS NOT NULL')
+    angles = np.array(columns['angle'])
+"""
+
+import sys
+import sqlite3
+import pathlib
+# Sometimes this program pipes its output to other programs which halt early.
+# Below we silently suppress the ugly "Broken pipe" message this generates:
+import signal
+signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+try:
+    from .output_format import ParseOutputArgs, WriteRows
+except ImportError:
+    from output_format import ParseOutputArgs, WriteRows
+
+
+g_program_name = __file__.split('/')[-1]
+g_date_str     = '2026-10-19'
+g_version_str  = '0.1.0'
+
+
+# The number of rows read from the database at once
+rows_per_fetch = 4096
+
+
+
+def OpenDatabase(db_file_name):
+    """ Open an existing database (read-only) """
+    # (The file name is quoted, since it may contain "?", "#", or "%")
+    uri = pathlib.Path(db_file_name).resolve().as_uri() + '?mode=ro'
+    return sqlite3.connect(uri, uri=True)
+
+
+
+def QueryRows(db_file_name, query, params=()):
+    """
+    Run an SQL query, and return a tuple containing the names of the
+    columns, and an iterator over the rows (tuples) of the result.
+    (The rows are read from the database as they are needed.)
+
+    """
+    connection = OpenDatabase(db_file_name)
+    try:
+        cursor = connection.execute(query, params)
+    except BaseException:
+        connection.close()
+        raise
+    names = [description[0] for description in cursor.description or []]
+    def Rows():
+        try:
+            rows = cursor.fetchmany(rows_per_fetch)
+            while len(rows) > 0:
+                for row in rows:
+                    yield row
+                rows = cursor.fetchmany(rows_per_fetch)
+        finally:
+            connection.close()
+    return names, Rows()
+
+
+
+def QueryColumns(db_file_name, query, params=()):
+    """
+    Run an SQL query, and return a dictionary containing a list for each
+    column of the result (keyed by the names of the columns).
+
+    """
+    names, rows = QueryRows(db_file_name, query, params)
+    columns = [list(column) for column in zip(*rows)]
+    if len(columns) == 0:
+        columns = [[] for name in names]
+    return dict(zip(names, columns))
+
+
+
+def ParseParam(s):
+    """ Convert an argument into a number (if possible) """
+    try:
+        return int(s)
+    except ValueError:
+        pass
+    try:
+        return float(s)
+    except ValueError:
+        return s
+
+
+
+def main():
+    try:
+        output_format, argv = ParseOutputArgs(sys.argv)
+    except ValueError as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        exit(-1)
+
+    print_header = True
+    args = []
+    for arg in argv[1:]:
+        if arg == '-no-header':
+            print_header = False
+        else:
+            args.append(arg)
+
+    if len(args) < 2:
+        sys.stderr.write('Error: This program requires at least 2 arguments:\n'
+                         '       the name of a database file, and an SQL query.\n')
+        exit(-1)
+
+    sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
+
+    db_file_name = args[0]
+    query = args[1]
+    params = [ParseParam(arg) for arg in args[2:]]
+    try:
+        names, rows = QueryRows(db_file_name, query, params)
+        if print_header:
+            sys.stdout.write(output_format.delimiter.join(names)+'\n')
+        WriteRows((['NA' if x == None else
+                    (x if isinstance(x, float) else (str(x) or '_'))
+                    for x in row]
+                   for row in rows),
+                  output_format)
+    except sqlite3.Error as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        exit(-1)
+
+
+if __name__ == "__main__":
+    main()
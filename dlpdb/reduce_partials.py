@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+
+"""
+ Typical usage:
+
+    ls -f1 *.pdb | ss_propensity.py -shard 1/3 -partial > part1.txt  (computer 1)
+    ls -f1 *.pdb | ss_propensity.py -shard 2/3 -partial > part2.txt  (computer 2)
+    ls -f1 *.pdb | ss_propensity.py -shard 3/3 -partial > part3.txt  (computer 3)
+
+    ss_propensity.py -reduce part1.txt part2.txt part3.txt > propensity.txt
+
+    reduce_partials.py part1.txt part2.txt > part1_2.txt
+
+ Several programs (ss_propensity.py, pdbs2rama.py, histogram.py, and
+ bootstrap.py) can divide their work into N parts ("shards"), which can be
+ computed separately (for example by different computers, or at different
+ times) using the "-shard k/N" and "-partial" arguments.  Instead of the final
+ results, "-partial" prints the totals (counts, histograms, or sums) from
+ which they are computed.  The same program, invoked with "-reduce" followed
+ by the names of these files, adds them together and prints the final
+ results (which are the same as if the program had read all of the files).
+
+ This program adds partial results together (without computing the final
+ results).  This is useful when there are many shards, and can also be used
+ to check that the partial results are compatible.
+
+ The format of these files is:
+
+    # dlpdb partial
+    # program ss_propensity.py v0.6.0
+    # setting dssp False
+    # setting weights 9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08
+    # setting chain-weights False
+    # shards 2/3
+    # files 1687
+    # keys 2
+    H 0 149633/2 140311/4
+    H 1 1502 1502
+      :
+
+ The "program" and "setting" lines must be identical in every file.
+ (A "weights" setting is either False, if no weights were used, or the
+  SHA-256 hash of the weights file.  See WeightsDigest() in chain_weights.py.)
+ "shards" lists the shards which were added together to make the file.
+ Every other line contains some keys (2 in this example), followed by one
+ or more numbers.  Lines with the same keys (in different files) are added.
+ Integers (such as counts) are added exactly.  Weighted counts are stored
+ exactly as fractions (for example "3/2", see Exact()), so they are also
+ added exactly, and the result is the same as if the program had read all of
+ the files at once.  Other floating point numbers are printed with enough
+ digits to be read back exactly, and added using math.fsum() (so that the
+ result does not depend on the order of the files).
+ It is an error to add the same shard twice.  (If any shards are missing,
+ this program prints a warning, and the "-reduce" argument fails.)
+"""
+
+import sys
+import math
+from fractions import Fraction
+# Sometimes this program pipes its output to other programs which halt early.
+# Below we silently suppress the ugly "Broken pipe" message this generates:
+import signal
+signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+
+g_program_name = __file__.split('/')[-1]
+g_date_str     = '2026-10-19'
+g_version_str  = '0.1.0'
+
+
+
+def Exact(x):
+    """
+    Convert a number (such as a weight) into an int or a Fraction with
+    exactly the same value, so that sums of these numbers are exact
+    (and do not depend on the order in which they are added).
+
+    """
+    if isinstance(x, int):
+        return x
+    x = Fraction(x)
+    if x.denominator == 1:
+        return x.numerator
+    return x
+
+
+
+def Inexact(x):
+    """ Convert a Fraction (see Exact()) back into a floating point number """
+    if isinstance(x, Fraction):
+        return float(x)
+    return x
+
+
+
+def ParseValue(s):
+    try:
+        return int(s)
+    except ValueError:
+        pass
+    if '/' in s:
+        return Fraction(s)
+    return float(s)
+
+
+
+def KeyOrder(key):
+    """ Sort keys numerically (where possible) instead of alphabetically """
+    order = []
+    for token in key:
+        try:
+            order.append((0, float(token), token))
+        except ValueError:
+            order.append((1, 0.0, token))
+    return order
+
+
+
+class Partials(object):
+    """
+    Partials stores partial results:  a list of numbers for each key
+    (a tuple of num_keys strings), along with a description of the program
+    (and settings) which created them, the shards they came from, and the
+    number of files which were read.  Adding two Partials (see Merge()) is
+    exact.  (Incompatible Partials raise a ValueError.)
+
+    """
+
+    def __init__(self, program, settings=None, num_keys=1, shard=None):
+        self.program = program
+        self.settings = []
+        if settings != None:
+            self.settings = [(str(name), str(value)) for name, value in settings]
+        self.num_keys = num_keys
+        if shard == None:
+            shard = (1, 1)
+        self.shards = set([shard[0]])
+        self.num_shards = shard[1]
+        self.num_files = 0
+        self.key2values = {}
+
+    def Add(self, key, values):
+        """
+        Add a list of numbers to the numbers stored for "key".
+        (The numbers added to each key are kept, so that floating point
+         numbers can be added exactly, see Values().)
+
+        """
+        key = tuple([str(k) for k in key])
+        if len(key) != self.num_keys:
+            raise ValueError('Expected '+str(self.num_keys)+' keys, not '+str(len(key)))
+        if key not in self.key2values:
+            self.key2values[key] = [[] for x in values]
+        columns = self.key2values[key]
+        if len(columns) != len(values):
+            raise ValueError('Inconsistent number of values for key \"'+' '.join(key)+'\"')
+        for j in range(0, len(values)):
+            columns[j].append(values[j])
+
+    def Values(self, key):
+        """ Return the (total) list of numbers for a key """
+        values = []
+        for column in self.key2values[key]:
+            if all([isinstance(x, int) for x in column]):
+                values.append(sum(column))
+            elif any([isinstance(x, Fraction) for x in column]):
+                values.append(Exact(sum([Exact(x) for x in column])))
+            else:
+                values.append(math.fsum(column))
+        return values
+
+    def Keys(self):
+        return sorted(self.key2values, key=KeyOrder)
+
+    def Setting(self, name):
+        for setting_name, value in self.settings:
+            if setting_name == name:
+                return value
+        return None
+
+    def Merge(self, other):
+        """ Add the numbers from another Partials object to this one """
+        if other.program != self.program:
+            raise ValueError('Partial results from different programs (or versions):\n'
+                             '  \"'+self.program+'\" and \"'+other.program+'\"')
+        if other.settings != self.settings:
+            raise ValueError('Partial results created using different settings:\n'
+                             '  '+str(self.settings)+'\n  '+str(other.settings))
+        if ((other.num_keys != self.num_keys) or
+            (other.num_shards != self.num_shards)):
+            raise ValueError('Partial results with a different number of keys or shards.')
+        duplicates = self.shards & other.shards
+        if len(duplicates) > 0:
+            raise ValueError('Shard '+str(min(duplicates))+'/'+str(self.num_shards)+
+                             ' appears more than once.')
+        self.shards |= other.shards
+        self.num_files += other.num_files
+        for key in other.key2values:
+            self.Add(key, other.Values(key))
+
+    def MissingShards(self):
+        return [k for k in range(1, self.num_shards+1) if k not in self.shards]
+
+    def CheckComplete(self):
+        """ Raise a ValueError if any shards are missing """
+        missing = self.MissingShards()
+        if len(missing) > 0:
+            raise ValueError('Missing shard(s): ' +
+                             ', '.join([str(k)+'/'+str(self.num_shards)
+                                        for k in missing]))
+
+    def Write(self, out_file):
+        out_file.write('# dlpdb partial\n')
+        out_file.write('# program '+self.program+'\n')
+        for name, value in self.settings:
+            out_file.write('# setting '+name+' '+value+'\n')
+        out_file.write('# shards '+','.join([str(k) for k in sorted(self.shards)])+
+                       '/'+str(self.num_shards)+'\n')
+        out_file.write('# files '+str(self.num_files)+'\n')
+        out_file.write('# keys '+str(self.num_keys)+'\n')
+        for key in self.Keys():
+            # (repr() prints floats with enough digits to read them exactly)
+            out_file.write(' '.join(key)+' '+
+                           ' '.join([repr(x) if isinstance(x, float) else str(x)
+                                     for x in self.Values(key)])+'\n')
+
+
+
+def ReadPartials(in_file, file_name='<input>'):
+    """ Read a file created by Partials.Write() (errors raise a ValueError) """
+    program = None
+    settings = []
+    shards = None
+    num_shards = None
+    num_files = 0
+    num_keys = None
+    partials = None
+    line_number = 0
+    for line in in_file:
+        line_number += 1
+        tokens = line.split()
+        if len(tokens) == 0:
+            continue
+        if partials == None:
+            if (tokens[0] != '#') or (len(tokens) < 2):
+                raise ValueError('\"'+file_name+'\" is not a partial results file.\n'
+                                 '  (It should begin with \"# dlpdb partial\".)')
+            if (line_number == 1) and (tokens[1:] != ['dlpdb', 'partial']):
+                raise ValueError('\"'+file_name+'\" is not a partial results file.\n'
+                                 '  (It should begin with \"# dlpdb partial\".)')
+            if tokens[1] == 'program':
+                program = line.split(None, 2)[2].strip()
+            elif (tokens[1] == 'setting') and (len(tokens) >= 3):
+                fields = line.rstrip('\n').split(' ', 3)
+                settings.append((fields[2], fields[3] if len(fields) > 3 else ''))
+            elif (tokens[1] == 'shards') and (len(tokens) == 3):
+                shard_list, num_shards = tokens[2].split('/')
+                shards = set([int(k) for k in shard_list.split(',')])
+                num_shards = int(num_shards)
+            elif (tokens[1] == 'files') and (len(tokens) == 3):
+                num_files = int(tokens[2])
+            elif (tokens[1] == 'keys') and (len(tokens) == 3):
+                num_keys = int(tokens[2])
+                if (program == None) or (shards == None):
+                    raise ValueError('\"'+file_name+'\" is missing the \"program\" or \"shards\" line.')
+                partials = Partials(program, settings, num_keys, (1, num_shards))
+                partials.shards = shards
+                partials.num_files = num_files
+        else:
+            if len(tokens) <= num_keys:
+                raise ValueError('Line '+str(line_number)+' of \"'+file_name+
+                                 '\" contains too few numbers.')
+            try:
+                partials.Add(tokens[0:num_keys],
+                             [ParseValue(x) for x in tokens[num_keys:]])
+            except ValueError as err:
+                raise ValueError('Line '+str(line_number)+' of \"'+file_name+
+                                 '\": '+str(err))
+    if partials == None:
+        raise ValueError('\"'+file_name+'\" is not a partial results file (or is incomplete).')
+    return partials
+
+
+
+def ReducePartials(file_names, program=None):
+    """
+    Read and add together the partial results stored in several files.
+    If "program" is not None, the files must have been created by it.
+
+    """
+    total = None
+    for file_name in file_names:
+        in_file = open(file_name, 'r')
+        partials = ReadPartials(in_file, file_name)
+        in_file.close()
+        if (program != None) and (partials.program != program):
+            raise ValueError('\"'+file_name+'\" was created by \"'+partials.program+'\"\n'
+                             '  (not by \"'+program+'\")')
+        if total == None:
+            total = partials
+        else:
+            total.Merge(partials)
+    if total == None:
+        raise ValueError('Expected the names of one or more partial results files.')
+    return total
+
+
+
+def main():
+    file_names = sys.argv[1:]
+    if len(file_names) == 0:
+        sys.stderr.write('Error: Expected the names of one or more partial results files.\n')
+        exit(-1)
+
+    sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
+
+    try:
+        total = ReducePartials(file_names)
+    except (ValueError, IOError) as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        exit(-1)
+    missing = total.MissingShards()
+    if len(missing) > 0:
+        sys.stderr.write('Warning: '+str(len(missing))+' of '+str(total.num_shards)+
+                         ' shards are missing.\n')
+    total.Write(sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -33,3 +33,29 @@ class ResID:
 
     def __repr__(self):
         return str(self)
+
+    def Pack(self):
+        return PackResID(self.chainID, self.seqNum, self.iCode)
+
+
+
+# Residues are frequently compared and sorted by (chainID, seqNum, iCode).
+# Doing that with ResID objects is slow, so it is sometimes convenient to
+# pack all 3 identifiers into a single integer whose ordering is the same.
+# (SeqNums in PDB files occupy 4 columns, so they lie between -999 and 9999.)
+
+g_seqnum_offset = 1<<15
+g_seqnum_span   = 1<<16
+g_icode_span    = 1<<8
+
+def PackResID(chainID, seqNum, iCode):
+    return (((ord(chainID) * g_seqnum_span) + (seqNum + g_seqnum_offset))
+            * g_icode_span + ord(iCode))
+
+
+def UnpackResID(key):
+    iCode = chr(key % g_icode_span)
+    key //= g_icode_span
+    seqNum = (key % g_seqnum_span) - g_seqnum_offset
+    chainID = chr(key // g_seqnum_span)
+    return ResID(chainID, seqNum, iCode)
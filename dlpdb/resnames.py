@@ -0,0 +1,80 @@
+"""
+The lookup table used to convert between 3-letter residue names (as they
+appear in PDB files) and 1-letter residue codes.  It is shared by
+pdb2sequence.py, pdbs2fasta.py, dssp2pdb.py (and other programs).
+The 20 standard amino-acids, and the DNA and RNA nucleotides are supported.
+
+Each residue name is also assigned a small integer code (its position in the
+"res_names3" list).  Unknown residue names are assigned the code
+"unknown_code", whose 1-letter code is 'x'.  Converting a whole list of
+integer codes into a string of 1-letter codes is done in one step using
+bytes.translate(), which is much faster than looking up one residue at a time.
+(To add additional residue types, add entries to both lists below.)
+"""
+
+
+res_names3 = ['GLY', 'ALA', 'SER', 'CYS', 'VAL',
+              'THR', 'ILE', 'PRO', 'MET', 'ASP',
+              'ASN', 'LEU', 'LYS', 'GLU', 'GLN',
+              'ARG', 'HIS', 'PHE', 'TYR', 'TRP',
+              ' DA', ' DC', ' DG', ' DT',
+              '  A', '  U', '  G', '  C']
+
+res_names1 = ['G', 'A', 'S', 'C', 'V',
+              'T', 'I', 'P', 'M', 'D',
+              'N', 'L', 'K', 'E', 'Q',
+              'R', 'H', 'F', 'Y', 'W',
+              'A', 'C', 'G', 'T',
+              'A', 'U', 'G', 'C']
+
+unknown_letter = 'x'   # the character used for unknown/non-standard residues
+unknown_code = len(res_names3)
+
+# the number of standard amino acids (the first 20 entries in res_names3)
+num_amino_acids = 20
+
+resname2code = dict([(res_names3[i], i) for i in range(0, len(res_names3))])
+
+aa_letter2name = dict([(res_names1[i], res_names3[i])
+                       for i in range(0, num_amino_acids)])
+
+# A 256-byte table used by bytes.translate() to convert codes into letters
+_code2letter_table = bytearray(unknown_letter.encode() * 256)
+for _i in range(0, len(res_names1)):
+    _code2letter_table[_i] = ord(res_names1[_i])
+_code2letter_table = bytes(_code2letter_table)
+
+
+
+def ResName2Code(res_name3):
+    return resname2code.get(res_name3, unknown_code)
+
+
+
+def Codes2Sequence(codes):
+    """
+    Convert a list (or bytes, or array) of integer residue codes into
+    a string of 1-letter codes.
+
+    """
+    return bytes(bytearray(codes)).translate(_code2letter_table).decode()
+
+
+
+def ResNames2Sequence(res_names):
+    """
+    Convert a list of 3-letter residue names into a string of 1-letter codes.
+
+    """
+    return Codes2Sequence([resname2code.get(name, unknown_code)
+                           for name in res_names])
+
+
+
+def AminoAcid1to3(c):
+    """
+    Convert a 1-letter amino acid code into a 3-letter residue name.
+    (Unrecognized letters are repeated 3 times.  For example 'X' -> 'XXX')
+
+    """
+    return aa_letter2name.get(c, c+c+c)
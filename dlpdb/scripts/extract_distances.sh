@@ -7,6 +7,15 @@ then
    EXTRACTCOORDS="pdb2coords.py -blank"
 fi
 
+# (If the SELECT environment variable is set, only the atoms which it
+#  selects are used, eg. SELECT="chain A and b < 40".  See select_atoms.py)
+if [ -n "${SELECT}" ]
+then
+   # (The name of the variable is used, not its value, so that "eval"
+   #  expands it as a single word, instead of running its contents.)
+   EXTRACTCOORDS="${EXTRACTCOORDS} -select \"\${SELECT}\""
+fi
+
 while read pdb_file_name; do
     echo "${0##*/} processing $pdb_file_name" >&2
     print_coords_command="${EXTRACTCOORDS} ${ATOM_SELECTION} < $pdb_file_name"
@@ -4,21 +4,48 @@ ATOM_SELECTION="$@"
 
 if [ -z "${EXTRACTCOORDS}" ]
 then
-   EXTRACTCOORDS="pdb2coords.py ${ATOM_SELECTION} -blank"
+   EXTRACTCOORDS="pdb2coords.py -blank"
+fi
+
+# (If the SELECT environment variable is set, only the atoms which it
+#  selects are used, eg. SELECT="chain A and b < 40".  See select_atoms.py)
+if [ -n "${SELECT}" ]
+then
+   # (The name of the variable is used, not its value, so that "eval"
+   #  expands it as a single word, instead of running its contents.)
+   EXTRACTCOORDS="${EXTRACTCOORDS} -select \"\${SELECT}\""
 fi
 
 
+# (Each run uses its own temporary directory, so it is safe to run
+#  several of these scripts in the same directory at the same time.)
+TMP_DIR=`mktemp -d`
+# (Delete it when this script exits, even if it is interrupted or terminated)
+trap 'rm -rf "$TMP_DIR"' EXIT
+trap 'exit 1' HUP INT TERM
+
+exit_status=0
 while read pdb_file_name; do
     #echo "pdb_file = \"${pdb_file_name}\""
     echo "${0##*/} processing $pdb_file_name" >&2
-    pdb2helix.py < "$pdb_file_name" > helix_intervals_angles.tmp
-    while read interval; do
-        command="select_interval.py $interval < \"$pdb_file_name\" | ${EXTRACTCOORDS} | coords2angles.py | tr \"\n\" \" \""
+    pdb2helix.py < "$pdb_file_name" > "$TMP_DIR/intervals.txt"
+    # Extract all of the intervals from the PDB file in a single pass:
+    if ! select_interval.py -intervals "$TMP_DIR/intervals.txt" -out "$TMP_DIR/interval" < "$pdb_file_name"
+    then
+        # (Skip this file, rather than printing blank rows for it)
+        echo "Error: select_interval.py failed on \"$pdb_file_name\" (skipping it)" >&2
+        rm -f "$TMP_DIR"/interval_*.pdb
+        exit_status=1
+        continue
+    fi
+    n=1
+    while [ -f "$TMP_DIR/interval_$n.pdb" ]; do
+        command="${EXTRACTCOORDS} ${ATOM_SELECTION} < \"$TMP_DIR/interval_$n.pdb\" | coords2angles.py | tr \"\n\" \" \""
         #echo "${command}"
         eval "$command"
 	echo ""
-    done < helix_intervals_angles.tmp
+        rm -f "$TMP_DIR/interval_$n.pdb"
+        n=`expr $n + 1`
+    done
 done
-
-rm -f helix_intervals_angles.tmp
-
+exit $exit_status
@@ -5,17 +5,44 @@ then
    EXTRACTCOORDS="pdb2coords_ave.py"
 fi
 
+# (If the SELECT environment variable is set, only the atoms which it
+#  selects are used, eg. SELECT="chain A and b < 40".  See select_atoms.py)
+if [ -n "${SELECT}" ]
+then
+   # (The name of the variable is used, not its value, so that "eval"
+   #  expands it as a single word, instead of running its contents.)
+   EXTRACTCOORDS="${EXTRACTCOORDS} -select \"\${SELECT}\""
+fi
+
+# (Each run uses its own temporary directory, so it is safe to run
+#  several of these scripts in the same directory at the same time.)
+TMP_DIR=`mktemp -d`
+# (Delete it when this script exits, even if it is interrupted or terminated)
+trap 'rm -rf "$TMP_DIR"' EXIT
+trap 'exit 1' HUP INT TERM
+
+exit_status=0
 while read pdb_file_name; do
     #echo "pdb_file = \"${pdb_file_name}\""
     echo "${0##*/} processing $pdb_file_name" >&2
-    pdb2helix.py < "$pdb_file_name" > helix_intervals_resAveDistances.tmp
-    while read interval; do
-	command="select_interval.py $interval < $pdb_file_name | ${EXTRACTCOORDS} | awk 'BEGIN{pNF=0} {if (NF==3) {if (pNF==3) {print px\" \"py\" \"pz\"  \"\$1\" \"\$2\" \"\$3} px=\$1; py=\$2; pz=\$3} pNF=NF}' | coords2distances.py | tr \"\n\" \" \""
+    pdb2helix.py < "$pdb_file_name" > "$TMP_DIR/intervals.txt"
+    # Extract all of the intervals from the PDB file in a single pass:
+    if ! select_interval.py -intervals "$TMP_DIR/intervals.txt" -out "$TMP_DIR/interval" < "$pdb_file_name"
+    then
+        # (Skip this file, rather than printing blank rows for it)
+        echo "Error: select_interval.py failed on \"$pdb_file_name\" (skipping it)" >&2
+        rm -f "$TMP_DIR"/interval_*.pdb
+        exit_status=1
+        continue
+    fi
+    n=1
+    while [ -f "$TMP_DIR/interval_$n.pdb" ]; do
+	command="${EXTRACTCOORDS} < \"$TMP_DIR/interval_$n.pdb\" | awk 'BEGIN{pNF=0} {if (NF==3) {if (pNF==3) {print px\" \"py\" \"pz\"  \"\$1\" \"\$2\" \"\$3} px=\$1; py=\$2; pz=\$3} pNF=NF}' | coords2distances.py | tr \"\n\" \" \""
         #echo "$command"
         eval $command
 	echo ""
-    done < helix_intervals_resAveDistances.tmp
+        rm -f "$TMP_DIR/interval_$n.pdb"
+        n=`expr $n + 1`
+    done
 done
-
-rm -f helix_intervals_resAveDistances.tmp
-
+exit $exit_status
@@ -5,10 +5,19 @@ then
    EXTRACTCOORDS="pdb2coords_ave.py"
 fi
 
+# (If the SELECT environment variable is set, only the atoms which it
+#  selects are used, eg. SELECT="chain A and b < 40".  See select_atoms.py)
+if [ -n "${SELECT}" ]
+then
+   # (The name of the variable is used, not its value, so that "eval"
+   #  expands it as a single word, instead of running its contents.)
+   EXTRACTCOORDS="${EXTRACTCOORDS} -select \"\${SELECT}\""
+fi
+
 
 while read pdb_file_name; do
     echo "${0##*/} processing $pdb_file_name" >&2
-    "${EXTRACTCOORDS}" < "$pdb_file_name" | awk 'BEGIN{pNF=0} {if (NF==3) {if (pNF==3) {print px" "py" "pz"  "$1" "$2" "$3} px=$1; py=$2; pz=$3} pNF=NF}' | coords2distances.py | tr "\n" " "
+    eval "${EXTRACTCOORDS}" < "$pdb_file_name" | awk 'BEGIN{pNF=0} {if (NF==3) {if (pNF==3) {print px" "py" "pz"  "$1" "$2" "$3} px=$1; py=$2; pz=$3} pNF=NF}' | coords2distances.py | tr "\n" " "
     # You can pipe the results to  sed -e 's/\s\+/\n/g' to put on separate lines
     echo ""
 done
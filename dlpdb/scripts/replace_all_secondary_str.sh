@@ -12,6 +12,15 @@
 #  
 #  ls -f1 *.pdb | replace_all_secondary_str.sh 
 
+# (Each run uses its own temporary directory, so it is safe to run
+#  several of these scripts in the same directory at the same time.
+#  Each new PDB file is written to a temporary file and then renamed,
+#  so an interrupted run never leaves a partially written PDB file.)
+TMP_DIR=`mktemp -d`
+# (Delete it when this script exits, even if it is interrupted or terminated)
+trap 'rm -rf "$TMP_DIR"; rm -f "${filenoext}+helixsheet.pdb.tmp$$"' EXIT
+trap 'exit 1' HUP INT TERM
+
 while read file_pdb; do
     filenoext="${file_pdb%.pdb}"
     pdb_code=`echo "$file_pdb" | awk '{print substr($0,0,4)}'`
@@ -21,14 +30,13 @@ while read file_pdb; do
 
     if has_secondary_str.py < $file_pdb; then
         echo "$filenoext.pdb has helix/sheet info"
-        dssp2pdb.py "${file_pdb}" < "${file_dssp}" > helix_sheet.pdb.tmp
-        strip_secondary_str.py < "${file_pdb}" > pdb_wo_helix_sheet.tmp
-        cat pdb_wo_helix_sheet.tmp helix_sheet.pdb.tmp > "${filenoext}+helixsheet.pdb"
-        rm -f pdb_wo_helix_sheet.tmp helix_sheet.pdb.tmp 
+        dssp2pdb.py "${file_pdb}" < "${file_dssp}" > "$TMP_DIR/helix_sheet.pdb"
+        strip_secondary_str.py < "${file_pdb}" > "$TMP_DIR/pdb_wo_helix_sheet.pdb"
+        cat "$TMP_DIR/pdb_wo_helix_sheet.pdb" "$TMP_DIR/helix_sheet.pdb" > "${filenoext}+helixsheet.pdb.tmp$$"
     else
         echo "${file_pdb} is missing helix/sheet info"
-        dssp2pdb.py "${file_pdb}" < "${file_dssp}" > helix_sheet.pdb.tmp
-        cat "${file_pdb}" helix_sheet.pdb.tmp > "${filenoext}+helixsheet.pdb"
-        rm -f helix_sheet.pdb.tmp
+        dssp2pdb.py "${file_pdb}" < "${file_dssp}" > "$TMP_DIR/helix_sheet.pdb"
+        cat "${file_pdb}" "$TMP_DIR/helix_sheet.pdb" > "${filenoext}+helixsheet.pdb.tmp$$"
     fi
+    mv -f "${filenoext}+helixsheet.pdb.tmp$$" "${filenoext}+helixsheet.pdb"
 done
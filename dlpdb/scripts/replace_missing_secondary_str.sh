@@ -12,6 +12,15 @@
 #  
 #  ls -f1 *.pdb | replace_missing_secondary_str.sh 
 
+# (Each run uses its own temporary directory, so it is safe to run
+#  several of these scripts in the same directory at the same time.
+#  Each new PDB file is written to a temporary file and then renamed,
+#  so an interrupted run never leaves a partially written PDB file.)
+TMP_DIR=`mktemp -d`
+# (Delete it when this script exits, even if it is interrupted or terminated)
+trap 'rm -rf "$TMP_DIR"; rm -f "${filenoext}+helixsheet.pdb.tmp$$"' EXIT
+trap 'exit 1' HUP INT TERM
+
 while read file_pdb; do
     filenoext="${file_pdb%.pdb}"
     pdb_code=`echo "$file_pdb" | awk '{print substr($0,0,4)}'`
@@ -23,8 +32,8 @@ while read file_pdb; do
         echo "${file_pdb} has helix/sheet info" >&2
     else
         echo "${file_pdb} is missing helix/sheet info" >&2
-        dssp2pdb.py "${file_pdb}" < "${file_dssp}" > helix_sheet.pdb.tmp
-        cat "${file_pdb}" helix_sheet.pdb.tmp > "${filenoext}+helixsheet.pdb"
-        rm -f helix_sheet.pdb.tmp
+        dssp2pdb.py "${file_pdb}" < "${file_dssp}" > "$TMP_DIR/helix_sheet.pdb"
+        cat "${file_pdb}" "$TMP_DIR/helix_sheet.pdb" > "${filenoext}+helixsheet.pdb.tmp$$"
+        mv -f "${filenoext}+helixsheet.pdb.tmp$$" "${filenoext}+helixsheet.pdb"
     fi
 done
@@ -0,0 +1,357 @@
+#!/usr/bin/env python
+
+"""
+ Typical usage:
+
+    select_atoms.py "resname LEU,ILE,VAL and not name N,C,O" < 1abc.pdb > out.pdb
+
+    pdb2coords.py -select "chain A and ss H" " CA " < 1abc.pdb
+
+ This program reads a PDB file and prints it, omitting the ATOM records of
+ the atoms which are not selected (as well as their ANISOU, SIGATM, and
+ SIGUIJ records).  All other lines are printed unchanged.  HETATM records
+ are omitted, unless the selection refers to them explicitly (see "hetatm").
+
+ The same selections can be passed to pdb2coords.py, pdb2coords_ave.py,
+ pdb2gyration.py, pdbs2rama.py, pdbs2table.py, and pdbs2db.py using the
+ "-select" argument, and to the extract_*.sh scripts using the SELECT
+ environment variable (eg. SELECT="chain A" extract_angles.sh ...).
+ (Selections are usually enclosed in quotes when passed to the shell.)
+ The coords2*.py programs read coordinates (not PDB files), so the atoms
+ they use are selected by the program which printed those coordinates.
+
+ Selections are built from these terms:
+
+   all                      every atom
+   resname ALA,GLY          residues whose names are in the list
+   name CA,CB,C*,H?         atoms whose names are in the list (spaces are
+                            removed from names, so " CA " is written CA).
+                            The wildcards "*" and "?" are allowed.
+   chain A,B                residues whose chainIDs are in the list
+                            (use "_" for a blank chainID)
+   ss H,E,T,-               residues whose secondary structure (from the
+                            HELIX, SHEET, and TURN records) is in the list.
+                            (The labels are the same as in pdb2ss.py.)
+   hetatm                   atoms from HETATM records
+   b < 30                   atoms whose temperature (B) factor is below 30
+                            (the comparisons <, <=, >, >=, ==, != are allowed)
+   occupancy >= 0.5         atoms whose occupancy is at least 0.5
+
+ These terms can be combined using "and", "or", "not", and parentheses.
+ ("and" takes precedence over "or".)  Lists must not contain spaces.
+ For example:
+
+   "(resname LYS,ARG and name NZ,NH*) or (hetatm and resname HOH and b < 40)"
+
+ -----------------------------------------------------------------------
+
+ A selection is parsed (and compiled into a python function) only once.
+ The ATOM records from a PDB file are then split into columns (one list
+ for each property which the selection uses), and the selection is evaluated
+ for every atom at once, creating a list of True/False values (a "mask").
+ Atoms which are not selected are discarded before they reach the program
+ which uses them, so they cost almost nothing.
+"""
+
+import sys
+import re
+import math
+from fnmatch import translate
+# Sometimes this program pipes its output to other programs which stops reading
+# the PDB file prematurely (such as when multiple MODEL records are present).
+# Below we silently suppress the ugly "Broken pipe" message this generates:
+import signal
+signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+try:
+    from .resid import PackResID
+    from .pdb2ss import SSIndex, ParseSSRecord
+except ImportError:
+    from resid import PackResID
+    from pdb2ss import SSIndex, ParseSSRecord
+
+
+g_program_name = __file__.split('/')[-1]
+g_date_str     = '2026-10-19'
+g_version_str  = '0.1.0'
+
+
+# The terms which are followed by a list, and the column each one tests:
+list_keywords = {'resname':'resname', 'name':'name', 'chain':'chain', 'ss':'ss'}
+# The terms which are followed by a comparison, and the column each one tests:
+number_keywords = {'b':'b', 'occupancy':'occupancy'}
+comparisons = set(['<', '<=', '>', '>=', '==', '!='])
+
+# Records describing individual atoms:
+atom_records = set(['ATOM  ', 'HETATM'])
+atom_detail_records = set(['ANISOU', 'SIGATM', 'SIGUIJ'])
+
+_token_pattern = re.compile(r'\(|\)|<=|>=|==|!=|<|>|[^\s()<>=!]+')
+
+
+
+def TokenizeSelection(text):
+    """ Split a selection into a list of words, parentheses, and comparisons """
+    tokens = _token_pattern.findall(text)
+    if ''.join(tokens) != ''.join(text.split()):
+        raise ValueError('Invalid selection: \"'+text+'\"\n'
+                         '  (Unexpected character.)')
+    return tokens
+
+
+
+class AtomSelection(object):
+    """
+    AtomSelection parses a selection (see above) and compiles it into a
+    function which accepts the columns of a list of atoms and returns a mask
+    (a list of True/False values, one per atom).  Invalid selections raise
+    a ValueError.
+
+    self.columns is the list of columns needed to evaluate the selection
+    (some of: 'record', 'name', 'resname', 'chain', 'ss', 'b', 'occupancy').
+
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = TokenizeSelection(text)
+        self.pos = 0
+        self.constants = {}
+        self.columns = []
+        if len(self.tokens) == 0:
+            raise ValueError('Empty selection.')
+        source = self._ParseOr()
+        if self.pos != len(self.tokens):
+            self._Error('Unexpected \"'+self.tokens[self.pos]+'\"')
+        if len(self.columns) == 0:
+            self.columns.append('record')  # (every mask needs a length)
+        arguments = ', '.join(['_col_'+c for c in self.columns])
+        if len(self.columns) == 1:
+            loop = self.columns[0] + ' in ' + arguments
+        else:
+            loop = ', '.join(self.columns) + ' in zip(' + arguments + ')'
+        self.source = 'lambda ' + arguments + ': [' + source + ' for ' + loop + ']'
+        self.function = eval(compile(self.source, '<selection>', 'eval'),
+                             self.constants)
+
+    def __reduce__(self):
+        # (The compiled function can not be pickled, so other processes
+        #  receive the text of the selection, and compile it themselves.)
+        return (AtomSelection, (self.text,))
+
+    def __repr__(self):
+        return 'AtomSelection('+repr(self.text)+')'
+
+    def Mask(self, columns):
+        """
+        Return a list of True/False values (one per atom).  "columns" is a
+        dictionary containing a list for each name in self.columns.
+
+        """
+        return self.function(*[columns[c] for c in self.columns])
+
+    def UsesHetatm(self):
+        """ Does the selection refer to HETATM records? """
+        return 'hetatm' in self.tokens
+
+    def _Error(self, message):
+        raise ValueError('Invalid selection: \"'+self.text+'\"\n'
+                         '  ('+message+')')
+
+    def _Next(self):
+        if self.pos >= len(self.tokens):
+            self._Error('Unexpected end of selection')
+        self.pos += 1
+        return self.tokens[self.pos-1]
+
+    def _Peek(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return None
+
+    def _Column(self, column):
+        if column not in self.columns:
+            self.columns.append(column)
+        return column
+
+    def _Constant(self, value):
+        name = '_c'+str(len(self.constants))
+        self.constants[name] = value
+        return name
+
+    def _ParseOr(self):
+        terms = [self._ParseAnd()]
+        while self._Peek() == 'or':
+            self.pos += 1
+            terms.append(self._ParseAnd())
+        if len(terms) == 1:
+            return terms[0]
+        return '(' + ' or '.join(terms) + ')'
+
+    def _ParseAnd(self):
+        terms = [self._ParseNot()]
+        while self._Peek() == 'and':
+            self.pos += 1
+            terms.append(self._ParseNot())
+        if len(terms) == 1:
+            return terms[0]
+        return '(' + ' and '.join(terms) + ')'
+
+    def _ParseNot(self):
+        if self._Peek() == 'not':
+            self.pos += 1
+            return '(not ' + self._ParseNot() + ')'
+        return self._ParseTerm()
+
+    def _ParseTerm(self):
+        token = self._Next()
+        if token == '(':
+            source = self._ParseOr()
+            if self._Next() != ')':
+                self._Error('Expected \")\"')
+            return source
+        elif token == 'all':
+            return 'True'
+        elif token == 'hetatm':
+            return '(' + self._Column('record') + ' == \"HETATM\")'
+        elif token in list_keywords:
+            column = self._Column(list_keywords[token])
+            items = self._Next()
+            if items in ('(', ')', 'and', 'or', 'not') or items in comparisons:
+                self._Error('Expected a list after \"'+token+'\"')
+            items = [item.replace('_', ' ') if column == 'chain' else item
+                     for item in items.split(',') if item != '']
+            names = set([item for item in items if not re.search(r'[*?\[]', item)])
+            patterns = [item for item in items if re.search(r'[*?\[]', item)]
+            tests = []
+            if len(names) > 0:
+                tests.append(column + ' in ' + self._Constant(names))
+            if len(patterns) > 0:
+                regex = re.compile('|'.join([translate(p) for p in patterns]))
+                tests.append(self._Constant(regex.match) + '(' + column + ')')
+            if len(tests) == 0:
+                self._Error('Expected a list after \"'+token+'\"')
+            return '(' + ' or '.join(tests) + ')'
+        elif token in number_keywords:
+            column = self._Column(number_keywords[token])
+            op = self._Next()
+            if op not in comparisons:
+                self._Error('Expected a comparison after \"'+token+'\"')
+            try:
+                value = float(self._Next())
+            except ValueError:
+                self._Error('Expected a number after \"'+token+' '+op+'\"')
+            if not math.isfinite(value):
+                self._Error('Expected a finite number after \"'+token+' '+op+'\"')
+            return '(' + column + ' ' + op + ' ' + self._Constant(value) + ')'
+        self._Error('Unexpected \"'+token+'\"')
+
+
+
+def AtomColumns(lines, columns, ss_index=None):
+    """
+    Split the atom records (ATOM or HETATM) in a list of lines into
+    columns.  Returns a dictionary containing a list for each of the
+    requested columns (one entry per atom record).  The "ss" column requires
+    an SSIndex (see pdb2ss.py).
+
+    """
+    result = {}
+    for column in columns:
+        if column == 'record':
+            result[column] = [line[0:6] for line in lines]
+        elif column == 'name':
+            result[column] = [line[12:16].replace(' ', '') for line in lines]
+        elif column == 'resname':
+            result[column] = [line[17:20].strip() for line in lines]
+        elif column == 'chain':
+            result[column] = [line[21:22] for line in lines]
+        elif column == 'ss':
+            key2label = {}
+            labels = []
+            for line in lines:
+                key = PackResID(line[21:22], int(line[22:26]), line[26:27])
+                if key not in key2label:
+                    key2label[key] = ss_index.Label(key)
+                labels.append(key2label[key])
+            result[column] = labels
+        elif column == 'occupancy':
+            result[column] = [ParseNumber(line[54:60]) for line in lines]
+        elif column == 'b':
+            result[column] = [ParseNumber(line[60:66]) for line in lines]
+    return result
+
+
+
+def ParseNumber(s):
+    """ Missing numbers are treated as 0 """
+    s = s.strip()
+    if s == '':
+        return 0.0
+    return float(s)
+
+
+
+def SelectAtoms(lines, selection):
+    """
+    SelectAtoms() reads the lines of a PDB file (all of them, since the
+    HELIX, SHEET, and TURN records may be needed) and returns a list of the
+    lines which remain after discarding the atoms which were not selected.
+    (The ANISOU, SIGATM, and SIGUIJ records following an atom are kept or
+     discarded along with it.  HETATM records are discarded unless the
+     selection refers to "hetatm".)
+
+    """
+    lines = list(lines)
+    records = set(['ATOM  '])
+    if selection.UsesHetatm():
+        records.add('HETATM')
+
+    ss_index = None
+    if 'ss' in selection.columns:
+        ss_index = SSIndex([ParseSSRecord(line) for line in lines
+                            if line[0:6] in ('HELIX ', 'SHEET ', 'TURN  ')])
+
+    atom_lines = [line for line in lines if line[0:6] in records]
+    mask = selection.Mask(AtomColumns(atom_lines, selection.columns, ss_index))
+
+    selected = []
+    n = 0
+    keep = True
+    for line in lines:
+        line_type = line[0:6]
+        if line_type in records:
+            keep = mask[n]
+            n += 1
+            if keep:
+                selected.append(line)
+        elif line_type in atom_records:
+            keep = False
+        elif line_type in atom_detail_records:
+            if keep:
+                selected.append(line)
+        else:
+            selected.append(line)
+    return selected
+
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.stderr.write('Error: This program requires 1 argument (a selection).\n'
+                         '       (Note: PDB files are read from the standard input.)\n')
+        exit(-1)
+
+    sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
+
+    try:
+        selection = AtomSelection(sys.argv[1])
+    except ValueError as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        exit(-1)
+
+    sys.stdout.write(''.join(SelectAtoms(sys.stdin, selection)))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,16 +8,24 @@ PDB-files lacking DNA residues will be ignored.
 The files which are created will match the name of the original file, with
 the .pdb or .PDB extension stripped off (if present), and replaced with 
 _?.pdb,  Where "?" is the chain letter.
+The files are processed in parallel.  (Use "-np N" to limit the number of
+processes to N.  By default, one process per CPU is used.)
 """
 
 import sys
+import os
+
+try:
+    from .batch import MapFiles
+except ImportError:
+    from batch import MapFiles
 
 g_program_name  = __file__.split('/')[-1]
-g_date_str     = '2015-8-17'
-g_version_str  = '0.5.0'
+g_date_str     = '2026-10-19'
+g_version_str  = '0.6.1'
 
 
-usage_string = "Usage:\n\n  "+g_program_name+" file1.pdb [file2.pdb file3.pdb ...]\n\n"
+usage_string = "Usage:\n\n  "+g_program_name+" [-np N] file1.pdb [file2.pdb file3.pdb ...]\n\n"
 
 usage_string += \
 """
@@ -46,59 +54,80 @@ heavy_atoms = (' C1\'',
                ' OP2')
 
 
+def ChainFileName(file_name, chainID):
+    """
+    Choose a name for the new PDB file (containing a single chain)
+    which is similar to the name of the original PDB file.
+
+    """
+    pdb_file_chain_name = file_name
+    i = pdb_file_chain_name.lower().rfind('.pdb')
+    if i != -1:
+        pdb_file_chain_name = (pdb_file_chain_name[:i] +
+                               '_' + chainID +
+                               pdb_file_chain_name[i:])
+    else:
+        pdb_file_chain_name = file_name + '_' + chainID
+    return pdb_file_chain_name
+
+
+
 def ExtractChainText(file_name):
     """
     ExtractChainText() finds all of the chains in a PDB file which contain DNA
     nucleotides and creates a new PDB file for that chain with a similar name.
+    The text from each chain is written to a temporary file as it is read,
+    so the PDB file is never stored in memory.  Once the entire file has been
+    read, the temporary files for chains containing DNA are renamed, and the
+    others are deleted.  Returns a list of messages (one per new file).
 
     """
 
     pdb_file = open(file_name, 'r')
 
-    chain_atoms_found = {}
-    chain_text = {}
-
-    for line in pdb_file:
-        if line[0:6] == 'ATOM  ':
-            chainID = line[21:22]
-            if (not chainID in chain_atoms_found):
-                chain_atoms_found[chainID] = {}
-                chain_text[chainID] = []
-                for atom_name in heavy_atoms:
-                    chain_atoms_found[chainID][atom_name] = False
-
-            chain_text[chainID].append(line)
-
-            atom_type = line[12:16]
-            res_type = line[17:20]
-            if res_type in res_types:
-                #if ((atom_type in atoms_found) and (not atoms_found[atom_type])):
-                #    print('found atom_type=\"'+atom_type+'\", in res_type=\"'+res_type+'\"')
-                chain_atoms_found[chainID][atom_type] = True
-
-
-    for chainID in chain_atoms_found:
-        search_criteria_satisfied = True
-        for atom_type in chain_atoms_found[chainID]:
-            if (not chain_atoms_found[chainID][atom_type]):
-                search_criteria_satisfied = False
-        if search_criteria_satisfied:
-            sys.stderr.write("  Chain \""+chainID+"\" contains DNA.\n")
-            # Then create a new PDB file with a name similar to the original:
-            pdb_file_chain_name = file_name
-            i = pdb_file_chain_name.lower().rfind('.pdb')
-            if i != -1:
-                pdb_file_chain_name = (pdb_file_chain_name[:i] +
-                                       '_' + chainID +
-                                       pdb_file_chain_name[i:])
+    chain_atoms_missing = {}
+    chain_files = {}
+    chain_tmp_names = {}
+    messages = []
+    completed = False
+
+    try:
+        for line in pdb_file:
+            if line[0:6] == 'ATOM  ':
+                chainID = line[21:22]
+                if (not chainID in chain_atoms_missing):
+                    chain_atoms_missing[chainID] = set(heavy_atoms)
+                    # (The temporary file is created using open(), so that
+                    #  its permissions respect the umask, like the old files.)
+                    tmp_name = (ChainFileName(file_name, chainID) +
+                                '.tmp' + str(os.getpid()))
+                    chain_files[chainID] = open(tmp_name, 'w')
+                    chain_tmp_names[chainID] = tmp_name
+
+                chain_files[chainID].write(line)
+
+                atom_type = line[12:16]
+                res_type = line[17:20]
+                if res_type in res_types:
+                    chain_atoms_missing[chainID].discard(atom_type)
+        completed = True
+    finally:
+        pdb_file.close()
+        for chainID in chain_files:
+            chain_files[chainID].close()
+        # Now decide which of the temporary files to keep
+        for chainID in chain_tmp_names:
+            tmp_name = chain_tmp_names[chainID]
+            if completed and (len(chain_atoms_missing[chainID]) == 0):
+                # Then create a new PDB file with a name similar to the original:
+                pdb_file_chain_name = ChainFileName(file_name, chainID)
+                os.rename(tmp_name, pdb_file_chain_name)
+                messages.append("  Chain \""+chainID+"\" contains DNA.\n"
+                                "    Creating file \""+pdb_file_chain_name+"\"\n")
             else:
-                pdb_file_chain_name = file_name + '_' + chainID
-            sys.stderr.write('    Creating file \"'+pdb_file_chain_name+'\"\n')
-            pdb_file_chain = open(pdb_file_chain_name, 'w')
-            pdb_file_chain.write(''.join(chain_text[chainID]))
-            pdb_file_chain.close()
+                os.remove(tmp_name)
 
-    pdb_file.close()
+    return messages
 
 
 
@@ -110,9 +139,27 @@ def main():
 
     sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
 
-    for file_name in sys.argv[1:]:
+    num_procs = None
+    file_names = []
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] == '-np':
+            if i+1 >= len(sys.argv):
+                sys.stderr.write('Error: The -np argument should be followed by another argument.\n')
+                exit(-1)
+            num_procs = int(sys.argv[i+1])
+            i += 2
+        else:
+            file_names.append(sys.argv[i])
+            i += 1
+
+    # The files are processed in parallel
+    for file_name, messages in zip(file_names,
+                                   MapFiles(ExtractChainText,
+                                            file_names,
+                                            num_procs)):
         sys.stderr.write('  Reading file \"'+file_name+'\"\n')
-        ExtractChainText(file_name)
+        sys.stderr.write(''.join(messages))
 
 if __name__ == "__main__":
     main()
@@ -22,12 +22,34 @@ identifiers:
              For the record, I hate this file format.)
 
 All 3 identifiers are needed for both the starting and ending residues.
-Consequently this program expects 6 arguments: 
+Consequently this program expects 6 arguments:
    (to be read from the command line)
 ChainID_first SeqNum_first ICode_first ChainID_last SeqNum_last ICode_last
+
+   --- Selecting many intervals at once ---
+
+select_interval.py -intervals intervals.txt [-out PREFIX] < 1abc.pdb
+
+Alternately, you can supply a file containing a list of intervals
+(one interval per line, using the same 6 identifiers described above).
+The output of pdb2helix.py, pdb2sheet.py, pdb2turn.py, and
+"pdb2ss.py -intervals" can be used for this purpose:
+
+pdb2helix.py < 1abc.pdb > helix_intervals.txt
+select_interval.py -intervals helix_intervals.txt < 1abc.pdb
+
+In this case, the PDB file is only read once, and each line is sent to
+every interval which contains it.  By default, the excerpts for each interval
+are printed to the standard output (in the order the intervals were listed),
+separated by blank lines.  If the "-out PREFIX" argument is supplied, then
+each excerpt is written to a separate file instead, named PREFIX_1.pdb,
+PREFIX_2.pdb, PREFIX_3.pdb, ...
+(Unless there is only one interval, the excerpts are stored in memory until
+ the entire PDB file has been read, and then written one file at a time.)
 """
 
 import sys
+import shlex
 # Sometimes this program pipes its output to other programs which stops reading
 # the PDB file prematurely (such as when multiple MODEL records are present).
 # Below we silently suppress the ugly "Broken pipe" message this generates:
@@ -36,27 +58,65 @@ signal.signal(signal.SIGPIPE, signal.SIG_DFL)
 
 try:
     from .resid import *
+    from .pdb2ss import SSInterval, SSIndex, ParseSSRecord
 except ImportError:
     from resid import *
-
-
-def main():
-    if len(sys.argv) != 7:
-        sys.stderr.write("Error: This program requires 6 arguments.\n"
-                         "       This program requires a pair of residues to designate the first and\n"
-                         "       last members of the interval.  Each residue requires 3 identifiers.\n"
-                         "       Consequently the six arguments needed are:\n"
-                         "ChainID_first SeqNum_first ICode_first ChainID_last SeqNum_last ICode_last\n")
-        exit(-1)
-
-    print('\"'+sys.argv[1] + '\" \"' + sys.argv[2] + '\" \"'+ sys.argv[3]+'\"')
-    first = ResID(sys.argv[1], int(sys.argv[2]), sys.argv[3])
-    last  = ResID(sys.argv[4], int(sys.argv[5]), sys.argv[6])
-
-    for line in sys.stdin:
+    from pdb2ss import SSInterval, SSIndex, ParseSSRecord
+
+
+def ReadIntervals(file_name):
+    """
+    ReadIntervals() reads a file containing a list of intervals
+    (in the format printed by pdb2helix.py, or by "pdb2ss.py -intervals")
+    and returns a list of SSInterval objects.
+
+    """
+    intervals = []
+    f = open(file_name, 'r')
+    for line in f:
+        tokens = shlex.split(line)
+        if len(tokens) == 0:
+            continue
+        ss_type = None
+        if tokens[0] in ('HELIX', 'SHEET', 'TURN'):
+            ss_type = tokens[0]
+            tokens = tokens[1:]
+        if len(tokens) != 6:
+            sys.stderr.write("Error: Each line of file \""+file_name+"\" should contain 6 identifiers:\n"
+                             "ChainID_first SeqNum_first ICode_first ChainID_last SeqNum_last ICode_last\n"
+                             "Offending line:\n"+line)
+            exit(-1)
+        first = ResID(tokens[0], int(tokens[1]), tokens[2])
+        last  = ResID(tokens[3], int(tokens[4]), tokens[5])
+        intervals.append(SSInterval(ss_type, first, last, line))
+    f.close()
+    return intervals
+
+
+
+def IntervalLines(lines, intervals):
+    """
+    IntervalLines() reads the lines from a PDB file (once), and yields a
+    tuple (n, line) for every line which belongs to intervals[n], as soon
+    as it is read.  (A header line containing the first residue of each
+    interval is yielded first.)  Nothing is stored in memory.
+
+    """
+    ss_index = SSIndex(intervals)
+    interval2n = {}
+    for n in range(0, len(intervals)):
+        interval = intervals[n]
+        interval2n[interval] = n
+        yield n, ('\"'+interval.first.chainID +
+                  '\" \"' + str(interval.first.seqNum) +
+                  '\" \"'+ interval.first.iCode+'\"\n')
+
+    atom_types = set(["ATOM  ", "HETATM", "ANISOU", "SIGATM", "SIGUIJ"])
+
+    for line in lines:
         line_type = line[0:6]
 
-        if line_type in set(["ATOM  ", "HETATM", "ANISOU", "SIGATM", "SIGUIJ"]):
+        if line_type in atom_types:
             #atomID    = int(line[6:11])
             #atomType  = line[12:16]
             #altLoc    = line[16:17]
@@ -64,9 +124,10 @@ def main():
             chainID   = line[21:22]
             seqNum    = line[22:26]
             iCode     = line[26:27]
-            resID = ResID(chainID, int(seqNum), iCode)
-            if (first <= resID <= last):
-                sys.stdout.write(line)
+            for interval in ss_index.FindAll(PackResID(chainID,
+                                                       int(seqNum),
+                                                       iCode)):
+                yield interval2n[interval], line
 
         elif (line_type == "HET   "):
             #hetID     = line[7:10]
@@ -75,61 +136,118 @@ def main():
             iCode     = line[17:18]
             #numHETATMs = int(line[20:25])
             #descriptor = line[30:70]
-            resID = ResID(chainID, int(seqNum), iCode)
-            if (first <= resID <= last):
-                sys.stdout.write(line)
-
-        elif (line_type == "HELIX "):
-            initChainID = line[19:20]
-            initSeqNum  = int(line[21:25])
-            initICode   = line[25:26]
-            initID = ResID(initChainID, int(initSeqNum), initICode)
-            endChainID  = line[31:32]
-            endSeqNum   = int(line[33:37])
-            endICode    = line[37:38]
-            endID = ResID(endChainID, int(endSeqNum), endICode)
-            if (first <= initID <= last) and (first <= endID <= last):
-                sys.stdout.write(line)
-
-        elif (line_type == "SHEET "):
-            initChainID = line[21:22]
-            initSeqNum  = int(line[22:26])
-            initICode   = line[26:27]
-            initID = ResID(initChainID, int(initSeqNum), initICode)
-            endChainID  = line[32:33]
-            endSeqNum   = int(line[33:37])
-            endICode    = line[37:38]
-            endID = ResID(endChainID, int(endSeqNum), endICode)
-            if (first <= initID <= last) and (first <= endID <= last):
-                sys.stdout.write(line)
-
-        elif (line_type == "TURN  "):
-            initChainID = line[19:20]
-            initSeqNum  = int(line[20:24])
-            initICode   = line[24:25]
-            initID = ResID(initChainID, int(initSeqNum), initICode)
-            endChainID  = line[30:31]
-            endSeqNum   = int(line[31:35])
-            endICode    = line[35:36]
-            endID = ResID(endChainID, int(endSeqNum), endICode)
-            if (first <= initID <= last) and (first <= endID <= last):
-                sys.stdout.write(line)
+            for interval in ss_index.FindAll(PackResID(chainID,
+                                                       int(seqNum),
+                                                       iCode)):
+                yield interval2n[interval], line
+
+        elif line_type in ("HELIX ", "SHEET ", "TURN  "):
+            # Only keep records lying entirely within the interval
+            ss_record = ParseSSRecord(line)
+            for interval in ss_index.FindAll(ss_record.first):
+                if ss_record.last <= interval.last:
+                    yield interval2n[interval], line
 
         elif line_type == "SEQRES":
             chainID = line[11:12]
-            if (first.chainID <= chainID) and (chainID <= last.chainID):
-                sys.stdout.write(line)
+            for n in range(0, len(intervals)):
+                if ((intervals[n].first.chainID <= chainID) and
+                    (chainID <= intervals[n].last.chainID)):
+                    yield n, line
 
         elif line_type == "TER   ":
             chainID = line[21:22]
             seqNum  = int(line[22:26])
             iCode   = line[26:27]
-            terRes  = ResID(chainID, seqNum, iCode)
-            if (first <= resID <= last):
-                sys.stdout.write(line)
+            for interval in ss_index.FindAll(PackResID(chainID,
+                                                       seqNum,
+                                                       iCode)):
+                yield interval2n[interval], line
 
         else:
-            sys.stdout.write(line)
+            for n in range(0, len(intervals)):
+                yield n, line
+
+
+
+def SelectIntervals(lines, intervals):
+    """
+    SelectIntervals() reads the lines from a PDB file (once) and returns a
+    list of lists of strings.  (The lines of text selected for each interval.)
+
+    """
+    selected = [[] for interval in intervals]
+    for n, line in IntervalLines(lines, intervals):
+        selected[n].append(line)
+    return selected
+
+
+
+def main():
+    intervals_file_name = None
+    out_prefix = None
+    argv = [arg for arg in sys.argv]
+    i = 1
+    while i < len(argv):
+        if argv[i] in ('-intervals', '-out'):
+            if i+1 >= len(argv):
+                sys.stderr.write("Error: The "+argv[i]+" argument should be followed by a file name.\n")
+                exit(-1)
+            if argv[i] == '-intervals':
+                intervals_file_name = argv[i+1]
+            else:
+                out_prefix = argv[i+1]
+            del argv[i:i+2]
+        else:
+            i += 1
+
+    if intervals_file_name != None:
+        if len(argv) != 1:
+            sys.stderr.write("Error: Intervals should not be passed as arguments when the\n"
+                             "       \"-intervals\" argument is used.\n")
+            exit(-1)
+        intervals = ReadIntervals(intervals_file_name)
+    else:
+        if (len(argv) != 7) or (out_prefix != None):
+            sys.stderr.write("Error: This program requires 6 arguments.\n"
+                             "       This program requires a pair of residues to designate the first and\n"
+                             "       last members of the interval.  Each residue requires 3 identifiers.\n"
+                             "       Consequently the six arguments needed are:\n"
+                             "ChainID_first SeqNum_first ICode_first ChainID_last SeqNum_last ICode_last\n"
+                             "       (Alternately, use \"-intervals FILE\" to read many intervals from a file.)\n")
+            exit(-1)
+        first = ResID(argv[1], int(argv[2]), argv[3])
+        last  = ResID(argv[4], int(argv[5]), argv[6])
+        intervals = [SSInterval(None, first, last)]
+
+    if len(intervals) == 1:
+        # Print each line as soon as it is read (without storing the file).
+        out_file = sys.stdout
+        if out_prefix != None:
+            out_file = open(out_prefix+'_1.pdb', 'w')
+        for n, line in IntervalLines(sys.stdin, intervals):
+            out_file.write(line)
+        if out_prefix != None:
+            out_file.close()
+        return
+
+    selected = SelectIntervals(sys.stdin, intervals)
+
+    if out_prefix != None:
+        # Write the files one at a time.  (Keeping a file open for every
+        # interval could exceed the limit on the number of open files.)
+        for n in range(0, len(selected)):
+            out_file = open(out_prefix+'_'+str(n+1)+'.pdb', 'w')
+            out_file.write(''.join(selected[n]))
+            out_file.close()
+        return
+
+    # Otherwise, the lines for each interval are printed separately
+    # (after the entire file has been read).
+    for n in range(0, len(selected)):
+        if n > 0:
+            sys.stdout.write('\n')
+        sys.stdout.write(''.join(selected[n]))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,202 @@
+"""
+Functions for computing the Fourier transform (and power spectrum) of
+numeric signals, such as the hydrophobicity of each residue along a sequence.
+The convention used here is:
+
+                __N_
+                \            -i*2*pi*f*x
+     ft(f)  =   /___  y_x * e
+                  x
+
+ where x = 0, 1, ..., N-1, and f is a frequency (1/period) in the range (0,0.5]
+
+Instead of calling cmath.exp() once for each x (and each frequency f),
+the factors exp(-i*2*pi*f*x) are computed once and stored in a table
+(one row per frequency).  The transform of each sequence is then the product
+of this table with the signal, which is evaluated by python's built-in
+sum() and map() functions, (rather than an explicit python loop).
+The table grows automatically when longer sequences are encountered.
+"""
+
+import math
+import cmath
+import operator
+
+
+# The frequencies (1/period) corresponding to the periodicity of
+# alpha helices (3.6 residues per turn) and beta strands (2 residues per turn):
+helix_frequency  = 1.0/3.6
+strand_frequency = 0.5
+
+
+
+def TwiddleFactors(f, length):
+    """ Return the list exp(-i*2*pi*f*x) for x = 0, 1, ..., length-1 """
+    k = 2.0 * math.pi * f
+    return [cmath.exp(-1j*(k*x)) for x in range(0, length)]
+
+
+
+def FourierSum(y, twiddles):
+    """
+    Return the sum over x of y[x]*twiddles[x]
+    (twiddles must contain at least len(y) entries).
+
+    """
+    return sum(map(operator.mul, y, twiddles), 0j)
+
+
+
+def ConstantFourierSum(f, length):
+    """
+    Return the Fourier transform (at frequency f) of a signal whose
+    value is 1 everywhere:  1 + z + z^2 + ... + z^(length-1),  z=exp(-i*2*pi*f)
+
+    """
+    z = cmath.exp(-2j*math.pi*f)
+    if abs(1.0 - z) < 1.0e-12:
+        return complex(length)
+    return (1.0 - z**length) / (1.0 - z)
+
+
+
+class FourierTable(object):
+    """
+    FourierTable stores the factors exp(-i*2*pi*f*x) for a list of frequencies
+    (one row per frequency), and computes the Fourier transform of many signals.
+    (The real and imaginary parts are stored in separate rows, because
+     python can sum products of floats faster than products of complex numbers.)
+
+    """
+
+    def __init__(self, f_values):
+        self.f_values = list(f_values)
+        self.length = 0
+        self.cos_rows = [[] for f in self.f_values]
+        self.sin_rows = [[] for f in self.f_values]
+        self.length2constant_sums = {}
+
+    def Reserve(self, length):
+        """ Make sure the table can be used for signals of this length """
+        if length <= self.length:
+            return
+        length = max(length, 2*self.length)
+        for i in range(0, len(self.f_values)):
+            k = 2.0 * math.pi * self.f_values[i]
+            self.cos_rows[i] += [math.cos(k*x)
+                                 for x in range(self.length, length)]
+            self.sin_rows[i] += [-math.sin(k*x)
+                                 for x in range(self.length, length)]
+        self.length = length
+
+    def Transform(self, y):
+        """ Return the list of ft(f) values (one for each frequency) """
+        self.Reserve(len(y))
+        return [complex(sum(map(operator.mul, y, self.cos_rows[i])),
+                        sum(map(operator.mul, y, self.sin_rows[i])))
+                for i in range(0, len(self.f_values))]
+
+    def ConstantTransform(self, length):
+        """ Return the list of ft(f) values for a signal equal to 1 everywhere """
+        if length not in self.length2constant_sums:
+            self.length2constant_sums[length] = [ConstantFourierSum(f, length)
+                                                 for f in self.f_values]
+        return self.length2constant_sums[length]
+
+
+
+def HydrophobicMoment(y, f=helix_frequency):
+    """
+    The hydrophobic moment of a signal y (at frequency f),
+    divided by the number of residues:  |ft(f)| / N
+
+    """
+    if len(y) == 0:
+        return 0.0
+    return abs(FourierSum(y, TwiddleFactors(f, len(y)))) / len(y)
+
+
+
+class PowerSpectrumAccumulator(object):
+    """
+    PowerSpectrumAccumulator computes the average (and standard deviation)
+    of the power spectrum I(f) = |ft(f)|^2 for a collection of signals, after
+    subtracting the average signal value <y> (computed over all the signals)
+    from each signal.  The signals are only read once (in one pass),
+    even though <y> is not known until the end.
+
+    This is possible because the Fourier transform is linear:
+        ft_{y-<y>}(f) = A - <y>*B,   where A=ft_y(f), and B=ft_1(f)
+    Hence:
+        I(f) = a - 2*<y>*c + <y>^2*b
+    where a=|A|^2, b=|B|^2, c=Re(A*conj(B)).  So it is sufficient to keep track
+    of the sums of a, b, c (and their products, to compute the variance of I).
+
+    """
+
+    def __init__(self, f_values):
+        self.table = FourierTable(f_values)
+        self.num_signals = 0
+        self.num_data = 0
+        self.y_sum = 0.0
+        F = len(f_values)
+        # sums of a, b, c, a*a, b*b, c*c, a*b, a*c, b*c (for each frequency)
+        self.sums = [[0.0 for f in range(0, F)] for i in range(0, 9)]
+
+    def AddSignal(self, y):
+        A_values = self.table.Transform(y)
+        B_values = self.table.ConstantTransform(len(y))
+        s_a, s_b, s_c, s_aa, s_bb, s_cc, s_ab, s_ac, s_bc = self.sums
+        for i in range(0, len(A_values)):
+            A = A_values[i]
+            B = B_values[i]
+            a = A.real*A.real + A.imag*A.imag
+            b = B.real*B.real + B.imag*B.imag
+            c = A.real*B.real + A.imag*B.imag
+            s_a[i] += a
+            s_b[i] += b
+            s_c[i] += c
+            s_aa[i] += a*a
+            s_bb[i] += b*b
+            s_cc[i] += c*c
+            s_ab[i] += a*b
+            s_ac[i] += a*c
+            s_bc[i] += b*c
+        self.y_sum += sum(y)
+        self.num_data += len(y)
+        self.num_signals += 1
+
+    def AverageSignal(self):
+        return self.y_sum / self.num_data
+
+    def Results(self):
+        """
+        Return a list of (f, <I(f)>, sigma) tuples, where sigma is the
+        (unbiased) standard deviation of the I(f) values.
+
+        """
+        y_ave = self.AverageSignal()
+        n = self.num_signals
+        s_a, s_b, s_c, s_aa, s_bb, s_cc, s_ab, s_ac, s_bc = self.sums
+        results = []
+        for i in range(0, len(self.table.f_values)):
+            I_sum = s_a[i] - 2.0*y_ave*s_c[i] + y_ave*y_ave*s_b[i]
+            I_sqr_sum = (s_aa[i]
+                         + 4.0*y_ave*y_ave*s_cc[i]
+                         + (y_ave**4)*s_bb[i]
+                         - 4.0*y_ave*s_ac[i]
+                         + 2.0*y_ave*y_ave*s_ab[i]
+                         - 4.0*(y_ave**3)*s_bc[i])
+            I_ave = I_sum / n
+            I_var = I_sqr_sum / n - I_ave*I_ave
+            # paranoid check:
+            if I_var < 0.0:  # <-- This could happen due to numerical roundoff
+                I_var = 0.0
+            if n > 1:
+                I_var_unbiased = I_var * (n / (n - 1.0))
+            else:
+                I_var_unbiased = 1.0  # (any really huge value will do)
+            results.append((self.table.f_values[i],
+                            I_ave,
+                            math.sqrt(I_var_unbiased)))
+        return results
@@ -0,0 +1,601 @@
+#!/usr/bin/env python
+
+"""
+ Typical usage:
+
+    ls -f1 *.pdb | ss_propensity.py > propensity.txt
+
+    ls -f1 *.pdb | ss_propensity.py -dssp > propensity.txt
+
+ This program reads a (long) list of PDB files (once each, in parallel),
+ determines the secondary structure of every residue, and counts the
+ number of times each type of amino acid appears in each kind of
+ secondary structure:
+    H   helix  (the residue belongs to a HELIX record)
+    E   strand (the residue belongs to a SHEET record)
+    T   turn   (the residue belongs to a TURN record)
+    -   none of the above
+ By default, the secondary structure is read from the HELIX, SHEET, and TURN
+ records in each PDB file.  If the "-dssp" argument is used, it is read from
+ the corresponding DSSP file instead (for example "1abc.dssp" for "1abc.pdb").
+ (DSSP types H,G,I are counted as helices, E as strands, and T as turns.)
+ Only ATOM records (in the first MODEL) are used to determine residue types.
+
+ The output begins with some comments summarizing the entire corpus, such
+ as the number of residues of each kind of secondary structure ("priors"):
+
+# files 5123
+# residues 1986157
+# prior H 886428 0.446297...
+# prior E 471407 0.237346...
+ ...
+
+ This is followed by one line for every kind of secondary structure (ss),
+ and every type of amino acid (res), containing:
+
+   ss  res  count  P(res|ss)  dP(res|ss)  P(res)  U  dU
+
+ where U = -ln(P(res|ss) / P(res)) is the (dimensionless) energy
+ (log-odds) of placing that amino acid in that kind of secondary structure,
+ and dP and dU are their (binomial) uncertainties.
+ (Multiply U by kB*T to obtain an energy.)
+
+ The uncertainties above assume that every residue is independent.
+ But residues in the same chain are correlated.  The "-bootstrap R" argument
+ estimates the uncertainty of U by resampling the PDB files instead
+ (using R replicates, see bootstrap.py), and appends it to each line:
+
+   ss  res  count  P(res|ss)  dP(res|ss)  P(res)  U  dU  dU_bootstrap
+
+ (The "-seed S" argument selects the random seed.  The default is 1.)
+
+ The "-weights FILE" argument reads a weight for each PDB file from FILE
+ (one per line, in the same order, for example created by chain_weights.py).
+ The residues in each file are counted using that file's weight.  Since these
+ are the weights of chains, every PDB file must contain a single chain
+ (for example, the files created by dlpisces.py).  PDB files containing
+ several chains can be weighted using "-chain-weights FILE" instead, where
+ FILE contains the ID of a chain (for example "1ABCA") followed by its weight
+ on each line (the format used by "chain_weights.py -table").  Each chain
+ is then counted using its own weight, see chain_weights.ChainWeight().
+ When the residues are weighted, dP and dU are computed using the effective
+ number of residues, (sum of w)^2 / (sum of w^2), instead of their count.
+
+ The files are processed in parallel.  The "-np N" argument limits the
+ number of processes to N.  (By default, one process per CPU is used.)
+ PDB files can also be passed as arguments instead of via the standard input.
+
+ The "-cache DIR" argument saves the counts from each PDB file in directory
+ DIR, and reuses them when this program is run again on the same files.
+ Only new or modified files (or DSSP files) are read again.  (If the
+ DLPDB_CACHE environment variable is set, it is used by default.  See batch.py.)
+
+ The "-shard k/N" argument counts only the residues in the k'th of N parts
+ of the list of PDB files (see batch.py), and "-partial" prints the counts
+ (instead of the propensities) in a format which can be added exactly.
+ The propensities of the entire list are then printed using "-reduce",
+ followed by the names of the files containing the counts from every part:
+
+    ls -f1 *.pdb | ss_propensity.py -shard 1/2 -partial > counts1.txt
+    ls -f1 *.pdb | ss_propensity.py -shard 2/2 -partial > counts2.txt
+    ss_propensity.py -reduce counts1.txt counts2.txt > propensity.txt
+
+ (See reduce_partials.py.  "-bootstrap" can not be used with "-reduce".)
+"""
+
+import sys
+import math
+from functools import partial
+# Sometimes this program pipes its output to other programs which halt early.
+# Below we silently suppress the ugly "Broken pipe" message this generates:
+import signal
+signal.signal(signal.SIGPIPE, signal.SIG_DFL)
+
+try:
+    from .resid import PackResID
+    from .resnames import res_names1, num_amino_acids
+    from .pdb2ss import SSIndex, ss_label_none
+    from .pdbs2fasta import ReadChainCodes
+    from .dssp2pdb import IsHelix, IsStrand
+    from .batch import ReadFileNames, MapFiles, OpenCache, ParseShard, ShardIndices
+    from .reduce_partials import Partials, ReducePartials, Exact
+    from .bootstrap import Bootstrap
+    from .chain_weights import ReadWeights, WeightsDigest, ReadWeightTable, ChainWeight
+except ImportError:
+    from resid import PackResID
+    from resnames import res_names1, num_amino_acids
+    from pdb2ss import SSIndex, ss_label_none
+    from pdbs2fasta import ReadChainCodes
+    from dssp2pdb import IsHelix, IsStrand
+    from batch import ReadFileNames, MapFiles, OpenCache, ParseShard, ShardIndices
+    from reduce_partials import Partials, ReducePartials, Exact
+    from bootstrap import Bootstrap
+    from chain_weights import ReadWeights, WeightsDigest, ReadWeightTable, ChainWeight
+
+
+g_program_name = __file__.split('/')[-1]
+g_date_str     = '2026-10-19'
+g_version_str  = '0.6.0'
+
+
+# The kinds of secondary structure which are counted (in this order):
+ss_label_list = ['H', 'E', 'T', ss_label_none]
+ss_label2index = dict([(ss_label_list[i], i)
+                       for i in range(0, len(ss_label_list))])
+
+# Residues which are not standard amino acids are counted using this index:
+other_index = num_amino_acids
+
+
+
+def NewCounts():
+    """
+    Returns an empty table of counts:
+    counts[i][j] is the number of residues of type j (see resnames.py)
+    with secondary structure ss_label_list[i].
+
+    """
+    return [[0 for j in range(0, num_amino_acids+1)] for i in ss_label_list]
+
+
+
+def AddCounts(total, counts, weight=1):
+    """
+    Add (weight times) "counts" to "total".
+    (Use Exact(weight) to add them exactly.  See WeightedCounts().)
+
+    """
+    for i in range(0, len(total)):
+        total_i = total[i]
+        counts_i = counts[i]
+        for j in range(0, len(total_i)):
+            total_i[j] += weight * counts_i[j]
+
+
+
+def WeightedCounts(weight2counts, squared=False):
+    """
+    Return the sum of the (integer) tables of counts in weight2counts,
+    after multiplying each table by its weight (or by the square of its
+    weight, if "squared" is True).  The sum is exact (see Exact()).
+    (Counting the residues with each weight separately, and multiplying by
+     the weights once at the end, avoids exact arithmetic for each chain.)
+
+    """
+    total = NewCounts()
+    for weight in weight2counts:
+        exact_weight = Exact(weight)
+        if squared:
+            exact_weight = exact_weight * exact_weight
+        AddCounts(total, weight2counts[weight], exact_weight)
+    return total
+
+
+
+def DSSPFileName(pdb_file_name):
+    """ The name of the DSSP file corresponding to a PDB file """
+    i = pdb_file_name.lower().rfind('.pdb')
+    if i == -1:
+        return pdb_file_name + '.dssp'
+    return pdb_file_name[:i] + '.dssp'
+
+
+
+def ReadDSSPLabels(dssp_file):
+    """
+    ReadDSSPLabels() reads a DSSP file and returns a dictionary which
+    maps each residue (as a packed integer, see PackResID()) to its
+    secondary structure label (one of the labels in ss_label_list).
+
+    """
+    key2label = {}
+    in_residues = False
+    for line in dssp_file:
+        if line[0:25] == '  #  RESIDUE AA STRUCTURE':
+            in_residues = True
+            continue
+        if (not in_residues) or (len(line) < 17) or (line[13] == '!'):
+            continue   # (skip the header, and chain breaks)
+        try:
+            seqNum = int(line[6:10])
+        except ValueError:
+            continue
+        secondary_type = line[16]
+        if IsHelix(secondary_type):
+            label = 'H'
+        elif IsStrand(secondary_type):
+            label = 'E'
+        elif secondary_type == 'T':
+            label = 'T'
+        else:
+            label = ss_label_none
+        key2label[PackResID(line[11], seqNum, line[10])] = label
+    return key2label
+
+
+
+def CountChainResidues(file_name, use_dssp=False):
+    """
+    CountChainResidues() reads a PDB file (once) and returns a dictionary
+    containing a table of counts (see NewCounts()) for each chain in the file.
+
+    """
+    chain2keys, chain2codes, intervals = ReadChainCodes(file_name)
+    key2label = None
+    if use_dssp:
+        try:
+            dssp_file = open(DSSPFileName(file_name), 'r')
+            key2label = ReadDSSPLabels(dssp_file)
+            dssp_file.close()
+        except IOError:
+            sys.stderr.write('Warning: DSSP file \"'+DSSPFileName(file_name) +
+                             '\" not found.  Using the HELIX/SHEET/TURN records in \"' +
+                             file_name+'\" instead.\n')
+    if key2label == None:
+        ss_index = SSIndex(intervals)
+
+    chain2counts = {}
+    for chainID in chain2keys:
+        counts = NewCounts()
+        keys = chain2keys[chainID]
+        codes = chain2codes[chainID]
+        for n in range(0, len(keys)):
+            if key2label == None:
+                label = ss_index.Label(keys[n])
+            else:
+                label = key2label.get(keys[n], ss_label_none)
+            counts[ss_label2index[label]][min(codes[n], other_index)] += 1
+        chain2counts[chainID] = counts
+    return chain2counts
+
+
+
+def CountResidues(file_name, use_dssp=False):
+    """
+    CountResidues() reads a PDB file (once) and returns a table of counts
+    (see NewCounts()) for the residues in that file.
+
+    """
+    counts = NewCounts()
+    chain2counts = CountChainResidues(file_name, use_dssp)
+    for chainID in chain2counts:
+        AddCounts(counts, chain2counts[chainID])
+    return counts
+
+
+
+def CountResiduesDSSP(file_name):
+    return CountResidues(file_name, use_dssp=True)
+
+
+
+def Propensities(counts, sqr_counts=None):
+    """
+    Propensities() returns a list of tuples (one per secondary structure label
+    and amino acid type) containing:
+       (ss, res, count, P(res|ss), dP(res|ss), P(res), U, dU)
+    where U = -ln(P(res|ss)/P(res)).  (U and dU are None if count is 0.)
+    Non-standard residues are not included.
+    If the counts are weighted, sqr_counts should contain the same counts
+    weighted by the square of the weights.  The uncertainties then use the
+    effective number of residues, (sum of w)^2 / (sum of w^2).
+
+    """
+    N_ss = [sum(counts[i][0:num_amino_acids]) for i in range(0, len(counts))]
+    N = sum(N_ss)
+    N_ss_eff = N_ss
+    N_eff = N
+    if sqr_counts != None:
+        S_ss = [sum(sqr_counts[i][0:num_amino_acids])
+                for i in range(0, len(sqr_counts))]
+        N_ss_eff = [N_ss[i]*N_ss[i] / S_ss[i] if S_ss[i] > 0 else 0.0
+                    for i in range(0, len(S_ss))]
+        N_eff = 0.0
+        if sum(S_ss) > 0:
+            N_eff = N*N / sum(S_ss)
+    N_res = [sum([counts[i][j] for i in range(0, len(counts))])
+             for j in range(0, num_amino_acids)]
+    rows = []
+    for i in range(0, len(counts)):
+        for j in range(0, num_amino_acids):
+            n = counts[i][j]
+            p = 0.0
+            dp = 0.0
+            if N_ss[i] > 0:
+                p = float(n) / N_ss[i]
+                dp = math.sqrt(p*(1.0-p) / N_ss_eff[i])
+            q = 0.0
+            if N > 0:
+                q = float(N_res[j]) / N
+            U = None
+            dU = None
+            if n > 0:
+                U = -math.log(p / q)
+                # uncertainty in ln(p) and ln(q) (added in quadrature)
+                dU = math.sqrt((1.0-p)/(N_ss_eff[i]*p) + (1.0-q)/(N_eff*q))
+            rows.append((ss_label_list[i], res_names1[j], n, p, dp, q, U, dU))
+    return rows
+
+
+
+def FlattenCounts(counts):
+    """ Convert a table of counts into a single list (see UnflattenCounts()) """
+    return [n for counts_i in counts for n in counts_i]
+
+
+
+def UnflattenCounts(totals):
+    """ Convert a list created by FlattenCounts() back into a table of counts """
+    width = num_amino_acids+1
+    return [totals[i*width:(i+1)*width] for i in range(0, len(ss_label_list))]
+
+
+
+def PropensityEnergies(totals):
+    """
+    Return the list of energies (U) calculated by Propensities() from the
+    (flattened) table of counts.  (This is the statistic used by Bootstrap.)
+
+    """
+    return [row[6] for row in Propensities(UnflattenCounts(totals))]
+
+
+
+def WritePropensities(counts, num_files, out_file, bootstrap_errors=None,
+                      sqr_counts=None):
+    if sqr_counts != None:
+        # (The counts are weighted, see Propensities().)
+        counts = [[float(n) for n in counts_i] for counts_i in counts]
+        sqr_counts = [[float(n) for n in counts_i] for counts_i in sqr_counts]
+    N_ss = [sum(counts[i][0:num_amino_acids]) for i in range(0, len(counts))]
+    N = sum(N_ss)
+    out_file.write('# files '+str(num_files)+'\n')
+    out_file.write('# residues '+str(N)+'\n')
+    for i in range(0, len(counts)):
+        prior = 0.0
+        if N > 0:
+            prior = float(N_ss[i]) / N
+        out_file.write('# prior '+ss_label_list[i]+' '+str(N_ss[i])+' '+
+                       str(prior)+'\n')
+    if bootstrap_errors == None:
+        out_file.write('# ss res count P(res|ss) dP(res|ss) P(res) U dU\n')
+    else:
+        out_file.write('# ss res count P(res|ss) dP(res|ss) P(res) U dU dU_bootstrap\n')
+    rows = Propensities(counts, sqr_counts)
+    for n in range(0, len(rows)):
+        row = rows[n]
+        if bootstrap_errors != None:
+            row = row + (bootstrap_errors[n],)
+        out_file.write(' '.join([str(x) if x != None else 'NA'
+                                 for x in row]) + '\n')
+
+
+
+def ReadPriors(in_file):
+    """
+    ReadPriors() reads the comments at the beginning of a file created by
+    this program, and returns the total number of residues, and a dictionary
+    containing the number of residues of each kind of secondary structure
+    (for example {'H':886428, 'E':471407, 'T':..., '-':...}).
+
+    """
+    num_residues = None
+    ss2count = {}
+    for line in in_file:
+        tokens = line.split()
+        if (len(tokens) == 0) or (tokens[0] != '#'):
+            break
+        if (len(tokens) >= 3) and (tokens[1] == 'residues'):
+            num_residues = float(tokens[2])
+        elif (len(tokens) >= 4) and (tokens[1] == 'prior'):
+            ss2count[tokens[2]] = float(tokens[3])
+    if num_residues == None:
+        raise ValueError('File does not begin with \"# residues\".\n'
+                         '  (Was it created using '+g_program_name+'?)')
+    return num_residues, ss2count
+
+
+
+def main():
+    num_procs = None
+    use_dssp = False
+    num_replicates = 0
+    seed = 1
+    weights_file_name = None
+    chain_weights_file_name = None
+    cache_dir = None
+    shard = None
+    write_partial = False
+    reduce_partials = False
+    file_names = []
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] in ('-np', '-bootstrap', '-seed'):
+            if i+1 >= len(sys.argv):
+                sys.stderr.write('Error: The '+sys.argv[i]+' argument should be followed by a number.\n')
+                exit(-1)
+            if sys.argv[i] == '-np':
+                num_procs = int(sys.argv[i+1])
+            elif sys.argv[i] == '-bootstrap':
+                num_replicates = int(sys.argv[i+1])
+            elif sys.argv[i] == '-seed':
+                seed = int(sys.argv[i+1])
+            i += 2
+        elif sys.argv[i] in ('-weights', '-chain-weights'):
+            if i+1 >= len(sys.argv):
+                sys.stderr.write('Error: The '+sys.argv[i]+' argument should be followed by a file name.\n')
+                exit(-1)
+            if sys.argv[i] == '-weights':
+                weights_file_name = sys.argv[i+1]
+            else:
+                chain_weights_file_name = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '-cache':
+            if i+1 >= len(sys.argv):
+                sys.stderr.write('Error: The -cache argument should be followed by a directory name.\n')
+                exit(-1)
+            cache_dir = sys.argv[i+1]
+            i += 2
+        elif sys.argv[i] == '-shard':
+            if i+1 >= len(sys.argv):
+                sys.stderr.write('Error: The -shard argument should be followed by \"k/N\".\n')
+                exit(-1)
+            try:
+                shard = ParseShard(sys.argv[i+1])
+            except ValueError as err:
+                sys.stderr.write('Error: '+str(err)+'\n')
+                exit(-1)
+            i += 2
+        elif sys.argv[i] == '-dssp':
+            use_dssp = True
+            i += 1
+        elif sys.argv[i] == '-partial':
+            write_partial = True
+            i += 1
+        elif sys.argv[i] == '-reduce':
+            reduce_partials = True
+            i += 1
+        else:
+            file_names.append(sys.argv[i])
+            i += 1
+
+    sys.stderr.write(g_program_name+' v'+g_version_str+' '+g_date_str+'\n')
+
+    if (num_replicates > 0) and (write_partial or reduce_partials):
+        sys.stderr.write('Error: The -bootstrap argument can not be used with -partial or -reduce.\n')
+        exit(-1)
+    if (weights_file_name != None) and (chain_weights_file_name != None):
+        sys.stderr.write('Error: The -weights and -chain-weights arguments can not be used together.\n')
+        exit(-1)
+    weighted = (weights_file_name != None) or (chain_weights_file_name != None)
+
+    if reduce_partials:
+        try:
+            partials = ReducePartials(file_names,
+                                      g_program_name+' v'+g_version_str)
+            partials.CheckComplete()
+        except (ValueError, IOError) as err:
+            sys.stderr.write('Error: '+str(err)+'\n')
+            exit(-1)
+        total = NewCounts()
+        total_sqr = NewCounts()
+        for key in partials.Keys():
+            values = partials.Values(key)
+            total[ss_label2index[key[0]]][int(key[1])] = values[0]
+            total_sqr[ss_label2index[key[0]]][int(key[1])] = values[1]
+        if ((partials.Setting('weights') == 'False') and
+            (partials.Setting('chain-weights') == 'False')):
+            total_sqr = None
+        WritePropensities(total, partials.num_files, sys.stdout, None,
+                          total_sqr)
+        return
+
+    if len(file_names) == 0:
+        file_names = ReadFileNames(sys.stdin)
+
+    if weighted:
+        count_residues = partial(CountChainResidues, use_dssp=use_dssp)
+    elif use_dssp:
+        count_residues = CountResiduesDSSP
+    else:
+        count_residues = CountResidues
+
+    related_files = None
+    if use_dssp:
+        related_files = lambda file_name: [DSSPFileName(file_name)]
+    try:
+        cache = OpenCache(cache_dir, g_program_name+' v'+g_version_str,
+                          related_files)
+    except (ValueError, OSError) as err:
+        sys.stderr.write('Error: '+str(err)+'\n')
+        exit(-1)
+
+    weights = [1 for file_name in file_names]
+    if weights_file_name != None:
+        try:
+            weights_file = open(weights_file_name, 'r')
+            weights = ReadWeights(weights_file)
+            weights_file.close()
+        except (ValueError, IOError) as err:
+            sys.stderr.write('Error: '+str(err)+'\n')
+            exit(-1)
+        if len(weights) < len(file_names):
+            sys.stderr.write('Error: The weights file contains fewer lines than the number of PDB files.\n')
+            exit(-1)
+    id2weight = None
+    if chain_weights_file_name != None:
+        try:
+            chain_weights_file = open(chain_weights_file_name, 'r')
+            id2weight = ReadWeightTable(chain_weights_file)
+            chain_weights_file.close()
+        except (ValueError, IOError) as err:
+            sys.stderr.write('Error: '+str(err)+'\n')
+            exit(-1)
+
+    if shard != None:
+        indices = ShardIndices(file_names, shard)
+        file_names = [file_names[n] for n in indices]
+        weights = [weights[n] for n in indices]
+
+    total = NewCounts()
+    total_sqr = None
+    weight2counts = {}
+    partials = []
+    n = 0
+    for counts in MapFiles(count_residues, file_names, num_procs, 16, cache):
+        if weighted:
+            chain2counts = counts
+            if (id2weight == None) and (len(chain2counts) > 1):
+                sys.stderr.write('Error: \"'+file_names[n]+'\" contains '+
+                                 str(len(chain2counts))+' chains.\n'
+                                 '       The -weights argument requires files containing a single chain.\n'
+                                 '       (Use -chain-weights instead.)\n')
+                exit(-1)
+            counts = NewCounts()
+            for chainID in chain2counts:
+                weight = weights[n]
+                if id2weight != None:
+                    weight = ChainWeight(file_names[n], chainID, id2weight)
+                if weight not in weight2counts:
+                    weight2counts[weight] = NewCounts()
+                AddCounts(weight2counts[weight], chain2counts[chainID])
+                if num_replicates > 0:
+                    AddCounts(counts, chain2counts[chainID], weight)
+        else:
+            AddCounts(total, counts)
+        if num_replicates > 0:
+            partials.append([float(c) for c in FlattenCounts(counts)])
+        n += 1
+    if weighted:
+        total = WeightedCounts(weight2counts)
+        total_sqr = WeightedCounts(weight2counts, squared=True)
+
+    if write_partial:
+        partials = Partials(g_program_name+' v'+g_version_str,
+                            [('dssp', use_dssp),
+                             ('weights', WeightsDigest(weights_file_name)),
+                             ('chain-weights', WeightsDigest(chain_weights_file_name))],
+                            2, shard)
+        partials.num_files = len(file_names)
+        for i in range(0, len(total)):
+            for j in range(0, len(total[i])):
+                if weighted:
+                    partials.Add((ss_label_list[i], j),
+                                 [total[i][j], total_sqr[i][j]])
+                else:
+                    partials.Add((ss_label_list[i], j),
+                                 [total[i][j], total[i][j]])
+        partials.Write(sys.stdout)
+        return
+
+    bootstrap_errors = None
+    if num_replicates > 0:
+        bootstrap = Bootstrap(partials, PropensityEnergies)
+        bootstrap_errors = bootstrap.Errors(num_replicates, seed, num_procs)[1]
+
+    WritePropensities(total, len(file_names), sys.stdout, bootstrap_errors,
+                      total_sqr)
+
+
+if __name__ == "__main__":
+    main()
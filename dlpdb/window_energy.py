@@ -0,0 +1,124 @@
+"""
+Functions for estimating the energy of a sequence (or of every window of
+consecutive residues in a sequence), assuming that the energy is the sum of
+the energies of each residue (or of each subsequence of length k).
+
+The sequence is first converted into a list of small integers
+(one per residue) using bytes.translate().  Then the energy (and variance)
+of every position is looked up, and the energies of all of the windows are
+computed from the cumulative sums of these lists (in O(L) time, regardless
+of the window size).
+
+Residues (or subsequences) whose energy is unknown are not fatal.  They are
+"masked": they contribute nothing to the energy, and the number of masked
+positions in each window is reported alongside its energy.
+"""
+
+from itertools import accumulate
+
+try:
+    from .kmers import invalid_code, g_max_dense_kmers, KmerCodes
+except ImportError:
+    from kmers import invalid_code, g_max_dense_kmers, KmerCodes
+
+
+
+class EnergyModel(object):
+    """
+    EnergyModel stores the energy (and uncertainty) of every residue type
+    (or every subsequence of length k).  "energy" and "delta_energy" are
+    dictionaries whose keys are strings of length k (eg. {'A':-0.2, ...}).
+
+    """
+
+    def __init__(self, energy, delta_energy=None, k=1):
+        self.k = k
+        letters = sorted(set(''.join(energy.keys())))
+        self.base = len(letters)
+        table = bytearray([invalid_code] * 256)
+        for i in range(0, len(letters)):
+            table[ord(letters[i])] = i
+        self.table = bytes(table)
+        # Store the energy and variance of each k-mer in a list indexed by
+        # the k-mer's integer code (or a dictionary, if there are too many).
+        if self.base ** k <= g_max_dense_kmers:
+            self.kmer2ener = [None] * (self.base ** k)
+        else:
+            self.kmer2ener = {}
+        for s in energy:
+            if len(s) != k:
+                raise ValueError('The energy table contains \"'+s+'\", '
+                                 'which is not of length '+str(k)+'.')
+            kmer = KmerCodes(s.encode().translate(self.table), k, self.base)[0]
+            variance = 0.0
+            if delta_energy != None:
+                variance = delta_energy[s]**2
+            self.kmer2ener[kmer] = (energy[s], variance)
+
+    def Positions(self, sequence):
+        """
+        Returns 3 lists with one entry for each subsequence of length k:
+        its energy, its variance, and whether it is masked (1) or not (0).
+
+        """
+        num_positions = max(0, len(sequence) - self.k + 1)
+        values = [0.0] * num_positions
+        variances = [0.0] * num_positions
+        masked = [1] * num_positions
+        encoded = sequence.encode().translate(self.table)
+        lookup = self.kmer2ener
+        dense = isinstance(lookup, list)
+        start = 0
+        while start < len(encoded):
+            end = encoded.find(invalid_code, start)
+            if end == -1:
+                end = len(encoded)
+            kmer_codes = KmerCodes(encoded[start:end], self.k, self.base)
+            for j in range(0, len(kmer_codes)):
+                if dense:
+                    ener = lookup[kmer_codes[j]]
+                else:
+                    ener = lookup.get(kmer_codes[j])
+                if ener != None:
+                    values[start+j], variances[start+j] = ener
+                    masked[start+j] = 0
+            start = end + 1
+        return values, variances, masked
+
+    def WindowEnergies(self, sequence, window=None):
+        """
+        WindowEnergies() returns 3 lists containing, for each window of
+        "window" consecutive positions in the sequence:
+        the energy, the variance of the energy, and the number of positions
+        which were masked.  (If window is None, the entire sequence is used.)
+
+        """
+        values, variances, masked = self.Positions(sequence)
+        if window == None:
+            return [sum(values)], [sum(variances)], [sum(masked)]
+        # (Roundoff error could otherwise make a variance slightly negative.)
+        return (WindowSums(values, window),
+                [max(0.0, v) for v in WindowSums(variances, window)],
+                WindowSums(masked, window))
+
+    def ScanSequences(self, sequences, window=None):
+        """
+        Invoke WindowEnergies() on every sequence in a list,
+        returning a list of results (one per sequence).
+
+        """
+        return [self.WindowEnergies(sequence, window) for sequence in sequences]
+
+
+
+def WindowSums(values, window):
+    """
+    Returns the sum of each window of "window" consecutive entries in the
+    list, using the differences between the cumulative sums of the list.
+
+    """
+    if window > len(values):
+        return []
+    cumulative = [0] + list(accumulate(values))
+    return [cumulative[i+window] - cumulative[i]
+            for i in range(0, len(values) - window + 1)]
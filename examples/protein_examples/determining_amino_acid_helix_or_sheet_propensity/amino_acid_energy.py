@@ -3,7 +3,7 @@
 """
 Typical usage:
 
-    amino_acid_energy.py [candidate.txt] < all_sequences.txt
+    amino_acid_energy.py [-priors propensity.txt] [candidate.txt] < all_sequences.txt
 In this example, "all_sequences.txt" contains a large list of sequences
 from which the probability of each character appearing is determined.
 The natural logarithm of the probability of each type of character 
@@ -17,40 +17,54 @@ that you wish to calculate the probability of that sequence
 appearing by chance (using the probabilities you calculated above).
 This program calculates the natural logarithm of this probability
 and writes it to the standard-out.
+
+The probabilities for each type of amino acid are normalized so that they
+sum to the fraction of amino acids in the database which belong to helices
+(or sheets).  By default, the number of amino acids in the database
+(and in helices and sheets) were counted once, long ago, and stored below.
+Use the "-priors" argument to read these numbers from a file created by
+"ss_propensity.py" instead, so that they match your current database.
 """
 
 import sys
 import math
+from dlpdb.window_energy import EnergyModel
+from dlpdb.ss_propensity import ReadPriors
 
 def CalcSequenceEnergy(s,energy):
-    tot_ener = 0.0
-    for c in s:
-        if c in energy:
-            tot_ener += energy[c]
-        else:
-            sys.stderr.write('\nError: sequence argument contains non-standard amino acid: \''+c+'\'\n')
-            exit(-1)
-    return tot_ener
+    U, deltaU = CalcSequenceEnergyErr(s,energy)
+    return U
 
 
 
-def CalcSequenceEnergyErr(s,energy,delta_energy):
-    tot_ener = 0.0
-    var_tot_ener = 0.0
-    for c in s:
-        if c in energy:
-            tot_ener += energy[c]
-            var_tot_ener += (delta_energy[c]**2)
-        else:
-            sys.stderr.write('\nError: sequence argument contains non-standard amino acid: \''+c+'\'\n')
-            exit(-1)
-    return tot_ener,math.sqrt(var_tot_ener)
+def CalcSequenceEnergyErr(s,energy,delta_energy=None):
+    # Non-standard amino acids (or any characters which are not in the
+    # "energy" table) do not contribute to the energy.
+    U, varU, num_unknown = EnergyModel(energy,delta_energy).WindowEnergies(s)
+    if num_unknown[0] > 0:
+        sys.stderr.write('\nWarning: sequence argument contains '+str(num_unknown[0])+
+                         ' amino acid(s) missing from this table.  (They were ignored.)\n')
+    return U[0],math.sqrt(varU[0])
 
 
 
 
 def main():
 
+    priors_filename = None
+    args = []
+    i = 1
+    while i < len(sys.argv):
+        if sys.argv[i] == '-priors':
+            if i+1 >= len(sys.argv):
+                sys.stderr.write('Error: The -priors argument should be followed by a file name.\n')
+                exit(-1)
+            priors_filename = sys.argv[i+1]
+            i += 2
+        else:
+            args.append(sys.argv[i])
+            i += 1
+
     type_count= {} #keep track of the number of times 
                    #each character in the sequence 
                    #appears in the entire file.
@@ -96,6 +110,13 @@ def main():
     NAA_tot=1986157  # number of amino acids in the database
     NAA_hel=886428   # number of amino acids in the database in helices
     NAA_she=471407   # number of amino acids in the database in sheets
+    if priors_filename != None:
+        # Use the numbers counted by "ss_propensity.py" instead
+        priors_file = open(priors_filename, 'r')
+        NAA_tot, ss2count = ReadPriors(priors_file)
+        priors_file.close()
+        NAA_hel = ss2count['H']
+        NAA_she = ss2count['E']
 
     prior__helix = (float(NAA_hel)/float(NAA_tot))
     prior__sheet = (float(NAA_she)/float(NAA_tot))
@@ -503,7 +524,7 @@ def main():
     #for ener_pair in ener_sorted:
     #    c = ener_pair[0]
 
-    AAsorted = sorted(ThreeToOne.iteritems(), key=lambda(k,v):k)
+    AAsorted = sorted(ThreeToOne.items(), key=lambda kv: kv[0])
     for AA_c_pair in AAsorted:
         c = AA_c_pair[1]
 
@@ -629,8 +650,8 @@ def main():
     # of the probability of a sequence of that length evolving at random.
 
 
-    if len(sys.argv) > 1:
-        seqfilename = sys.argv[1]
+    if len(args) > 0:
+        seqfilename = args[0]
         file = open(seqfilename,'r')
 
         for line in file:
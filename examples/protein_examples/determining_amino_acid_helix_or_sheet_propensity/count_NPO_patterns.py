@@ -3,225 +3,106 @@
 """
  Typical usage:
 count_NPO_patterns.py N < sequences.txt
-"""
-
-
-import sys
-
-
-# global variable:
-
-D = 3 #reduced alphabet size (3 types of residues: N, P, O)
-
-
-
-# Convert a number from 0,1,2 into a 1-character string: 'N','P', or 'O'
-def Digit2Char(d):
-    if (d == 0):
-        return 'N'
-    elif (d == 1):
-        return 'P'
-    else:
-        return 'O'
-
-
-# Each amino acid is categorized as 
-#        'N' non-polar, 
-#        'P' polar, or 
-#        'O' "other"
-# according to the criteria explained in:
-#   West, MW; Hecht, MH. 
-#   "Binary patterning of polar and nonpolar amino acids in the sequences and structures of native proteins"
-#   Protein Sci. 1995, Oct, Vol 4, No 10, pp 2032-2039
-
-translate_AAtoReduced = {'F':'N', # ^
-                         'L':'N', # |
-                         'I':'N', # non-polar amino acids
-                         'M':'N', # |
-                         'V':'N', # v
-
-                         'R':'P', # ^
-                         'K':'P', # |
-                         'D':'P', # |
-                         'E':'P', # polar amino acids
-                         'N':'P', # |
-                         'Q':'P', # |
-                         'H':'P', # v
-
-                         'S':'O', # ^
-                         'P':'O', # |
-                         'T':'O', # |
-                         'A':'O', # other
-                         'Y':'O', # |
-                         'W':'O', # |
-                         'C':'O', # |
-                         'G':'O'} # V
-
-
-
-
-#def TranslateAAtoReduced(c):
-#    if (c in translate_AAtoReduced):
-#        return translate_AAtoReduced[c]
-#    else:
-#        return 'O'
-
-
-
-
-
-def SequenceUsesNormalAA(s):
-    for c in s:
-        if (not (c in translate_AAtoReduced)):
-            sys.stderr.write('  sequence \"'+s+'\"\n')
-            sys.stderr.write('  contains nonstandard char:\"'+c+'\"\n'
-                             '---------\n')
-            return False
-    return True
 
+count_NPO_patterns.py N -alphabet HP < sequences.txt
 
+count_NPO_patterns.py N -alphabet "N:FLIMV,P:RKDENQH,O:SPTAYWCG" < sequences.txt
 
+ Each amino acid is categorized as
+        'N' non-polar,
+        'P' polar, or
+        'O' "other"
+ according to the criteria explained in:
+   West, MW; Hecht, MH.
+   "Binary patterning of polar and nonpolar amino acids in the sequences and structures of native proteins"
+   Protein Sci. 1995, Oct, Vol 4, No 10, pp 2032-2039
+ (Other reduced alphabets can be selected using the "-alphabet" argument.
+  See "reduced_alphabets" in dlpdb/kmers.py.)
 
+ Every pattern of N consecutive residues is then counted, and the patterns
+ are ranked by their relative probability (see below).  Patterns containing
+ non-standard amino acids are ignored.
+"""
 
 
+import sys
+from dlpdb.kmers import ParseAlphabet, AlphabetTable, EncodeSequence, \
+    NewKmerCounts, CountKmers, KmerItems, KmerString
 
 
 
 
 def main():
 
-    if (len(sys.argv) != 2):
+    alphabet_spec = 'NPO'
+    argv = [arg for arg in sys.argv]
+    i = 1
+    while i < len(argv):
+        if argv[i] == '-alphabet':
+            if i+1 >= len(argv):
+                sys.stderr.write('Error: The -alphabet argument should be followed by the name of an alphabet.\n')
+                exit(-1)
+            alphabet_spec = argv[i+1]
+            del argv[i:i+2]
+        else:
+            i += 1
+
+    if (len(argv) != 2):
         sys.stderr.write('Error: expected one argument: N\n'
                          '       N = the size of the patterns you want to search for.\n'
                          '       For example, N=5: all penta-peptide patterns are counted\n'
-                         '       and ranked in popularity.\n')
+                         '       and ranked in popularity.\n'
+                         '       (Optional: \"-alphabet NAME\" selects a different reduced alphabet.)\n')
         exit(-1)
 
-    N = int(sys.argv[1])
-
-
-
-    pattern_num  =[0 for n in range(0,N)]         #stores a sequence as a list of
-                                                  #numbers in the range 0 to D-1.
-                                                  #Example: [0,1,1,0,0,2]
-    pattern_chars=[Digit2Char(0) for n in range(0,N)]#this list is a short sequence
-                                                  #of characters, represented using
-                                                  #the reduced (D-char) alphabet:
-                                                  #eg: ['N','P','P','N','N','O']
-                                                  #(it's not a string like 'NPPNNO')
-    #print('pattern_chars=',pattern_chars)
-
-
-
-
-
-    pattern_count = {}
-
-
-
-
-
-    ## ---------------------------
-    ## Optional: Fill pattern_count{} with every possible pattern.
-    ## Here, we initialize every possible pattern to have an initial count of 0
-    ##           (Probably not a good idea. I'll comment this out later)
-    ##
-    #
-    ## The following function increments an N-digit number in base D.
-    ## (For example, [1,0,2,2,2,2] -> [1,1,0,0,0,0] (when D=3)
-    ## It returns whether or not overflow occurs.
-    #def IncrPattern(pattern_num):
-    #    N=len(pattern_num)
-    #    n = 0
-    #    while (n < N):
-    #        if n == N:
-    #            break
-    #        pattern_num[n] += 1
-    #        if (pattern_num[n] < D):
-    #            break
-    #        else:
-    #            pattern_num[n] = 0
-    #        n += 1
-    #    return (n == N)
-    #
-    #while (True):
-    #    for n in range(0,N):
-    #        #sys.stderr.write('  num['+str(n)+']='+str(pattern_num[n])+'\n')
-    #        #sys.stderr.write('chars['+str(n)+']='+Digit2Char(pattern_num[n])+'\n')
-    #        pattern_chars[n] = Digit2Char(pattern_num[n])
-    #
-    #    pattern_str = ''.join(pattern_chars) #the dictionary key is a python string
-    #    pattern_count[pattern_str] = 0
-    #    #sys.stderr.write('possible pattern #'+str(len(pattern_count))+
-    #    #                 ': \"'+pattern_str+'\"\n')
-    #    if (IncrPattern(pattern_num)):
-    #        break;
-    ## ---------------------------
+    N = int(argv[1])
 
+    groups = ParseAlphabet(alphabet_spec)
+    letters = ''.join([letter for letter, members in groups])
+    D = len(groups)  # reduced alphabet size (eg. 3 types of residues: N, P, O)
+    table = AlphabetTable(groups)
 
+    # Each pattern (a sequence of N digits in base D) is represented by an
+    # integer.  pattern_count[i] is the number of times pattern i was found.
+    # (If there are too many possible patterns, this is a dictionary instead.)
+    pattern_count = NewKmerCounts(N, D)
 
     num_patterns = 0
 
 
-    type_count= {} #keep track of the number of times each 
-                   #character in the reduced alphabet appears
-                   #in the entire file.
-
-    #lines = sys.stdin.readlines()
-    #for line in lines:
+    type_count = [0 for d in range(0,D)] #keep track of the number of times
+                                         #each character in the reduced
+                                         #alphabet appears in the entire file.
 
     for line in sys.stdin:
         line = line.strip()
 
+        # Convert each character in the line into a digit in the range 0..D-1
+        # (Non-standard amino acids are converted into an "invalid" code.)
+        encoded = EncodeSequence(line, table)
+
         # Count the number of residues of each type
-        for c in line:
-            if c in translate_AAtoReduced:
-                c = translate_AAtoReduced[c]
-                if (c in type_count):
-                    type_count[c] += 1
-                else:
-                    type_count[c] = 1
-
-
-
-        # Now, consider each contiguous susbtring of length N in the line, convert
-        # each character in the string to a character in the reduced alphabet,
-        # (which has fewer types of residues)
-        # and count the number of times that (reduced) pattern appears.
-        for offset in range(0,len(line)+1-N):
-            pattern_orig = line[offset:offset+N]
-
-            # If the pattern_orig contains any non-standard amino acids, ignore it
-            if SequenceUsesNormalAA(pattern_orig):
-                # Otherwise, translate the pattern_orig into the reduced alphabet
-                # (I have to store this as a list because strings are immutable.)
-                pattern_translated = []
-                for c in pattern_orig:
-                    pattern_translated.append(translate_AAtoReduced[c])
-
-                #The "pattern_count" dictionary uses strings for keys, not lists,
-                #so I must convert this list of characters back into a string:
-                pattern = ''.join(pattern_translated)
-                #sys.stderr.write('encountered pattern=\"'+pattern+'\"\n')
-
-                # Have we encountered this pattern before?
-                if (pattern in pattern_count):
-                    pattern_count[pattern] += 1
-                    num_patterns += 1
-                else:
-                    pattern_count[pattern] = 1
+        for d in range(0,D):
+            type_count[d] += encoded.count(d)
+
+        # Now count the number of times each (reduced) pattern of length N
+        # appears.  Patterns containing non-standard amino acids are skipped.
+        num_patterns += CountKmers(encoded, N, D, pattern_count)
 
 
     # What is the probability of finding each type of amino acid?
     type_count_total = 0
-    for c in type_count:
-        type_count_total += type_count[c]
+    for d in range(0,D):
+        type_count_total += type_count[d]
+    if type_count_total == 0:
+        sys.stderr.write('Error: No residues were found in the sequences read from the standard input.\n')
+        exit(-1)
 
-    type_prob = {}
+    type_prob = [0.0 for d in range(0,D)]
     sys.stderr.write('\nProbabilities for each type (sum = 1.0):\n')
-    for c in type_count:
-        type_prob[c] = float(type_count[c])/type_count_total
-        sys.stderr.write('\''+c+'\' '+str(type_prob[c])+'\n')
+    for d in range(0,D):
+        type_prob[d] = float(type_count[d])/type_count_total
+        sys.stderr.write('\''+letters[d]+'\' '+str(type_prob[d])+'\n')
 
 
     # For reference:
@@ -264,11 +145,11 @@ def main():
     # The denominator is the product of 
 
     pattern_rp = {}
-    for pattern in pattern_count:
-        prob = float(pattern_count[pattern]) / num_patterns
+    for pattern, count in KmerItems(pattern_count):
+        prob = float(count) / num_patterns
         rand_prob = 1.0
-        for c in pattern:
-            rand_prob *= type_prob[c]
+        for n in range(N-1,-1,-1):
+            rand_prob *= type_prob[(pattern // D**n) % D]
         pattern_rp[pattern] = prob / rand_prob
 
 
@@ -277,41 +158,19 @@ def main():
 
     sys.stderr.write('\nSorting patterns by the weighted relative probability.\n')
 
-    import operator
-    for pc in sorted(pattern_rp.iteritems(),
-                     key=operator.itemgetter(1),
-                     reverse=True):
+    for pattern in sorted(pattern_rp,
+                          key=lambda pattern: (-pattern_rp[pattern], pattern)):
 
-        pattern = pc[0]
         count = pattern_count[pattern]
         prob = float(count)/num_patterns
 
-        sys.stdout.write(pattern
+        sys.stdout.write(KmerString(pattern, N, letters)
                          + ' ' + str(prob)
                          + ' ' + str(pattern_rp[pattern])
                          + '\n')
 
 
 
-    # Old code: (sorts by probability, not by relative probability (rp))
-    #import operator
-    #for pc in sorted(pattern_count.iteritems(),
-    #                 key=operator.itemgetter(1),
-    #                 reverse=True):
-    #    pattern = pc[0]
-    #    rand_prob = 1.0
-    #    for c in pattern:
-    #        rand_prob *= type_prob[c]
-    #
-    #    count = pc[1]
-    #    prob = float(pc[1])/num_patterns
-    #    sys.stdout.write(pattern
-    #                     + ' ' + str(prob)
-    #                     + ' ' + str(prob/rand_prob)
-    #                     + '\n')
-
-
-
 
 if __name__ == "__main__":
     main()
@@ -1,11 +1,13 @@
 #!/usr/bin/env python
 
 import math, cmath, sys
+from dlpdb.spectra import TwiddleFactors, FourierSum, PowerSpectrumAccumulator, \
+    HydrophobicMoment, helix_frequency, strand_frequency
 
 # author: Andrew Jewett
 g_program_name = __file__.split('/')[-1]
-g_date_str = '2017-4-21'
-g_version_str = '0.5.1'
+g_date_str = '2026-10-19'
+g_version_str = '0.6.0'
 
 
 
@@ -82,10 +84,10 @@ g_version_str = '0.5.1'
 def ftnorm(f, y_i, x_i=[]):
     N = len(y_i)
 
-    # If user neglected to specify the list of x_i values, 
-    # then fill it with a list of integers from 0 to N-1
+    # If user neglected to specify the list of x_i values,
+    # then use a list of integers from 0 to N-1
     if (len(x_i) == 0):
-        x_i = [i for i in range(0,N)]
+        return FourierSum(y_i, TwiddleFactors(f, N))
 
     sum = 0.0 + 0.0j
     k = math.pi * 2.0 * f
@@ -100,18 +102,38 @@ def ftnorm(f, y_i, x_i=[]):
 
 def main():
 
-    if (len(sys.argv) != 3):
+    moments_file_name = None
+    argv = [arg for arg in sys.argv]
+    i = 1
+    while i < len(argv):
+        if argv[i] == '-moments':
+            if i+1 >= len(argv):
+                sys.stderr.write('Error: The -moments argument should be followed by a file name.\n')
+                exit(-1)
+            moments_file_name = argv[i+1]
+            del argv[i:i+2]
+        else:
+            i += 1
+
+    if (len(argv) != 3):
         sys.stderr.write('Error: expected two arguments: min_seq_length, num_k_values\n'
                          '\n'
                          '  Sytax (typical usage):'
                          '\n'
                          '  '+g_program_name+' 5 100 < sequences.txt > ft.txt\n'
                          '\n'
+                         '  Optional: Add \"-moments FILE\" to write the hydrophobic moment of\n'
+                         '  each sequence (at the helix and strand periodicities) to FILE.\n'
+                         '\n'
                          'exiting...\n')
         exit(-1)
 
-    min_seq_length = int(sys.argv[1])
-    num_f_values =  int(sys.argv[2])
+    min_seq_length = int(argv[1])
+    num_f_values =  int(argv[2])
+
+    moments_file = None
+    if moments_file_name != None:
+        moments_file = open(moments_file_name, 'w')
 
 
     # Global variables:
@@ -229,48 +251,32 @@ def main():
     # Read in all the sequences (lines of text)
     # For each sequence of characters (one sequence per line),
     # 1) convert it to a numerical signal based on the characters on that line
-    # 2) Take the Fourier transform of that signal (evaluated at one of the 
+    # 2) Take the Fourier transform of that signal (evaluated at one of the
     #    frequencies, f, normalized by length)
     #    and compute the power spectrum (the square modulus)
     #    Do this for a variety of differnet spacial frequencies in the list
     #    Call this I_f
     # 4) Keep track of the average, and standard deviation of I_f.
-    #    To do this, we need to keep track of the sum of the I_f values and the
-    #    sum of the squares of the I_f values.
-
-    # I_f is defined as |y_f|^2, where y_f is the 
-    # Fourier transform of y_x (evaluated at one of the frequencies in f_val[]).
-    I_f_sum     = [0.0 for f in range(0, num_f_values)]
-    # We keep track of the average I_f, as well as its variance:
-    I_f_sqr_sum = [0.0 for f in range(0, num_f_values)]
-
-    num_sequences = 0
-
-
-    #Read the signal in:
-
-    #for line in sys.stdin:  <-- old version (single pass)
-
-    # Wait, just realized I have to subtract off the average signal before I
-    # compute the Fourier transforms.  (Otherwise, I get a big
-    # spike at k = 0.)  If I subtract off each sequence's signal average
-    # before I take the Fourier transform, the graph of the Fourier transform
-    # will be pulled down to zero as k approaches 0.
-    # I don't want this either.
+    #
+    # Note: I have to subtract off the average signal before I compute the
+    # Fourier transforms.  (Otherwise, I get a big spike at k = 0.)  If I
+    # subtract off each sequence's signal average before I take the Fourier
+    # transform, the graph of the Fourier transform will be pulled down to
+    # zero as k approaches 0.  I don't want this either.
     # I think best thing to do (which gives you the flattest prettiest graphs)
     # is to compute the average signal over all of the data sets
     # and subtract that from each signal.
+    # This used to require reading the sequences twice.  Now it is done in
+    # a single pass.  (See PowerSpectrumAccumulator in dlpdb/spectra.py.)
 
+    spectrum = PowerSpectrumAccumulator(f_values)
 
-    #I have to do this in two passes:
-    lines = sys.stdin.readlines()
+    if moments_file:
+        moments_file.write('# sequence length moment_helix moment_strand\n')
 
-    # In the first pass, I try to find the average signal
-    # (over all the lines in the file)
-    y_sum = 0.0
-    num_data = 0
-    sys.stderr.write('Pass 1: determining the average signal = ')
-    for line in lines:
+    sys.stderr.write('Calculating the Fourier transform for each sequence.\n')
+
+    for line in sys.stdin:
         line = line.strip()
         line_has_strange_data = False
         for c in line:
@@ -280,57 +286,25 @@ def main():
                                  c+'\'\n'+
                                  '  sequence = \"'+line+'\"\n'+
                                  '  This sequence will be discarded.\n')
+                break
 
         if ((len(line) >= min_seq_length) and
             (not line_has_strange_data)):
 
-            for c in line:
-                y_sum += sequence2signal[c]
+            y_x = [sequence2signal[c] for c in line]
+            spectrum.AddSignal(y_x)
 
-            num_data += len(line)
+            if moments_file:
+                moments_file.write(line + ' ' + str(len(line)) + ' ' +
+                                   str(HydrophobicMoment(y_x, helix_frequency))
+                                   + ' ' +
+                                   str(HydrophobicMoment(y_x, strand_frequency))
+                                   + '\n')
 
-    y_ave = y_sum / num_data
-    sys.stderr.write(str(y_ave)+'\n\n')
-    sys.stderr.write('Pass 2: calculating the Fourier transform for each sequence.\n')
+    if moments_file:
+        moments_file.close()
 
-
-    # In the second pass, I calculate the Fourier transform of each sequence's 
-    # signal, after subtracting off the average signal.  (This was averaged over 
-    # all sequences.  This is not the average for each sequence.)
-    for line in lines:
-        line = line.strip()
-        line_has_strange_data = False
-        for c in line:
-            if not (c in sequence2signal):
-                line_has_strange_data = True;
-
-        if ((len(line) >= min_seq_length) and
-            (not line_has_strange_data)):
-
-            #sys.stderr.write('sequence = \"'+line+'\"\n')
-
-            y_x = [0.0 for x in range(0,len(line))]
-            for x in range(0,len(line)):
-                y_x[x] = sequence2signal[line[x]]
-
-            # subtract off the average value from y_x
-            for x in range(0,len(line)):
-                y_x[x] -= y_ave
-
-            # this list stores the fourier transform of y_of_x
-
-            for f in range(0,num_f_values):
-                f_val = f_values[f]
-                y_f = ftnorm(f_val, y_x)
-
-                # I_f = |y_f|^2
-                I_f = abs(y_f) 
-                I_f *= I_f  #this way, I_f will be internally represented as a float
-                I_f_sqr         = I_f * I_f
-                I_f_sum[f]     += I_f
-                I_f_sqr_sum[f] += I_f_sqr
-
-            num_sequences += 1
+    sys.stderr.write('Average signal = '+str(spectrum.AverageSignal())+'\n')
 
 
     # Now print out the results to the standard output.
@@ -338,26 +312,11 @@ def main():
     #   column 1: f value (lies in the range (0, 0.5]
     #   column 2: <I_f>   (the average value of the power spectrum at f)
     #   column 3: the fluctuations in I_f (computed using sqrt(<I_f^2> - <I_f>^2))
-    for f in range(0,num_f_values):
-        I_f_ave     =     I_f_sum[f] / num_sequences
-        I_f_sqr_ave = I_f_sqr_sum[f] / num_sequences
-
-        I_f_var = I_f_sqr_ave - I_f_ave*I_f_ave
-        # paranoid check:
-        if (I_f_var < 0.0):#<--In principle, this could happen due to numerical 
-            I_f_var = 0.0  #   roundoff error but it is extremely unlikely
-
-        if (num_sequences > 1):
-            I_f_var_unbiased = I_f_var * (num_sequences / (num_sequences - 1.0))
-        else:
-            I_f_var_unbiased = 1.0  #(any really huge value will do)
-        I_f_unc = math.sqrt(I_f_var_unbiased)
-
-        sys.stdout.write(str(f_values[f]) + ' ' + 
-                         str(I_f_ave) + ' ' + 
+    for f_val, I_f_ave, I_f_unc in spectrum.Results():
+        sys.stdout.write(str(f_val) + ' ' +
+                         str(I_f_ave) + ' ' +
                          str(I_f_unc) + '\n')
 
 
-
 if __name__ == "__main__":
     main()
@@ -3,7 +3,7 @@
 """
 Typical usage:
 
-    subsequence_energy.py N [candidate.txt] < all_sequences.txt
+    subsequence_energy.py N [candidate.txt [W]] < all_sequences.txt
 
  
 In this example, "sequences.txt" contains a large list of sequences
@@ -18,11 +18,24 @@ this program assumes the file contains a sequence of letters, and
 that you wish to calculate the probability of that sequence 
 appearing by chance (using the probabilities you calculated above).
 This program calculates the natural logarithm of this probability
-and writes it to the standard-out.
+and writes it to the standard-out.  (If "candidate.txt" contains multiple
+lines, each line is treated as a separate sequence.)
+
+If a window size ("W") is also supplied, then the energy of every window
+of W consecutive subsequences in each candidate sequence is printed instead.
+(In that case, each line of output contains the energies of all of the
+ windows in the corresponding candidate sequence.)
+
+Subsequences which never appeared in "all_sequences.txt" (including those
+containing non-standard amino acids) do not contribute to the energy.
+A warning is printed (to the standard-error) when this happens.
+(The energies of windows containing these subsequences are printed as
+ "NA +/- NA".)
 """
 
 import sys
 import math
+from dlpdb.window_energy import EnergyModel
 
 
 def main():
@@ -173,37 +186,45 @@ def main():
     if len(sys.argv) > 2:
         seqfilename = sys.argv[2]
         file = open(seqfilename,'r')
-
-        for line in file:
-            line = line.strip()
-
-            tot_ener = 0.0
-            variance_tot_ener = 0.0
-            sys.stderr.write('---------- calculating energy of sequence \''+line+'\' ----------\n')
-            line = line.strip()
-            unknown_subsequence = False
-            for i in range(0,1+len(line)-subseq_size):
-                s = line[i:i+subseq_size]
-                if s in ener:
-                    tot_ener += ener[s]
-                    variance_tot_ener += (delta_ener[s]**2)
-                    sys.stderr.write('U(\''+s+'\') = '+str(ener[s]*kB*T)+' +/- '+str(delta_ener[s]*kB*T)+' kcal\mole\n')
-                else:
-                    sys.stderr.write('\nError: A new subsequence was found: \''+s+'\'\n'\
-                                     '         (consequently its probability/energy can not be estimated).\n')
-                    unknown_subsequence = True
+        candidates = [line.strip() for line in file]
+        file.close()
+
+        window = None
+        if len(sys.argv) > 3:
+            window = int(sys.argv[3])
+
+        model = EnergyModel(ener, delta_ener, subseq_size)
+        results = model.ScanSequences(candidates, window)
+
+        for line, (U, varU, num_unknown) in zip(candidates, results):
+            if window != None:
+                # (Windows containing unknown subsequences are printed as
+                #  "NA +/- NA", so that they are not mistaken for real energies)
+                num_masked = len([i for i in range(0, len(U))
+                                  if num_unknown[i] > 0])
+                if num_masked > 0:
+                    sys.stderr.write('Warning: '+str(num_masked)+' window(s) in \''+line+'\'\n'
+                                     '         contain new subsequence(s), and were printed as NA.\n')
+                sys.stdout.write(' '.join([('NA +/- NA' if num_unknown[i] > 0
+                                            else
+                                            str(U[i]*kB*T)+' +/- '+
+                                            str(math.sqrt(varU[i])*kB*T))
+                                           for i in range(0, len(U))])+'\n')
+                continue
+            if num_unknown[0] > 0:
+                sys.stderr.write('\nWarning: '+str(num_unknown[0])+' new subsequence(s) were found in \''+line+'\'\n'\
+                                 '         (consequently their probability/energy can not be estimated,\n'\
+                                 '          and they were omitted from the sum).\n')
+            num_known = max(0, 1+len(line)-subseq_size) - num_unknown[0]
 
             sys.stderr.write('---------------------\n'\
                              'sum(\''+line+'\') = ')
-            if unknown_subsequence:
-                sys.stdout.write('1.0e38 +/- 1.0e38 kcal/mole\n')
-                sys.stderr.write(' divided by '+str(len(line)-subseq_size)+':\n')
-                sys.stderr.write('1.0e38 +/- 1.0e38 kcal/mole\n')
+            sys.stdout.write(str(U[0]*kB*T)+' +/- '+str(math.sqrt(varU[0])*kB*T)+' kcal/mole\n')
+            if num_known > 0:
+                sys.stderr.write(' divided by '+str(num_known)+':\n')
+                sys.stderr.write(str(U[0]*kB*T/num_known)+' +/- '+str(math.sqrt(varU[0])*kB*T/num_known)+' kcal/mole\n')
             else:
-                sys.stdout.write(str(tot_ener*kB*T)+' +/- '+str(math.sqrt(variance_tot_ener)*kB*T)+' kcal/mole\n')
-                sys.stderr.write(' divided by '+str(len(line)-subseq_size)+':\n')
-                sys.stderr.write(str(tot_ener*kB*T/(len(line)-subseq_size))+' +/- '+str(math.sqrt(variance_tot_ener)*kB*T/(len(line)-subseq_size))+' kcal/mole\n')
-
+                sys.stderr.write('\n')
 
 
 
@@ -62,12 +62,18 @@ setup(
            'dlpdb/scripts/replace_missing_secondary_str.sh'],
 
   entry_points={
-      'console_scripts': ['coords2angles.py=dlpdb.coords2angles:main',
+      'console_scripts': ['batch_run.py=dlpdb.batch_run:main',
+                          'bootstrap.py=dlpdb.bootstrap:main',
+                          'chain_weights.py=dlpdb.chain_weights:main',
+                          'classify_pdbs.py=dlpdb.classify_pdbs:main',
+                          'coords2angles.py=dlpdb.coords2angles:main',
                           'coords2dihedrals.py=dlpdb.coords2dihedrals:main',
                           'coords2projected_dihedrals.py=dlpdb.coords2projected_dihedrals:main',
                           'coords2distances.py=dlpdb.coords2distances:main',
                           'coords2helixAngleOmega.py=dlpdb.coords2helixAngleOmega:main',
+                          'cull_chains.py=dlpdb.cull_chains:main',
                           'dlpisces.py=dlpdb.dlpisces:main',
+                          'dna_interleave_residues.py=dlpdb.dna_interleave_residues:main',
                           'download_pdbs.py=dlpdb.download_pdbs:main',
                           'dssp2pdb.py=dlpdb.dssp2pdb:main',
                           'fix_dna_residue_order_pdb.py=dlpdb.fix_dna_residue_order_pdb:main',
@@ -79,19 +85,33 @@ setup(
                           'has_sheets.py=dlpdb.has_sheets:main',
                           'has_turns.py=dlpdb.has_turns:main',
                           'helixAngleOmega.py=dlpdb.helixAngleOmega:main',
+                          'histogram.py=dlpdb.histogram:main',
+                          'memo.py=dlpdb.memo:main',
                           'merge_lines_periodic.py=dlpdb.merge_lines_periodic:main',
                           'pdb2coords_ave.py=dlpdb.pdb2coords_ave:main',
                           'pdb2coords.py=dlpdb.pdb2coords:main',
+                          'pdb2gyration.py=dlpdb.pdb2gyration:main',
                           'pdb2helix.py=dlpdb.pdb2helix:main',
                           'pdb2sequence.py=dlpdb.pdb2sequence:main',
                           'pdb2sheet.py=dlpdb.pdb2sheet:main',
+                          'pdb2ss.py=dlpdb.pdb2ss:main',
                           'pdb2turn.py=dlpdb.pdb2turn:main',
+                          'pdbs2fasta.py=dlpdb.pdbs2fasta:main',
+                          'pdbs2rama.py=dlpdb.pdbs2rama:main',
+                          'pdbs2table.py=dlpdb.pdbs2table:main',
+                          'pdbs2db.py=dlpdb.pdbs2db:main',
                           'pdb_interleave_residues.py=dlpdb.pdb_interleave_residues:main',
+                          'query_db.py=dlpdb.query_db:main',
+                          'reduce_partials.py=dlpdb.reduce_partials:main',
+                          'select_atoms.py=dlpdb.select_atoms:main',
                           'select_chains_with_dna.py=dlpdb.select_chains_with_dna:main',
                           'select_interval.py=dlpdb.select_interval:main',
+                          'ss_propensity.py=dlpdb.ss_propensity:main',
                           'strip_secondary_str.py=dlpdb.strip_secondary_str:main',
                           'truncate_chars.py=dlpdb.truncate_chars:main',
                           'truncate_tokens.py=dlpdb.truncate_tokens:main']},
+  # (pyarrow is only needed by "pdbs2table.py -format parquet" or "-format arrow")
+  extras_require={'arrow': ['pyarrow']},
   zip_safe=True,
   include_package_data=True
 )